@@ -0,0 +1,61 @@
+"""
+Benchmarks for the encode and decode hot paths, run with pytest-benchmark
+(`pip install eth-rpc-py[benchmark]`):
+
+    pytest benchmarks --benchmark-json=benchmarks.json
+
+Each benchmark records the number of items it processes per round in
+`extra_info["items"]`, so throughput is `items / stats.mean`.  Compare runs
+with `--benchmark-autosave` and `--benchmark-compare`, or fail on a regression
+with `--benchmark-compare-fail=mean:10%`.
+"""
+
+import json
+from typing import Annotated
+
+import pytest
+from eth_rpc import Event
+from eth_rpc.local_node import LocalChain
+from eth_rpc.models import Log
+from eth_rpc.types import Indexed, primitives
+from pydantic import BaseModel
+
+
+class TransferEventType(BaseModel):
+    sender: Annotated[primitives.address, Indexed]
+    recipient: Annotated[primitives.address, Indexed]
+    amount: primitives.uint256
+
+
+@pytest.fixture(scope="session")
+def transfer_event() -> Event[TransferEventType]:
+    return Event[TransferEventType](name="Transfer")
+
+
+@pytest.fixture(scope="session")
+def transfer_logs() -> list[dict]:
+    """10k ERC20 Transfer logs, as returned by eth_getLogs"""
+    chain = LocalChain.synthetic(blocks=1_000, transactions=10, logs=1)
+    return chain.get_logs({"fromBlock": "0x0", "toBlock": "latest"})
+
+
+@pytest.fixture(scope="session")
+def transfer_logs_response(transfer_logs) -> bytes:
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "result": transfer_logs}).encode()
+
+
+@pytest.fixture(scope="session")
+def log_models(transfer_logs) -> list[Log]:
+    return [Log.model_validate(log) for log in transfer_logs]
+
+
+@pytest.fixture(scope="session")
+def full_block() -> dict:
+    """A block with 300 transactions, as returned by eth_getBlockByNumber"""
+    chain = LocalChain.synthetic(blocks=2, transactions=300)
+    return chain.block(1, full=True)  # type: ignore[return-value]
+
+
+@pytest.fixture(scope="session")
+def full_block_response(full_block) -> bytes:
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "result": full_block}).encode()
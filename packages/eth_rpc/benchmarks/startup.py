@@ -0,0 +1,84 @@
+"""
+Startup costs: importing eth_rpc, creating an RPC per network, binding its
+methods and looking up the shared RPC.  Prints the results as JSON:
+
+    python benchmarks/startup.py [--repeat 20]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+from statistics import median
+
+
+def import_time() -> float:
+    code = "import time; t = time.perf_counter(); import eth_rpc; print(time.perf_counter() - t)"
+    return float(subprocess.check_output([sys.executable, "-c", code]))
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from eth_rpc._transport import _force_get_global_rpc, _rpcs
+    from eth_rpc.networks import Networks
+    from eth_rpc.rpc.core import RPC
+
+    networks = list(Networks.values())
+    names = RPC.method_names()
+
+    def create_all():
+        for network in networks:
+            RPC(network=network)
+
+    def create_and_bind():
+        rpc = RPC(network=networks[0])
+        for name in names:
+            getattr(rpc, name)
+
+    def global_lookup():
+        _rpcs.clear()
+        for network in networks:
+            _force_get_global_rpc(network)
+        threads = [
+            threading.Thread(target=_force_get_global_rpc, args=(network,))
+            for network in networks
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # first RPC pays for the one-time setup, ie. the ssl context
+    start = time.perf_counter()
+    RPC(network=networks[0])
+    first = time.perf_counter() - start
+
+    results = {
+        "import_seconds": median(import_time() for _ in range(3)),
+        "first_rpc_seconds": first,
+        "rpc_per_network_seconds": timed(create_all, args.repeat) / len(networks),
+        "rpc_bind_all_methods_seconds": timed(create_and_bind, args.repeat),
+        "global_rpc_all_networks_seconds": timed(global_lookup, args.repeat),
+        "global_rpcs_created": len(_rpcs),
+        "networks": len(networks),
+        "methods": len(names),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from eth_rpc.models import Block, Log
+from eth_rpc.networks import Ethereum
+from eth_rpc.rpc.core import RPC
+from eth_rpc.rpc.decode import loads
+
+
+def test_event_process(benchmark, transfer_event, log_models):
+    event = transfer_event
+
+    def process_all():
+        return [event.process(log.topics, log.data) for log in log_models]
+
+    benchmark.extra_info["items"] = len(log_models)
+    events = benchmark(process_all)
+    assert len(events) == len(log_models)
+
+
+def test_event_process_log(benchmark, transfer_event, log_models):
+    event = transfer_event
+
+    def process_all():
+        return [event.process_log(log) for log in log_models]
+
+    benchmark.extra_info["items"] = len(log_models)
+    events = benchmark(process_all)
+    assert events[0].event.amount >= 0
+
+
+def test_get_logs_response(benchmark, transfer_logs_response):
+    method = RPC(network=Ethereum).get_logs
+
+    def decode():
+        return method._decode(loads(transfer_logs_response))
+
+    benchmark.extra_info["items"] = len(loads(transfer_logs_response)["result"])
+    logs = benchmark(decode)
+    assert isinstance(logs[0], Log)
+
+
+def test_get_logs_response_trusted(benchmark, transfer_logs_response):
+    rpc = RPC(network=Ethereum)
+    rpc.set_trusted(True)
+    method = rpc.get_logs
+
+    def decode():
+        return method._decode(loads(transfer_logs_response))
+
+    benchmark.extra_info["items"] = len(loads(transfer_logs_response)["result"])
+    logs = benchmark(decode)
+    assert isinstance(logs[0], Log)
+
+
+def test_full_block_response(benchmark, full_block_response):
+    method = RPC(network=Ethereum).get_block_by_number
+
+    def decode():
+        return method._decode(loads(full_block_response))
+
+    benchmark.extra_info["items"] = len(
+        loads(full_block_response)["result"]["transactions"]
+    )
+    block = benchmark(decode)
+    assert isinstance(block, Block)
+    assert len(block.transactions) == 300
+
+
+def test_event_decode_batch(benchmark, transfer_event, log_models):
+    benchmark.extra_info["items"] = len(log_models)
+    columns = benchmark(transfer_event.decode_batch, log_models)
+    assert len(columns["amount"]) == len(log_models)
+
+
+def test_event_decode_batch_materialized(benchmark, transfer_event, log_models):
+    benchmark.extra_info["items"] = len(log_models)
+    events = benchmark(transfer_event.decode_batch, log_models, materialize=True)
+    assert events[0].event.amount >= 0
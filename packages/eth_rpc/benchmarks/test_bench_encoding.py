@@ -0,0 +1,130 @@
+from typing import Annotated
+
+from eth_abi import encode
+from eth_rpc import ContractFunc, FuncSignature
+from eth_rpc.contract import ProtocolBase
+from eth_rpc.types import METHOD, Name, Struct, primitives
+from eth_rpc.utils import BloomFilter, to_checksum
+from pydantic import BaseModel
+
+ADDRESSES = ["0x%040x" % (i * 7919) for i in range(1, 1_001)]
+
+
+class SwapParams(BaseModel):
+    amount_in: primitives.uint256
+    amount_out_min: primitives.uint256
+    path: list[primitives.address]
+    to: primitives.address
+    deadline: primitives.uint256
+
+
+class Reserves(BaseModel):
+    reserve0: primitives.uint112
+    reserve1: primitives.uint112
+    timestamp: primitives.uint32
+
+
+class Order(Struct):
+    maker: primitives.address
+    amounts: list[primitives.uint256]
+    data: bytes
+    active: bool
+
+
+class Book(Struct):
+    orders: list[Order]
+    owner: primitives.address
+
+
+class Token(ProtocolBase):
+    balance_of: Annotated[
+        ContractFunc[primitives.address, primitives.uint256],
+        Name("balanceOf"),
+    ] = METHOD
+    transfer: ContractFunc[tuple[primitives.address, primitives.uint256], bool] = METHOD
+
+
+SWAP = FuncSignature[SwapParams, list[primitives.uint256]](
+    name="swapExactTokensForTokens"
+)
+GET_RESERVES = FuncSignature[tuple[()], Reserves](name="getReserves")
+
+BOOK = Book(
+    orders=[
+        Order(
+            maker=ADDRESSES[i],
+            amounts=[i, i * 2, i * 3],
+            data=bytes(range(i % 64)),
+            active=i % 2 == 0,
+        )
+        for i in range(100)
+    ],
+    owner=ADDRESSES[0],
+)
+
+
+def test_encode_call(benchmark):
+    params = SwapParams(
+        amount_in=10**18,
+        amount_out_min=10**6,
+        path=ADDRESSES[:3],
+        to=ADDRESSES[4],
+        deadline=1_700_000_000,
+    )
+    benchmark.extra_info["items"] = 1
+    result = benchmark(SWAP.encode_call, inputs=params)
+    assert result.startswith("0x38ed1739")
+
+
+def test_decode_result(benchmark):
+    result = "0x" + encode(["uint112", "uint112", "uint32"], [10**20, 10**9, 1]).hex()
+    benchmark.extra_info["items"] = 1
+    reserves = benchmark(GET_RESERVES.decode_result, result)
+    assert reserves.reserve1 == 10**9
+
+
+def test_decode_result_list(benchmark):
+    result = "0x" + encode(["uint256[]"], [list(range(1_000))]).hex()
+    benchmark.extra_info["items"] = 1_000
+    amounts = benchmark(SWAP.decode_result, result)
+    assert len(amounts) == 1_000
+
+
+def test_struct_to_bytes(benchmark):
+    benchmark.extra_info["items"] = len(BOOK.orders)
+    data = benchmark(BOOK.to_bytes)
+    assert data
+
+
+def test_struct_from_bytes(benchmark):
+    data = BOOK.to_bytes()
+    benchmark.extra_info["items"] = len(BOOK.orders)
+    book = benchmark(Book.from_bytes, data)
+    assert book == BOOK
+
+
+def test_to_checksum(benchmark):
+    def checksum_all():
+        return [to_checksum(address) for address in ADDRESSES]
+
+    benchmark.extra_info["items"] = len(ADDRESSES)
+    result = benchmark(checksum_all)
+    assert len(result) == len(ADDRESSES)
+
+
+def test_bloom_membership(benchmark, full_block):
+    bloom = BloomFilter(int(full_block["logsBloom"], 16))
+    values = [bytes.fromhex(address[2:]) for address in ADDRESSES]
+
+    def check_all():
+        return sum(value in bloom for value in values)
+
+    benchmark.extra_info["items"] = len(values)
+    benchmark(check_all)
+
+
+def test_contract_func_call(benchmark):
+    token = Token(address=ADDRESSES[0])
+    benchmark.extra_info["items"] = 1
+    call = benchmark(token.transfer, (ADDRESSES[1], 10**18))
+    assert call.data.startswith("0xa9059cbb")
@@ -3,10 +3,15 @@ from ._transport import (
     get_current_network,
     get_selected_wallet,
     set_alchemy_key,
+    set_auto_batching,
+    set_cassette,
     set_default_network,
+    set_rate_limit,
     set_rpc_timeout,
     set_rpc_url,
+    set_scheduler,
     set_selected_wallet,
+    set_single_flight,
     set_transport,
 )
 from .account import Account
@@ -21,10 +26,11 @@ from .delegation import (
 from .event import Event
 from .log import Log
 from .models import EventData
-from .rpc import Middleware, add_middleware
+from .rpc import Middleware, Priority, add_middleware, request_priority
 from .subscriber import EventSubscriber
 from .transaction import PreparedTransaction, Transaction, TransactionReceipt
 from .types import Network
+from .utils import set_cursor_store, set_density_store, set_log_cache
 from .wallet import PrivateKeyWallet
 
 # we need to rebuild block because we use a ForwardRef for Transactions
@@ -45,6 +51,7 @@ __all__ = [
     "Middleware",
     "Network",
     "PreparedTransaction",
+    "Priority",
     "PrivateKeyWallet",
     "ProtocolBase",
     "Transaction",
@@ -56,11 +63,20 @@ __all__ = [
     "get_current_network",
     "get_selected_wallet",
     "prepare_delegation_transaction",
+    "request_priority",
     "set_alchemy_key",
+    "set_auto_batching",
+    "set_cassette",
+    "set_cursor_store",
     "set_default_network",
+    "set_density_store",
+    "set_log_cache",
+    "set_rate_limit",
     "set_rpc_timeout",
     "set_rpc_url",
+    "set_scheduler",
     "set_selected_wallet",
+    "set_single_flight",
     "set_transport",
     "sponsor_delegation",
 ]
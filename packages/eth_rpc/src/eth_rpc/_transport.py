@@ -1,4 +1,5 @@
 import os
+import threading
 from contextvars import ContextVar
 from typing import TYPE_CHECKING
 
@@ -7,7 +8,9 @@ from pydantic import BaseModel, ConfigDict
 from .exceptions import UnsupportedChainIDException
 from .networks import Networks, get_network_by_chain_id
 from .networks.ethereum import Ethereum
-from .rpc.base import BaseRPC
+from .rpc.cassette import Cassette
+from .rpc.rate_limit import RateLimiter
+from .rpc.scheduler import RequestScheduler
 from .types import Network
 
 if TYPE_CHECKING:
@@ -18,7 +21,6 @@ if TYPE_CHECKING:
 class Transports(BaseModel):
     default: type[Network] = Ethereum
     networks: dict[int, type[Network]] = {}
-    rpcs: dict[int, BaseRPC] = {}
     retries: int = 0
     id: int = 0
 
@@ -42,6 +44,15 @@ _selected_transports: ContextVar["Transports"] = ContextVar(
 )
 
 
+# one RPC per chain for the whole process, shared by every task, thread and context
+_rpcs: dict[int, "RPC"] = {}
+_rpcs_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    # a forked worker must not reuse the parent's open connections
+    os.register_at_fork(after_in_child=_rpcs.clear)
+
+
 _selected_wallet: ContextVar["PrivateKeyWallet | None"] = ContextVar(
     "_selected_wallet",
     default=None,
@@ -54,17 +65,17 @@ def _force_get_default_network() -> type[Network]:
 
 
 def _force_get_global_rpc(network: type[Network] | None = None) -> "RPC":
-    from .rpc.core import RPC
-
-    transport = _selected_transports.get()
-
     if not network:
-        network = transport.default
+        network = _selected_transports.get().default
 
-    if network.chain_id in transport.rpcs:
-        return transport.rpcs[network.chain_id]  # type: ignore
-    transport.rpcs[network.chain_id] = RPC(network=network)
-    return transport.rpcs[network.chain_id]  # type: ignore
+    if (rpc := _rpcs.get(network.chain_id)) is not None:
+        return rpc
+    from .rpc.core import RPC
+
+    with _rpcs_lock:
+        if (rpc := _rpcs.get(network.chain_id)) is None:
+            rpc = _rpcs[network.chain_id] = RPC(network=network)
+    return rpc
 
 
 def set_transport(
@@ -93,6 +104,63 @@ def set_rpc_timeout(timeout: float, network: type[Network] | None = None) -> Non
     rpc.set_timeout(timeout)
 
 
+def set_auto_batching(
+    window: float = 0.0,
+    max_batch_size: int | None = None,
+    network: type[Network] | None = None,
+) -> None:
+    """
+    Batch concurrent async calls for a network, see `BaseRPC.enable_auto_batching`.
+    """
+    rpc = _force_get_global_rpc(network)
+    rpc.enable_auto_batching(window=window, max_batch_size=max_batch_size)
+
+
+def set_single_flight(network: type[Network] | None = None) -> None:
+    """
+    Share in-flight requests between identical concurrent calls for a network,
+    see `BaseRPC.enable_single_flight`.
+    """
+    rpc = _force_get_global_rpc(network)
+    rpc.enable_single_flight()
+
+
+def set_cassette(
+    cassette: Cassette | None, network: type[Network] | None = None
+) -> None:
+    """
+    Record a network's requests and subscriptions to a cassette, or replay them
+    from one, see `Cassette`.
+    """
+    rpc = _force_get_global_rpc(network)
+    rpc.set_cassette(cassette)
+
+
+def set_scheduler(
+    scheduler: RequestScheduler | None, network: type[Network] | None = None
+) -> None:
+    """
+    Queue a network's requests by priority class, see `RequestScheduler`.
+    """
+    rpc = _force_get_global_rpc(network)
+    rpc.set_scheduler(scheduler)
+
+
+def set_rate_limit(
+    rate: float,
+    costs: dict[str, float] | None = None,
+    network: type[Network] | None = None,
+    **kwargs,
+) -> RateLimiter:
+    """
+    Pace a network's requests to `rate` cost units per second, see `RateLimiter`.
+    """
+    rpc = _force_get_global_rpc(network)
+    limiter = RateLimiter(rate, costs=costs, **kwargs)
+    rpc.set_rate_limiter(limiter)
+    return limiter
+
+
 def set_alchemy_transport(alchemy_key: str, network: type[Network]):
     set_transport(
         networks=[
@@ -144,12 +212,22 @@ def get_selected_wallet():
     return _selected_wallet.get()
 
 
-def set_rpc_url(network: Network, http: str | None = None, wss: str | None = None):
+def set_rpc_url(
+    network: Network,
+    http: str | None = None,
+    wss: str | None = None,
+    backups: list[str] | None = None,
+):
+    """
+    Set the rpc urls for a network.  Requests are spread across the http url and
+    any backup urls, failing over between them when an endpoint is unhealthy.
+    """
     set_transport(
         networks=[
             network.set(
                 http=http,
                 wss=wss,
+                backups=backups,
             )
         ],
     )
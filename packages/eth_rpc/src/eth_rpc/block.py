@@ -16,7 +16,6 @@ from eth_rpc.types.args import (
 )
 from eth_typing import HexStr
 from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
-from websockets.legacy.client import connect
 
 from ._request import Request
 from .constants import DEFAULT_EVENT
@@ -244,8 +243,7 @@ class Block(BlockModel, Request, Generic[NetworkT]):
         with_tx_data: bool = True,
         subscription_type: SUBSCRIPTION_TYPE = "newHeads",
     ):
-        async for w3_connection in connect(
-            cls.rpc().wss,
+        async for w3_connection in cls.rpc().ws_connect(
             ping_interval=60,
             ping_timeout=60,
             max_queue=10000,
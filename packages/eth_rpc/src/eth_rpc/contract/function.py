@@ -1,7 +1,7 @@
 from collections.abc import Awaitable
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Any, Generic, Literal, Optional, TypeVar, cast, overload
+from typing import Any, Callable, Generic, Literal, Optional, TypeVar, cast, overload
 
 from eth_rpc.models import AccessListResponse
 from eth_rpc.types import (
@@ -23,6 +23,7 @@ from ..block import Block
 from ..constants import ADDRESS_ZERO
 from ..delegation import sponsor_delegation
 from ..rpc.core import RPC
+from ..rpc.scheduler import Priority, request_priority
 from ..transaction import PreparedTransaction
 from ..utils import run
 from ..wallet import BaseWallet
@@ -42,6 +43,7 @@ T = TypeVar(
     | HexAddress,
 )
 U = TypeVar("U")
+V = TypeVar("V")
 
 
 @dataclass
@@ -102,6 +104,17 @@ class ContractFunc(Generic[T, U]):
     def encode(self):
         return bytes.fromhex(self.data[2:])
 
+    @staticmethod
+    async def _prioritized(
+        corofunc: Callable[..., Awaitable[V]],
+        *args,
+        priority: Optional[Priority | str] = None,
+        **kwargs,
+    ) -> V:
+        """Make the requests in `corofunc` with a priority, see `RequestScheduler`"""
+        with request_priority(priority):
+            return await corofunc(*args, **kwargs)
+
     def decode(self, result: bytes) -> U:
         return self.func.decode_result(HexStr(result.hex()))
 
@@ -293,6 +306,7 @@ class ContractFunc(Generic[T, U]):
         block_number: int | BLOCK_STRINGS = ...,
         value: HexInteger | int = ...,
         state_diff: dict[HexAddress, Any] = ...,
+        priority: Optional[Priority | str] = ...,
     ) -> EthResponse[T, U]: ...
 
     @overload
@@ -304,6 +318,7 @@ class ContractFunc(Generic[T, U]):
         block_number: int | BLOCK_STRINGS = ...,
         value: HexInteger | int = ...,
         state_diff: dict[HexAddress, Any] = ...,
+        priority: Optional[Priority | str] = ...,
     ) -> Awaitable[EthResponse[T, U]]: ...
 
     @overload
@@ -314,6 +329,7 @@ class ContractFunc(Generic[T, U]):
         block_number: int | BLOCK_STRINGS = ...,
         value: HexInteger | int = ...,
         state_diff: dict[HexAddress, Any] = ...,
+        priority: Optional[Priority | str] = ...,
     ) -> Awaitable[EthResponse[T, U]]: ...
 
     @overload
@@ -325,6 +341,7 @@ class ContractFunc(Generic[T, U]):
         block_number: int | BLOCK_STRINGS = ...,
         value: HexInteger | int = ...,
         state_diff: dict[HexAddress, Any] = ...,
+        priority: Optional[Priority | str] = ...,
     ) -> MaybeAwaitable[EthResponse[T, U]]: ...
 
     def call(
@@ -335,8 +352,18 @@ class ContractFunc(Generic[T, U]):
         value: HexInteger | int = 0,
         state_diff: dict[HexAddress, Any] = {},
         sync: bool = False,
+        priority: Optional[Priority | str] = None,
     ) -> MaybeAwaitable[EthResponse[T, U]]:
-        return run(self._call, from_, block_number, value, state_diff, sync=sync)
+        return run(
+            self._prioritized,
+            self._call,
+            from_,
+            block_number,
+            value,
+            state_diff,
+            priority=priority,
+            sync=sync,
+        )
 
     async def _get(
         self,
@@ -394,6 +421,7 @@ class ContractFunc(Generic[T, U]):
         block_number: int | BLOCK_STRINGS = ...,
         value: HexInteger | int = ...,
         state_diff: dict[HexAddress, Any] = ...,
+        priority: Optional[Priority | str] = ...,
     ) -> U: ...
 
     @overload
@@ -405,6 +433,7 @@ class ContractFunc(Generic[T, U]):
         block_number: int | BLOCK_STRINGS = ...,
         value: HexInteger | int = ...,
         state_diff: dict[HexAddress, Any] = ...,
+        priority: Optional[Priority | str] = ...,
     ) -> Awaitable[U]: ...
 
     def get(
@@ -415,9 +444,12 @@ class ContractFunc(Generic[T, U]):
         value: HexInteger | int = 0,
         state_diff: dict[HexAddress, Any] = {},
         sync: bool = False,
+        priority: Optional[Priority | str] = None,
     ) -> MaybeAwaitable[U]:
         return run(
+            self._prioritized,
             self._get,
+            priority=priority,
             from_=from_,
             block_number=block_number,
             value=value,
@@ -680,6 +712,7 @@ class ContractFunc(Generic[T, U]):
         delegate_wallet: Optional["BaseWallet"] = ...,
         chain_id: Optional[int] = ...,
         gas: Optional[int] = ...,
+        priority: Optional[Priority | str] = ...,
     ) -> HexStr: ...
 
     @overload
@@ -696,6 +729,7 @@ class ContractFunc(Generic[T, U]):
         delegate_wallet: Optional["BaseWallet"] = ...,
         chain_id: Optional[int] = ...,
         gas: Optional[int] = ...,
+        priority: Optional[Priority | str] = ...,
     ) -> Awaitable[HexStr]: ...
 
     def execute(
@@ -712,10 +746,13 @@ class ContractFunc(Generic[T, U]):
         chain_id: Optional[int] = None,
         gas: Optional[int] = None,
         sync: bool = False,
+        priority: Optional[Priority | str] = None,
     ) -> MaybeAwaitable[HexStr]:
         return run(
+            self._prioritized,
             self._execute,
             wallet,
+            priority=priority,
             nonce=nonce,
             value=value,
             gas_price=gas_price,
@@ -849,12 +886,14 @@ class ContractFuncSync(ContractFunc[T, U]):
         block_number: int | BLOCK_STRINGS = "latest",
         value: HexInteger | int = 0,
         state_diff: dict[HexAddress, Any] = {},
+        priority: Optional[Priority | str] = None,
     ) -> EthResponse[T, U]:
         return super().call(
             from_=from_,
             block_number=block_number,
             value=value,
             state_diff=state_diff,
+            priority=priority,
             sync=self.SYNC,
         )
 
@@ -865,12 +904,14 @@ class ContractFuncSync(ContractFunc[T, U]):
         block_number: int | BLOCK_STRINGS = "latest",
         value: HexInteger | int = 0,
         state_diff: dict[HexAddress, Any] = {},
+        priority: Optional[Priority | str] = None,
     ) -> U:
         return super().get(
             from_=from_,
             block_number=block_number,
             value=value,
             state_diff=state_diff,
+            priority=priority,
             sync=self.SYNC,
         )
 
@@ -906,6 +947,7 @@ class ContractFuncSync(ContractFunc[T, U]):
         delegate_wallet: Optional[BaseWallet] = None,
         chain_id: Optional[int] = None,
         gas: Optional[int] = None,
+        priority: Optional[Priority | str] = None,
     ) -> HexStr:
         return super().execute(
             wallet,
@@ -917,6 +959,7 @@ class ContractFuncSync(ContractFunc[T, U]):
             delegate_wallet=delegate_wallet,
             chain_id=chain_id,
             gas=gas,
+            priority=priority,
             sync=self.SYNC,
         )
 
@@ -4,34 +4,42 @@ import logging
 import re
 import time
 from copy import deepcopy
-from functools import cached_property
+from functools import cached_property, partial
 from inspect import isclass
+from itertools import repeat
 from types import GenericAlias
 from typing import (
     Any,
     AsyncIterator,
+    Callable,
     Generic,
     Iterator,
     Literal,
     Optional,
     TypeVar,
+    cast,
     get_args,
     get_origin,
+    overload,
 )
 
-from eth_abi import decode
-from eth_abi.exceptions import InsufficientDataBytes
+from eth_abi.decoding import ContextFramesBytesIO, TupleDecoder
+from eth_abi.exceptions import DecodingError
+from eth_abi.registry import registry
 from eth_typing import ChecksumAddress, HexAddress, HexStr
 from pydantic import BaseModel, PrivateAttr, computed_field
 from pydantic.networks import AnyWebsocketUrl
 from pydantic_core import Url
 from websockets.exceptions import ConnectionClosedError
-from websockets.legacy.client import WebSocketClientProtocol, connect
+from websockets.legacy.client import WebSocketClientProtocol
 from websockets.sync.client import ClientConnection
-from websockets.sync.client import connect as sync_connect
 
 from ._request import Request
-from ._transport import _force_get_default_network, get_current_network
+from ._transport import (
+    _force_get_default_network,
+    _force_get_global_rpc,
+    get_current_network,
+)
 from .block import Block
 from .exceptions import LogDecodeError, LogResponseExceededError, RateLimitingError
 from .models import EventData, Log
@@ -49,7 +57,18 @@ from .types import (
     Struct,
     SubscriptionResponse,
 )
-from .utils import is_annotation, to_topic
+from .utils import (
+    CursorStore,
+    DensityStore,
+    LogCache,
+    StepSizeController,
+    cursor_store,
+    is_annotation,
+    log_cache,
+    log_size,
+    ordered_chunks,
+    to_topic,
+)
 
 T = TypeVar("T", bound=BaseModel)
 logger = logging.getLogger(__name__)
@@ -57,6 +76,26 @@ IGNORE = Literal[""]
 IGNORE_VAL: IGNORE = ""
 
 
+def _logs_error(err: ValueError) -> Exception:
+    """The error to raise for a failed eth_getLogs request"""
+    message = err.args[0]
+    if isinstance(message, bytes):
+        try:
+            message = message.decode("utf-8")
+        except UnicodeDecodeError:
+            message = str(message)
+    else:
+        message = str(message)
+    if "Log response size exceeded." in message:
+        boundaries = re.findall("0x[0-9a-f]+", message)
+        return LogResponseExceededError(
+            err.args[0], int(boundaries[0], 16), int(boundaries[1], 16)
+        )
+    elif "Your app has exceeded its compute units per second capacity" in message:
+        return RateLimitingError(message)
+    return err
+
+
 class UnindexedField(BaseModel):
     alias: str
     name: str
@@ -119,6 +158,219 @@ def convert(type, with_name: bool = False, with_indexed: bool = False):  # noqa:
     return f"{map_type(type)}{map_indexed(indexed)}{name}".strip()
 
 
+def _topic_address(v: str) -> str:
+    # last 20 bytes of value
+    return "0x{}".format(v[-40:])
+
+
+def _topic_bytes(v: str) -> bytes:
+    return bytes.fromhex(v.removeprefix("0x"))
+
+
+def _topic_uint(v: str) -> int:
+    return int(v, 16)
+
+
+def _topic_int(v: str) -> int:
+    return int.from_bytes(bytes.fromhex(v.removeprefix("0x")), "big", signed=True)
+
+
+def _topic_bool(v: str) -> bool:
+    return v[-1] == "1"
+
+
+def _topic_hash(v: str) -> None:
+    # dynamic values are only indexed by their hash
+    return None
+
+
+def topic_decoder(type_name: str) -> Callable[[str], Any]:
+    """The decoder for an indexed value of this type from its topic"""
+    if type_name == "address":
+        return _topic_address
+    if "bytes" in type_name:
+        return _topic_bytes
+    if "uint" in type_name:
+        return _topic_uint
+    elif "int" in type_name:
+        return _topic_int
+    if type_name == "bool":
+        return _topic_bool
+    return _topic_hash
+
+
+def loader(type) -> Callable[[Any], Any]:
+    """Compiles `load_type` for a type, to load many values with"""
+    if isclass(type) and issubclass(type, Struct):
+        return type.from_tuple
+    if isinstance(type, GenericAlias):
+        if get_origin(type) == list:
+            load_item = loader(get_args(type)[0])
+            return lambda value: [load_item(item) for item in value]
+        elif get_origin(type) == tuple:
+            load_items = [loader(arg) for arg in get_args(type)]
+            return lambda value: tuple(
+                load(item) for load, item in zip(load_items, value)
+            )
+    return type
+
+
+_WORD_TYPE = re.compile(r"(uint|int|bytes)(\d+)")
+_WRAP = 1 << 256
+_FALSE = "0" * 64
+_TRUE = "0" * 63 + "1"
+
+
+def _padding_error() -> LogDecodeError:
+    return LogDecodeError("Mismatched Unindexed values")
+
+
+def _address_column(words: list[str]) -> list[str]:
+    if any(word[:24] != _FALSE[:24] for word in words):
+        raise _padding_error()
+    return ["0x" + word[24:] for word in words]
+
+
+def _bool_column(words: list[str]) -> list[bool]:
+    if any(word != _FALSE and word != _TRUE for word in words):
+        raise _padding_error()
+    return [word == _TRUE for word in words]
+
+
+def _uint_column(bits: int, words: list[str]) -> list[int]:
+    column = list(map(int, words, repeat(16)))
+    if bits < 256 and column and max(column) >> bits:
+        raise _padding_error()
+    return column
+
+
+def _int_column(bits: int, words: list[str]) -> list[int]:
+    column = [
+        value - _WRAP if value >> 255 else value
+        for value in map(int, words, repeat(16))
+    ]
+    if bits < 256 and column:
+        if min(column) < -(1 << (bits - 1)) or max(column) >= 1 << (bits - 1):
+            raise _padding_error()
+    return column
+
+
+def _bytes_column(size: int, words: list[str]) -> list[bytes]:
+    if size < 32 and any(word[size * 2 :] != _FALSE[size * 2 :] for word in words):
+        raise _padding_error()
+    return [bytes.fromhex(word[: size * 2]) for word in words]
+
+
+def word_column(type_string: str) -> Optional[Callable[[list[str]], list[Any]]]:
+    """
+    The decoder for a column of 32 byte words of a type that is encoded in a
+    single word, or None if it isn't
+    """
+    if type_string == "address":
+        return _address_column
+    if type_string == "bool":
+        return _bool_column
+    if (match := _WORD_TYPE.fullmatch(type_string)) is None:
+        return None
+    kind, size = match.group(1), int(match.group(2))
+    if kind == "uint":
+        return partial(_uint_column, size)
+    if kind == "int":
+        return partial(_int_column, size)
+    return partial(_bytes_column, size)
+
+
+class DecoderPlan:
+    """
+    Everything needed to decode an event's logs, worked out once from its
+    type instead of for every log.
+    """
+
+    def __init__(self, name: str, EventType: type[BaseModel]):
+        self.model = EventType
+        indexed: list[tuple[str, Callable[[str], Any]]] = []
+        unindexed: list[tuple[str, str, Callable[[Any], Any]]] = []
+        signature: list[str] = []
+        for alias, field in EventType.model_fields.items():
+            _type = field.annotation
+            is_indexed = Indexed in field.metadata
+            signature.append(convert(_type))
+            if is_indexed:
+                indexed.append((alias, topic_decoder(map_type(_type))))
+            else:
+                unindexed.append((alias, convert(_type), loader(_type)))
+
+        self.topic0 = HexStr("0x" + to_topic(f"{name}({','.join(signature)})").hex())
+        # topic0, then one topic per indexed field
+        self.topics = len(indexed) + 1
+        self.indexed = tuple(indexed)
+        self.fields = tuple(alias for alias, _, _ in unindexed)
+        self.types = tuple(type_string for _, type_string, _ in unindexed)
+        self.loaders = tuple(load for _, _, load in unindexed)
+        self.decoder = TupleDecoder(
+            decoders=[registry.get_decoder(type_string) for type_string in self.types]
+        )
+        self.aliases = tuple(EventType.model_fields)
+        # when every unindexed field is one word, field i is always at word i,
+        # and its type loads a decoded value as itself
+        words = [word_column(type_string) for type_string in self.types]
+        self.words: Optional[tuple[Callable[[list[str]], list[Any]], ...]] = (
+            tuple(words) if None not in words else None  # type: ignore[arg-type]
+        )
+
+    def __deepcopy__(self, memo) -> "DecoderPlan":
+        # plans are never modified, so copies of an event can share one
+        return self
+
+    def decode_data(self, data: HexStr) -> tuple[Any, ...]:
+        return self.decoder(
+            ContextFramesBytesIO(bytes.fromhex(data.removeprefix("0x")))
+        )
+
+    def decode_columns(
+        self, topics: list[list[HexStr]], data: list[HexStr]
+    ) -> dict[str, list[Any]]:
+        """Decodes many logs' topics and data into a list of values per field"""
+        columns: dict[str, list[Any]] = {}
+        if self.indexed and any(len(row) < self.topics for row in topics):
+            raise LogDecodeError("Mismatched Indexed values")
+        for i, (alias, decode_topic) in enumerate(self.indexed, 1):
+            columns[alias] = [decode_topic(row[i]) for row in topics]
+
+        if self.words is not None:
+            # slice each static field out of the data by its fixed offset
+            words = [value.removeprefix("0x") for value in data]
+            if any(len(value) < 64 * len(self.words) for value in words):
+                raise LogDecodeError("Mismatched Unindexed values")
+            for i, (alias, decode_words) in enumerate(zip(self.fields, self.words)):
+                columns[alias] = decode_words(
+                    [value[64 * i : 64 * (i + 1)] for value in words]
+                )
+        else:
+            try:
+                rows = [self.decode_data(value) for value in data]
+            except DecodingError:
+                raise LogDecodeError("Mismatched Unindexed values")
+            values = list(zip(*rows)) or [()] * len(self.fields)
+            for alias, load, column in zip(self.fields, self.loaders, values):
+                columns[alias] = [load(value) for value in column]
+
+        return {alias: columns[alias] for alias in self.aliases}
+
+
+_plans: dict[tuple[str, type[BaseModel]], DecoderPlan] = {}
+
+
+def decoder_plan(name: str, EventType: type[BaseModel]) -> DecoderPlan:
+    if (plan := _plans.get((name, EventType))) is None:
+        plan = _plans[(name, EventType)] = DecoderPlan(name, EventType)
+    return plan
+
+
+def _event_size(event: EventData) -> int:
+    return log_size(event.log)
+
+
 class Event(Request, Generic[T]):
     """
     Generic event class for processing and subscribing to blockchain events.
@@ -172,12 +424,18 @@ class Event(Request, Generic[T]):
     addresses_filter: list[HexAddress] = []
 
     _output_type: BaseModel = PrivateAttr()
+    _plan: DecoderPlan = PrivateAttr()
 
     def model_post_init(self, __context) -> None:
         EventType, *_ = self.__pydantic_generic_metadata__["args"]
         self._output_type = EventType
+        self._plan = decoder_plan(self.name, EventType)
         return super().model_post_init(__context)
 
+    @property
+    def plan(self) -> DecoderPlan:
+        return self._plan
+
     @staticmethod
     def _matches(topic: HexStr, topic_filter: HexStr | list[HexStr] | None) -> bool:
         if isinstance(topic_filter, list):
@@ -190,7 +448,7 @@ class Event(Request, Generic[T]):
         # TODO: addresses_filter
         if len(log.topics) == 0:
             return False
-        if log.topics[0] != self.get_topic0:
+        if log.topics[0] != self._plan.topic0:
             return False
         if self.topic1_filter != IGNORE_VAL and len(log.topics) >= 2:
             if not self._matches(log.topics[1], self.topic1_filter):
@@ -226,21 +484,7 @@ class Event(Request, Generic[T]):
 
     @staticmethod
     def process_value(type_name, v: str):
-        # strip prefix if necessary
-        if "0x" in v:
-            v = v[2:]
-
-        if type_name == "address":
-            # last 20 bytes of value
-            return "0x{}".format(v[-40:])
-        if "bytes" in type_name:
-            return bytes.fromhex(v)
-        if "uint" in type_name:
-            return int.from_bytes(bytes.fromhex(v), "big", signed=False)
-        elif "int" in type_name:
-            return int.from_bytes(bytes.fromhex(v), "big", signed=True)
-        if type_name == "bool":
-            return v[-1] == "1"
+        return topic_decoder(type_name)(v)
 
     def from_dict(self, fields: dict[str, Any]):
         EventType, *_ = self.__pydantic_generic_metadata__["args"]
@@ -254,6 +498,62 @@ class Event(Request, Generic[T]):
             network=self._network or get_current_network(),
         )
 
+    @overload
+    def decode_batch(
+        self, logs: list[Log], materialize: Literal[False] = False
+    ) -> dict[str, list[Any]]: ...
+
+    @overload
+    def decode_batch(
+        self, logs: list[Log], materialize: Literal[True]
+    ) -> list[EventData[T]]: ...
+
+    def decode_batch(
+        self, logs: list[Log], materialize: bool = False
+    ) -> dict[str, list[Any]] | list[EventData[T]]:
+        """
+        Decode many logs of this event at once, by field instead of by log.
+
+        When every unindexed field fits in one 32 byte word, ie. a Transfer's
+        amount, each field is sliced from its fixed offset in every log's data
+        instead of being ABI decoded a log at a time.
+
+        Args:
+            logs: Logs of this event, ie. from `eth_getLogs`
+            materialize: Return an `EventData` per log instead of columns
+
+        Returns:
+            A list of values per field, in the same order as `logs`, or the
+            `EventData` for each log with `materialize`
+
+        Raises:
+            LogDecodeError: If a log doesn't match the event's structure
+
+        Example:
+            ```python
+            columns = transfer_event.decode_batch(logs)
+            volume = sum(columns["amount"])
+            ```
+        """
+        plan = self._plan
+        columns = plan.decode_columns(
+            [log.topics for log in logs], [log.data for log in logs]
+        )
+        if not materialize:
+            return columns
+        network = self._network or get_current_network()
+        aliases = list(columns)
+        rows = zip(*columns.values()) if columns else repeat(())
+        return [
+            EventData(
+                name=self.name,
+                log=log,
+                event=plan.model(**dict(zip(aliases, row))),
+                network=network,
+            )
+            for log, row in zip(logs, rows)
+        ]
+
     def process(self, topics: list[HexStr], data: HexStr) -> T:
         """
         Decode raw log data into a typed event object.
@@ -290,45 +590,27 @@ class Event(Request, Generic[T]):
             print(f"Transfer: {transfer.amount} from {transfer.sender} to {transfer.recipient}")
             ```
         """
-        EventType, *_ = self.__pydantic_generic_metadata__["args"]
-        indexed = self.get_indexed()
-        try:
-            indexed_dict = {
-                name: self.process_value(type_, topics[i + 1])
-                for i, (name, type_) in enumerate(indexed)
-            }
-        except IndexError:
+        plan = self._plan
+        if plan.indexed and len(topics) < plan.topics:
             raise LogDecodeError("Mismatched Indexed values")
+        fields = {
+            alias: decode_topic(topics[i])
+            for i, (alias, decode_topic) in enumerate(plan.indexed, 1)
+        }
 
-        unindexed = self.get_unindexed()
         try:
-            type_strings = [field.string_type for field in unindexed]
-            types = [field.type for field in unindexed]
-            unindexed_values = decode(
-                type_strings, bytes.fromhex(data.removeprefix("0x"))
-            )
-
-            parsed_values = []
-            for type_, value in zip(types, unindexed_values):
-                parsed_values.append(load_type(type_, value))
-        except InsufficientDataBytes:
+            values = plan.decode_data(data)
+        except DecodingError:
             raise LogDecodeError("Mismatched Unindexed values")
+        for alias, load, value in zip(plan.fields, plan.loaders, values):
+            fields[alias] = load(value)
 
-        return EventType(
-            **indexed_dict
-            | {field.alias: val for field, val in zip(unindexed, parsed_values)}
-        )
+        return cast(T, plan.model(**fields))
 
     @computed_field  # type: ignore[prop-decorator]
     @cached_property
     def get_topic0(self) -> HexStr:
-        inputs, *_ = self.__pydantic_generic_metadata__["args"]
-        input_types = inputs.model_fields
-        converted_inputs = ",".join(
-            [convert(field.annotation) for name, field in input_types.items()]
-        )
-        event_signature = f"{self.name}({converted_inputs})"
-        return HexStr("0x" + to_topic(event_signature).hex())
+        return self._plan.topic0
 
     def get_indexed(self):
         inputs, *_ = self.__pydantic_generic_metadata__["args"]
@@ -419,57 +701,83 @@ class Event(Request, Generic[T]):
             model.topic3_filter = topic3
         return model
 
+    def _event_data(
+        self, result: Log, network: type[Network]
+    ) -> Optional[EventData[T]]:
+        if len(result.topics) != self._plan.topics:
+            # this happens when an event has the same topic0, but different indexed events so it doesn't match up to the expected ABI
+            return None
+
+        return EventData[T](
+            name=self.name,
+            log=result,
+            event=self.process(
+                result.topics,
+                result.data,
+            ),
+            network=network,
+        )
+
     async def get_logs(
         self,
         start_block: BlockReference | int,
         end_block: BlockReference | int,
+        stream: bool = False,
+        cache: bool | LogCache = False,
     ) -> AsyncIterator[EventData[T]]:
-        cur_end = end_block
-        try:
-            response = await self._get_logs(
-                start_block,
-                cur_end,
-                self.addresses_filter,
-                topic1=self.topic1_filter,
-                topic2=self.topic2_filter,
-                topic3=self.topic3_filter,
+        """
+        The events in a block range.  With `stream`, events are yielded as the
+        response arrives instead of after it is loaded whole, so memory stays
+        bounded however many logs are in the range.
+
+        With `cache`, finalized logs are kept in the cache from `set_log_cache`,
+        or the cache given, and only the blocks it doesn't have are requested.
+        """
+        network = self._network or get_current_network()
+        if (store := log_cache(cache)) is not None:
+            block = Block[network]  # type: ignore[valid-type]
+            results = store.get_logs(
+                self._cache_key(),
+                await block.convert(start_block),
+                await block.convert(end_block),
+                partial(self._fetch_logs, stream=stream),
+                partial(block.convert, "finalized"),
             )
+        else:
+            results = self._fetch_logs(start_block, end_block, stream)
+        async for result in results:
+            if (event_data := self._event_data(result, network)) is not None:
+                yield event_data
+
+    async def _fetch_logs(
+        self,
+        start_block: BlockReference | int,
+        end_block: BlockReference | int,
+        stream: bool = False,
+    ) -> AsyncIterator[Log]:
+        request = self._get_logs(
+            start_block,
+            end_block,
+            self.addresses_filter,
+            topic1=self.topic1_filter,
+            topic2=self.topic2_filter,
+            topic3=self.topic3_filter,
+        )
+        if stream:
+            try:
+                async for result in request.stream():
+                    yield result
+            except ValueError as err:
+                raise _logs_error(err)
+            return
+
+        try:
+            response = await request
         except ValueError as err:
-            message = err.args[0]
-            if isinstance(message, bytes):
-                try:
-                    message = message.decode("utf-8")
-                except UnicodeDecodeError:
-                    message = str(message)
-            else:
-                message = str(message)
-            if "Log response size exceeded." in message:
-                boundaries = re.findall("0x[0-9a-f]+", message)
-                raise LogResponseExceededError(
-                    err.args[0], int(boundaries[0], 16), int(boundaries[1], 16)
-                )
-            elif (
-                "Your app has exceeded its compute units per second capacity" in message
-            ):
-                raise RateLimitingError(message)
-            raise err
+            raise _logs_error(err)
 
         for result in response:
-            # TODO: this is just a placeholder
-            if len(result.topics) != (len(self.get_indexed()) + 1):
-                # this happens when an event has the same topic0, but different indexed events so it doesn't match up to the expected ABI
-                continue
-
-            event_data = EventData[T](
-                name=self.name,
-                log=result,
-                event=self.process(
-                    result.topics,
-                    result.data,
-                ),
-                network=self._network or get_current_network(),
-            )
-            yield event_data
+            yield result
 
     async def backfill(
         self,
@@ -477,6 +785,10 @@ class Event(Request, Generic[T]):
         end_block: int | None = None,
         step_size: Optional[int] = None,
         confirmations: int = 2,
+        stream: bool = False,
+        concurrency: int = 1,
+        resume: bool | CursorStore = False,
+        cache: bool | LogCache = False,
     ) -> AsyncIterator[EventData[T]]:
         """
         Retrieve historical events over a block range with automatic chunking.
@@ -494,8 +806,18 @@ class Event(Request, Generic[T]):
         Args:
             start_block: Starting block number (default: 1)
             end_block: Ending block number (default: latest - confirmations)
-            step_size: Fixed chunk size for processing (optional)
+            step_size: Fixed chunk size for processing.  Without one, each
+                chunk is sized from the density of the logs before it, see
+                `StepSizeController`
             confirmations: Number of blocks to exclude from tip to avoid reorgs
+            stream: Yield each chunk's events as its response arrives, see `get_logs`
+            concurrency: Fetch up to this many chunks at once, still yielding
+                events in order
+            resume: Record the last block whose events were all yielded, and
+                start after it the next time this backfill runs.  Uses the
+                store from `set_cursor_store`, or the store given
+            cache: Serve the blocks already fetched from a local log cache,
+                and cache the finalized blocks fetched, see `get_logs`
 
         Yields:
             EventData[T]: Decoded event data with log information and network context
@@ -517,6 +839,14 @@ class Event(Request, Generic[T]):
                 step_size=10000  # Process 10k blocks at a time
             ):
                 await store_event_in_database(event)
+
+            async for event in transfer_event.backfill(
+                start_block=17000000,
+                end_block=18000000,
+                step_size=2000,
+                concurrency=8,  # 8 requests in flight
+            ):
+                await store_event_in_database(event)
             ```
 
         Note:
@@ -535,28 +865,148 @@ class Event(Request, Generic[T]):
         else:
             cur_start = start_block
 
+        store = cursor_store(resume)
+        key = self._cursor_key()
+        if store is not None:
+            last = await store.load(key)
+            if last is not None and last >= cur_start:
+                cur_start = last + 1
+
+        if concurrency > 1:
+            async for log in self._backfill_concurrently(
+                cur_start,
+                end_block,
+                step_size,
+                stream,
+                concurrency,
+                store,
+                key,
+                cache,
+            ):
+                yield log
+            return
+
+        controller = (
+            None if step_size else self._step_controller(end_block - cur_start + 1)
+        )
         if step_size:
             cur_end = cur_start + step_size
         else:
-            cur_end = end_block
+            cur_end = cur_start + controller.step - 1  # type: ignore[union-attr]
         while cur_start <= end_block:
+            blocks = min(cur_end, end_block) - cur_start + 1
+            logs = self.get_logs(
+                start_block=cur_start,
+                end_block=min(cur_end, end_block),
+                stream=stream,
+                cache=cache,
+            )
+            if controller is not None:
+                logs = controller.window(blocks, logs, _event_size)
             try:
-                async for log in self.get_logs(
-                    start_block=cur_start,
-                    end_block=min(cur_end, end_block),
-                ):
+                async for log in logs:
                     yield log
             except LogResponseExceededError as err:
+                if controller is not None:
+                    controller.exceeded(blocks, err.recommended_end - cur_start + 1)
                 cur_end = err.recommended_end
                 continue
             except RateLimitingError:
-                await asyncio.sleep(3)
+                # a configured rate limiter already backs off before the retry
+                if self.rpc().rate_limiter is None:
+                    await asyncio.sleep(3)
                 continue
+            if store is not None:
+                await store.save(key, min(cur_end, end_block))
             cur_start = cur_end + 1
             if step_size:
                 cur_end += step_size
             else:
-                cur_end = end_block
+                cur_end = cur_start + controller.step - 1  # type: ignore[union-attr]
+
+    def _step_controller(
+        self, blocks: int, network: Optional[type[Network]] = None
+    ) -> StepSizeController:
+        network = network or self._network or get_current_network()
+        return StepSizeController(
+            key=DensityStore.key(
+                network.chain_id, self.addresses_filter, self.get_topic0
+            ),
+            blocks=blocks,
+        )
+
+    def _filters(self) -> list:
+        return [
+            self.get_topic0,
+            self.topic1_filter,
+            self.topic2_filter,
+            self.topic3_filter,
+        ]
+
+    def _cursor_key(self) -> str:
+        network = self._network or get_current_network()
+        return CursorStore.key(network.chain_id, self._filters(), self.addresses_filter)
+
+    def _cache_key(self) -> str:
+        network = self._network or get_current_network()
+        return LogCache.key(network.chain_id, self._filters(), self.addresses_filter)
+
+    async def _backfill_concurrently(
+        self,
+        start_block: int,
+        end_block: int,
+        step_size: Optional[int],
+        stream: bool,
+        concurrency: int,
+        store: Optional[CursorStore] = None,
+        key: Optional[str] = None,
+        cache: bool | LogCache = False,
+    ) -> AsyncIterator[EventData[T]]:
+        controller = (
+            None if step_size else self._step_controller(end_block - start_block + 1)
+        )
+
+        async def fetch(start: int, end: int) -> list[EventData[T]]:
+            while True:
+                started = time.monotonic()
+                try:
+                    logs = [
+                        log
+                        async for log in self.get_logs(
+                            start, end, stream=stream, cache=cache
+                        )
+                    ]
+                except LogResponseExceededError as err:
+                    if controller is not None:
+                        controller.exceeded(
+                            end - start + 1, err.recommended_end - start + 1
+                        )
+                    raise
+                except RateLimitingError:
+                    if self.rpc().rate_limiter is None:
+                        await asyncio.sleep(3)
+                    continue
+                if controller is not None:
+                    controller.observe(
+                        end - start + 1,
+                        len(logs),
+                        sum(_event_size(log) for log in logs),
+                        time.monotonic() - started,
+                    )
+                return logs
+
+        on_chunk = (
+            partial(store.save, key) if store is not None and key is not None else None
+        )
+        async for log in ordered_chunks(
+            fetch,
+            start_block,
+            end_block,
+            step_size or (lambda: controller.step),  # type: ignore[union-attr]
+            concurrency,
+            on_chunk=on_chunk,
+        ):
+            yield log
 
     @property
     def subscribe(self) -> "AsyncSubscribeCallable[T]":
@@ -636,7 +1086,7 @@ class SyncEventWrapper(BaseModel, Generic[T]):
         if not (wss_uri := self.network.wss):
             raise ValueError("No wss set for network")
 
-        w3_connection = sync_connect(
+        w3_connection = _force_get_global_rpc(self.network).ws_connect_sync(
             (
                 wss_uri.unicode_string()
                 if isinstance(wss_uri, AnyWebsocketUrl)
@@ -712,53 +1162,34 @@ class SyncEventWrapper(BaseModel, Generic[T]):
         self,
         start_block: BlockReference | int,
         end_block: BlockReference | int,
+        stream: bool = False,
     ) -> Iterator[EventData[T]]:
-        cur_end = end_block
+        request = self.event._get_logs(
+            start_block,
+            end_block,
+            self.event.addresses_filter,
+            topic1=self.event.topic1_filter,
+            topic2=self.event.topic2_filter,
+            topic3=self.event.topic3_filter,
+        )
+        if stream:
+            try:
+                for result in request.stream_sync():
+                    event_data = self.event._event_data(result, self.network)
+                    if event_data is not None:
+                        yield event_data
+            except ValueError as err:
+                raise _logs_error(err)
+            return
+
         try:
-            response = self.event._get_logs(
-                start_block,
-                cur_end,
-                self.event.addresses_filter,
-                topic1=self.event.topic1_filter,
-                topic2=self.event.topic2_filter,
-                topic3=self.event.topic3_filter,
-            ).sync
+            response = request.sync
         except ValueError as err:
-            message = err.args[0]
-            if isinstance(message, bytes):
-                try:
-                    message = message.decode("utf-8")
-                except UnicodeDecodeError:
-                    message = str(message)
-            else:
-                message = str(message)
-            if "Log response size exceeded." in message:
-                boundaries = re.findall("0x[0-9a-f]+", message)
-                raise LogResponseExceededError(
-                    err.args[0], int(boundaries[0], 16), int(boundaries[1], 16)
-                )
-            elif (
-                "Your app has exceeded its compute units per second capacity" in message
-            ):
-                raise RateLimitingError(message)
-            raise err
+            raise _logs_error(err)
 
         for result in response:
-            # TODO: this is just a placeholder
-            if len(result.topics) != (len(self.event.get_indexed()) + 1):
-                # this happens when an event has the same topic0, but different indexed events so it doesn't match up to the expected ABI
-                continue
-
-            event_data = EventData[T](
-                name=self.event.name,
-                log=result,
-                event=self.event.process(
-                    result.topics,
-                    result.data,
-                ),
-                network=self.network,
-            )
-            yield event_data
+            if (event_data := self.event._event_data(result, self.network)) is not None:
+                yield event_data
 
     def backfill(
         self,
@@ -766,6 +1197,7 @@ class SyncEventWrapper(BaseModel, Generic[T]):
         end_block: int | None = None,
         step_size: Optional[int] = None,
         confirmations: int = 2,
+        stream: bool = False,
     ) -> Iterator[EventData[T]]:
         """
         This backfills events, handling LogResponseExceededError to provide all logs in a range too large for a single request
@@ -779,28 +1211,42 @@ class SyncEventWrapper(BaseModel, Generic[T]):
         else:
             cur_start = start_block
 
+        controller = (
+            None
+            if step_size
+            else self.event._step_controller(end_block - cur_start + 1, self.network)
+        )
         if step_size:
             cur_end = cur_start + step_size
         else:
-            cur_end = end_block
+            cur_end = cur_start + controller.step - 1  # type: ignore[union-attr]
         while cur_start <= end_block:
+            blocks = min(cur_end, end_block) - cur_start + 1
+            logs = self.get_logs(
+                start_block=cur_start,
+                end_block=min(cur_end, end_block),
+                stream=stream,
+            )
+            if controller is not None:
+                logs = controller.window_sync(blocks, logs, _event_size)
             try:
-                for log in self.get_logs(
-                    start_block=cur_start,
-                    end_block=min(cur_end, end_block),
-                ):
+                for log in logs:
                     yield log
             except LogResponseExceededError as err:
+                if controller is not None:
+                    controller.exceeded(blocks, err.recommended_end - cur_start + 1)
                 cur_end = err.recommended_end
                 continue
             except RateLimitingError:
-                time.sleep(3)
+                # a configured rate limiter already backs off before the retry
+                if self.event.rpc().rate_limiter is None:
+                    time.sleep(3)
                 continue
             cur_start = cur_end + 1
             if step_size:
                 cur_end += step_size
             else:
-                cur_end = end_block
+                cur_end = cur_start + controller.step - 1  # type: ignore[union-attr]
 
     @staticmethod
     def _send_subscription_request(
@@ -844,7 +1290,7 @@ class AsyncSubscribeCallable(BaseModel, Generic[T]):
         if not (wss_uri := self.network.wss):
             raise ValueError("No wss set for network")
 
-        async for w3_connection in connect(
+        async for w3_connection in _force_get_global_rpc(self.network).ws_connect(
             (
                 wss_uri.unicode_string()
                 if isinstance(wss_uri, AnyWebsocketUrl)
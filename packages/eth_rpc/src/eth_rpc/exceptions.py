@@ -19,4 +19,40 @@ class RateLimitingError(ValueError): ...
 class RPCDecodeError(ValueError): ...
 
 
+class RPCStatusError(RPCDecodeError):
+    """A failed http response without a JSON-RPC body, ie. a 502 from a gateway"""
+
+    status_code: int
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        super().__init__(content)
+
+
+class CircuitOpenError(ValueError):
+    """Raised instead of sending a request while the circuit breaker is open"""
+
+
+class CassetteMissError(ValueError):
+    """Raised when replaying a request or subscription that was never recorded"""
+
+
+class RPCError(ValueError):
+    """An error object returned by the node in place of a result"""
+
+    message: str
+    code: int | None
+    data: object
+
+    def __init__(self, message, code: int | None = None, data: object = None):
+        self.message = message
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+    @classmethod
+    def from_response(cls, error: dict) -> "RPCError":
+        return cls(error.get("message"), error.get("code"), error.get("data"))
+
+
 class UnsupportedChainIDException(ValueError): ...
@@ -0,0 +1,13 @@
+from .chain import LocalChain
+from .faults import Faults, exponential, fixed, lognormal, uniform
+from .server import LocalNode
+
+__all__ = [
+    "Faults",
+    "LocalChain",
+    "LocalNode",
+    "exponential",
+    "fixed",
+    "lognormal",
+    "uniform",
+]
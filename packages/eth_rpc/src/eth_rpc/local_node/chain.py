@@ -0,0 +1,361 @@
+import gzip
+import json
+import random
+from typing import Any, Optional
+
+from ..utils import BloomFilter
+
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+EMPTY_UNCLES = "0x1dcc4de8dec75d7aab85b567b6ccd41ad312451b948a7413f0a142fd40d49347"
+
+
+def _block_key(block: Any) -> int | str:
+    if isinstance(block, int):
+        return block
+    if isinstance(block, str) and block.startswith("0x") and len(block) < 66:
+        return int(block, 16)
+    # a tag, or a block hash
+    return block
+
+
+class LocalChain:
+    """
+    An in-memory chain of blocks, transactions, receipts and logs, kept in their
+    JSON-RPC form.  Blocks can be generated, mined, reorged out or loaded from a
+    cassette recorded against a real node.
+    """
+
+    def __init__(
+        self,
+        chain_id: int = 1337,
+        finality_depth: int = 64,
+        timestamp: int = 1_700_000_000,
+        block_time: int = 12,
+        transactions: int = 2,
+        logs: int = 1,
+        accounts: int = 100,
+        tokens: int = 4,
+        seed: int = 0,
+    ):
+        self.chain_id = chain_id
+        self.finality_depth = finality_depth
+        self.timestamp = timestamp
+        self.block_time = block_time
+        # the shape of generated blocks
+        self.transactions_per_block = transactions
+        self.logs_per_transaction = logs
+        self.head = -1
+        self.blocks: dict[int, dict] = {}
+        self.hashes: dict[str, int] = {}
+        self.logs: dict[int, list[dict]] = {}
+        self.transactions: dict[str, dict] = {}
+        self.receipts: dict[str, dict] = {}
+        # eth_call results, by (to, data), or (to, None) for any data
+        self.calls: dict[tuple[str, Optional[str]], str] = {}
+        self.balances: dict[str, int] = {}
+        self._random = random.Random(seed)
+        # bloom bits by address or topic, since generated values repeat
+        self._blooms: dict[str, int] = {}
+        self.accounts = [self._address() for _ in range(accounts)]
+        self.tokens = [self._address() for _ in range(tokens)]
+
+    @classmethod
+    def synthetic(cls, blocks: int = 100, **kwargs) -> "LocalChain":
+        """A chain of `blocks` generated blocks, each with ERC20 transfers"""
+        chain = cls(**kwargs)
+        chain.mine(blocks)
+        return chain
+
+    def _hash(self) -> str:
+        return "0x%064x" % self._random.getrandbits(256)
+
+    def _address(self) -> str:
+        return "0x%040x" % self._random.getrandbits(160)
+
+    def _bloom(self, value: str) -> int:
+        if (bits := self._blooms.get(value)) is None:
+            bloom = BloomFilter.from_iterable([bytes.fromhex(value[2:])])
+            bits = self._blooms[value] = int(bloom)
+        return bits
+
+    def _transfer(self) -> dict:
+        sender, receiver = self._random.sample(self.accounts, 2)
+        return {
+            "from": sender,
+            "to": self._random.choice(self.tokens),
+            "input": "0xa9059cbb",
+            "logs": [
+                {
+                    "address": self._random.choice(self.tokens),
+                    "topics": [
+                        TRANSFER_TOPIC,
+                        "0x" + sender[2:].rjust(64, "0"),
+                        "0x" + receiver[2:].rjust(64, "0"),
+                    ],
+                    "data": "0x%064x" % self._random.getrandbits(64),
+                }
+                for _ in range(self.logs_per_transaction)
+            ],
+        }
+
+    def mine(self, count: int = 1) -> list[dict]:
+        """Generate `count` blocks of transfers on top of the head"""
+        return [
+            self.add_block(
+                [self._transfer() for _ in range(self.transactions_per_block)]
+            )
+            for _ in range(count)
+        ]
+
+    def add_block(self, transactions: Optional[list[dict]] = None) -> dict:
+        """
+        Add a block on top of the head.  Each transaction is a dict with `from`,
+        `to`, `input`, `value` and `logs`, a list of `address`, `topics`, `data`.
+        """
+        number = self.head + 1
+        parent = self.blocks.get(self.head)
+        block_hash = self._hash()
+        bloom = 0
+        txs: list[dict] = []
+        block_logs: list[dict] = []
+        gas_used = 0
+        for index, spec in enumerate(transactions or []):
+            tx_hash = self._hash()
+            tx = {
+                "hash": tx_hash,
+                "blockHash": block_hash,
+                "blockNumber": hex(number),
+                "transactionIndex": hex(index),
+                "from": spec["from"],
+                "to": spec.get("to"),
+                "gas": "0x186a0",
+                "gasPrice": "0x3b9aca00",
+                "maxFeePerGas": "0x77359400",
+                "maxPriorityFeePerGas": "0x3b9aca00",
+                "input": spec.get("input", "0x"),
+                "nonce": hex(index),
+                "value": hex(spec.get("value", 0)),
+                "type": "0x2",
+                "chainId": hex(self.chain_id),
+                "accessList": [],
+                "r": self._hash(),
+                "s": self._hash(),
+                "v": "0x0",
+                "yParity": "0x0",
+            }
+            tx_logs: list[dict] = []
+            tx_bloom = 0
+            for log in spec.get("logs", []):
+                tx_logs.append(
+                    {
+                        "address": log["address"],
+                        "topics": log["topics"],
+                        "data": log.get("data", "0x"),
+                        "blockHash": block_hash,
+                        "blockNumber": hex(number),
+                        "transactionHash": tx_hash,
+                        "transactionIndex": hex(index),
+                        "logIndex": hex(len(block_logs) + len(tx_logs)),
+                        "removed": False,
+                    }
+                )
+                tx_bloom |= self._bloom(log["address"])
+                for topic in log["topics"]:
+                    tx_bloom |= self._bloom(topic)
+            bloom |= tx_bloom
+            gas_used += 50_000
+            self.receipts[tx_hash] = {
+                "transactionHash": tx_hash,
+                "transactionIndex": hex(index),
+                "blockHash": block_hash,
+                "blockNumber": hex(number),
+                "from": spec["from"],
+                "to": spec.get("to"),
+                "contractAddress": None,
+                "cumulativeGasUsed": hex(gas_used),
+                "gasUsed": hex(50_000),
+                "effectiveGasPrice": "0x3b9aca00",
+                "logs": tx_logs,
+                "logsBloom": "0x%0512x" % tx_bloom,
+                "status": "0x1",
+                "type": "0x2",
+            }
+            block_logs += tx_logs
+            txs.append(tx)
+            self.transactions[tx_hash] = tx
+
+        block = {
+            "number": hex(number),
+            "hash": block_hash,
+            "parentHash": parent["hash"] if parent else "0x" + "00" * 32,
+            "nonce": "0x0000000000000000",
+            "sha3Uncles": EMPTY_UNCLES,
+            "logsBloom": "0x%0512x" % bloom,
+            "transactionsRoot": self._hash(),
+            "stateRoot": self._hash(),
+            "receiptsRoot": self._hash(),
+            "miner": self._address(),
+            "difficulty": "0x0",
+            "totalDifficulty": "0x0",
+            "extraData": "0x",
+            "size": hex(1_000 + 500 * len(txs)),
+            "gasLimit": "0x1c9c380",
+            "gasUsed": hex(gas_used),
+            "timestamp": hex(self.timestamp + number * self.block_time),
+            "baseFeePerGas": "0x3b9aca00",
+            "mixHash": self._hash(),
+            "transactions": txs,
+            "uncles": [],
+        }
+        self._insert(block, block_logs)
+        return block
+
+    def _insert(self, block: dict, logs: list[dict]) -> None:
+        number = int(block["number"], 16)
+        self.blocks[number] = block
+        self.hashes[block["hash"]] = number
+        self.logs[number] = logs
+        self.head = max(self.head, number)
+
+    def reorg(self, depth: int) -> tuple[list[dict], list[dict]]:
+        """
+        Replace the last `depth` blocks with new ones, returning the logs that
+        were removed (marked `removed`) and the new blocks
+        """
+        depth = min(depth, self.head + 1)
+        removed: list[dict] = []
+        for number in range(self.head - depth + 1, self.head + 1):
+            block = self.blocks.pop(number)
+            self.hashes.pop(block["hash"], None)
+            for tx in block["transactions"]:
+                if isinstance(tx, dict):
+                    self.transactions.pop(tx["hash"], None)
+                    self.receipts.pop(tx["hash"], None)
+            removed += [{**log, "removed": True} for log in self.logs.pop(number, [])]
+        self.head -= depth
+        return removed, self.mine(depth)
+
+    def add_call(self, to: str, data: Optional[str], result: str) -> None:
+        """Answer eth_call to `to` with `data`, or any data if None, with `result`"""
+        self.calls[(to.lower(), data)] = result
+
+    @classmethod
+    def from_cassette(cls, path: str, **kwargs) -> "LocalChain":
+        """
+        A chain from the blocks, receipts, logs and eth_call results recorded
+        in a cassette, see `eth_rpc.rpc.Cassette`
+        """
+        chain = cls(**kwargs)
+        opener: Any = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if "request" not in entry:
+                    continue
+                requests, responses = entry["request"], entry["response"]
+                if isinstance(requests, dict):
+                    requests, responses = [requests], [responses]
+                by_id = {
+                    response.get("id"): response
+                    for response in responses
+                    if isinstance(response, dict)
+                }
+                for request in requests:
+                    response = by_id.get(request.get("id"), {})
+                    if (result := response.get("result")) is not None:
+                        chain._load(request, result)
+        return chain
+
+    def _load(self, request: dict, result: Any) -> None:
+        method, params = request["method"], request.get("params", [])
+        if method in ("eth_getBlockByNumber", "eth_getBlockByHash"):
+            number = int(result["number"], 16)
+            known = self.blocks.get(number)
+            # keep the version with full transactions
+            if known is None or not isinstance(
+                next(iter(result["transactions"]), {}), str
+            ):
+                self.blocks[number] = result
+                self.hashes[result["hash"]] = number
+                self.head = max(self.head, number)
+            for tx in result["transactions"]:
+                if isinstance(tx, dict):
+                    self.transactions[tx["hash"]] = tx
+        elif method == "eth_getTransactionReceipt":
+            self.receipts[result["transactionHash"]] = result
+        elif method == "eth_getBlockReceipts":
+            for receipt in result:
+                self.receipts[receipt["transactionHash"]] = receipt
+        elif method == "eth_getTransactionByHash":
+            self.transactions[result["hash"]] = result
+        elif method == "eth_getLogs":
+            for log in result:
+                logs = self.logs.setdefault(int(log["blockNumber"], 16), [])
+                if log not in logs:
+                    logs.append(log)
+        elif method == "eth_call" and params:
+            self.add_call(params[0].get("to", ""), params[0].get("data"), result)
+        elif method == "eth_blockNumber":
+            self.head = max(self.head, int(result, 16))
+
+    def resolve(self, block: Any) -> Optional[int]:
+        """A block number for a number, hash or tag"""
+        key = _block_key(block)
+        if isinstance(key, int):
+            return key
+        if key in ("latest", "pending", None):
+            return self.head
+        if key == "earliest":
+            return 0
+        if key == "finalized":
+            return max(self.head - self.finality_depth, 0)
+        if key == "safe":
+            return max(self.head - self.finality_depth // 2, 0)
+        return self.hashes.get(key)
+
+    def block(self, block: Any, full: bool = False) -> Optional[dict]:
+        if (number := self.resolve(block)) is None:
+            return None
+        if (result := self.blocks.get(number)) is None:
+            return None
+        if full:
+            return result
+        return {
+            **result,
+            "transactions": [
+                tx["hash"] if isinstance(tx, dict) else tx
+                for tx in result["transactions"]
+            ],
+        }
+
+    def get_logs(self, filter_: dict) -> list[dict]:
+        if block_hash := filter_.get("blockHash"):
+            if (number := self.hashes.get(block_hash)) is None:
+                return []
+            start = end = number
+        else:
+            start = self.resolve(filter_.get("fromBlock", "latest")) or 0
+            end = self.resolve(filter_.get("toBlock", "latest")) or 0
+        return [
+            log
+            for number in range(start, min(end, self.head) + 1)
+            for log in self.logs.get(number, [])
+            if matches(log, filter_)
+        ]
+
+
+def matches(log: dict, filter_: dict) -> bool:
+    """Whether a log passes an eth_getLogs or logs subscription filter"""
+    if address := filter_.get("address"):
+        addresses = [address] if isinstance(address, str) else address
+        if addresses and log["address"].lower() not in {a.lower() for a in addresses}:
+            return False
+    for i, topic in enumerate(filter_.get("topics") or []):
+        if topic is None or topic == []:
+            continue
+        if i >= len(log["topics"]):
+            return False
+        options = [topic] if isinstance(topic, str) else topic
+        if log["topics"][i].lower() not in {option.lower() for option in options}:
+            return False
+    return True
@@ -0,0 +1,142 @@
+import math
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+Distribution = Callable[[], float]
+
+RATE_LIMIT_MESSAGE = (
+    "Your app has exceeded its compute units per second capacity. If you have "
+    "retries enabled, you can safely ignore this message. If not, check out "
+    "https://docs.alchemy.com/reference/throughput"
+)
+
+
+def log_response_exceeded(start: int, end: int) -> str:
+    """The error a provider returns for a too large eth_getLogs, with a range that works"""
+    return (
+        "Log response size exceeded. You can make eth_getLogs requests with up to "
+        "a 2K block range and no limit on the response size, or you can request "
+        "any block range with a cap of 10K logs in the response. Based on your "
+        f"parameters, this block range should work: [{hex(start)}, {hex(end)}]"
+    )
+
+
+def fixed(seconds: float) -> Distribution:
+    return lambda: seconds
+
+
+def uniform(low: float, high: float, seed: Optional[int] = None) -> Distribution:
+    rng = random.Random(seed)
+    return lambda: rng.uniform(low, high)
+
+
+def lognormal(
+    median: float, sigma: float = 0.5, seed: Optional[int] = None
+) -> Distribution:
+    """Latency with a long tail, the usual shape of a provider's response times"""
+    rng = random.Random(seed)
+    mu = math.log(median)
+    return lambda: rng.lognormvariate(mu, sigma)
+
+
+def exponential(mean: float, seed: Optional[int] = None) -> Distribution:
+    rng = random.Random(seed)
+    return lambda: rng.expovariate(1 / mean)
+
+
+class Faults:
+    """
+    What a `LocalNode` gets wrong, and how often:
+
+    - `latency`: a distribution of response times, per method in `method_latency`
+    - `rate_limit`: requests per second before answering 429, and
+      `rate_limit_ratio` of requests rate limited at random
+    - `error_ratio`: requests answered with a 503
+    - `max_logs` and `max_block_range`: eth_getLogs requests over the limit fail
+      with `Log response size exceeded`, suggesting a range that fits
+    - `drop_ws_after`: websocket connections are dropped after sending that
+      many subscription messages
+    """
+
+    def __init__(
+        self,
+        latency: Optional[Distribution] = None,
+        method_latency: Optional[dict[str, Distribution]] = None,
+        rate_limit: Optional[float] = None,
+        rate_limit_ratio: float = 0.0,
+        error_ratio: float = 0.0,
+        max_logs: Optional[int] = None,
+        max_block_range: Optional[int] = None,
+        drop_ws_after: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.method_latency = method_latency or {}
+        self.rate_limit = rate_limit
+        self.rate_limit_ratio = rate_limit_ratio
+        self.error_ratio = error_ratio
+        self.max_logs = max_logs
+        self.max_block_range = max_block_range
+        self.drop_ws_after = drop_ws_after
+
+        self.rate_limited = 0
+        self.errors = 0
+        self.logs_exceeded = 0
+        self.dropped = 0
+        self._random = random.Random(seed)
+        self._tokens = rate_limit or 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def delay(self, method: str) -> float:
+        if (distribution := self.method_latency.get(method, self.latency)) is None:
+            return 0.0
+        return max(distribution(), 0.0)
+
+    def should_rate_limit(self) -> bool:
+        with self._lock:
+            limited = False
+            if self.rate_limit is not None:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.rate_limit,
+                    self._tokens + (now - self._updated) * self.rate_limit,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                else:
+                    limited = True
+            if not limited and self.rate_limit_ratio:
+                limited = self._random.random() < self.rate_limit_ratio
+            self.rate_limited += limited
+            return limited
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            failed = bool(self.error_ratio) and self._random.random() < self.error_ratio
+            self.errors += failed
+            return failed
+
+    def logs_limit(self, start: int, end: int, counts: list[int]) -> Optional[str]:
+        """
+        The error for an eth_getLogs over `start`..`end`, given the number of
+        matching logs per block, or None if it is allowed
+        """
+        limit_end = end
+        if self.max_block_range is not None:
+            limit_end = min(limit_end, start + self.max_block_range - 1)
+        if self.max_logs is not None:
+            total = 0
+            for offset, count in enumerate(counts):
+                total += count
+                if total > self.max_logs:
+                    # at least one block, even if it alone is over the limit
+                    limit_end = min(limit_end, max(start + offset - 1, start))
+                    break
+        if limit_end >= end:
+            return None
+        self.logs_exceeded += 1
+        return log_response_exceeded(start, limit_end)
@@ -0,0 +1,425 @@
+import asyncio
+import itertools
+import json
+import threading
+import types
+from http import HTTPStatus
+from typing import Any, Optional
+
+from pydantic import AnyHttpUrl
+from pydantic.networks import AnyWebsocketUrl
+from websockets.asyncio.server import ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+from ..types import BlockExplorer, Network, Rpcs, RpcUrl
+from .chain import LocalChain, matches
+from .faults import RATE_LIMIT_MESSAGE, Faults
+
+
+class NodeError(Exception):
+    """Answered as a JSON-RPC error object"""
+
+    def __init__(self, code: int, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(message)
+
+
+class Subscriber:
+    def __init__(self, ws: ServerConnection):
+        self.ws = ws
+        # subscription id to ("newHeads", None) or ("logs", filter)
+        self.subscriptions: dict[str, tuple[str, Optional[dict]]] = {}
+        self.sent = 0
+
+
+class LocalNode:
+    """
+    A JSON-RPC node served from the current process, over http and websockets,
+    for load testing without a provider:
+
+    ```python
+    chain = LocalChain.synthetic(blocks=10_000, transactions=20)
+    faults = Faults(latency=lognormal(0.05), rate_limit=300, max_logs=10_000)
+    async with LocalNode(chain, faults, block_time=0.5) as node:
+        rpc = RPC(network=node.network())
+        ...
+    ```
+
+    New blocks are mined every `block_time` seconds, if set, and every
+    `reorg_every` blocks the last `reorg_depth` are reorged out.
+    """
+
+    def __init__(
+        self,
+        chain: Optional[LocalChain] = None,
+        faults: Optional[Faults] = None,
+        host: str = "127.0.0.1",
+        block_time: Optional[float] = None,
+        reorg_every: Optional[int] = None,
+        reorg_depth: int = 2,
+    ):
+        self.chain = chain or LocalChain.synthetic()
+        self.faults = faults or Faults()
+        self.host = host
+        self.block_time = block_time
+        self.reorg_every = reorg_every
+        self.reorg_depth = reorg_depth
+        self.requests: dict[str, int] = {}
+        self.port: Optional[int] = None
+        self.ws_port: Optional[int] = None
+        self._subscribers: set[Subscriber] = set()
+        self._subscription_ids = itertools.count(1)
+        self._http: Optional[asyncio.AbstractServer] = None
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._ws: Any = None
+        self._miner: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def http_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.ws_port}"
+
+    def network(self, name: str = "Local Node") -> type[Network]:
+        """A network pointing at this node"""
+        attrs: dict[str, Any] = {
+            "chain_id": self.chain.chain_id,
+            "name": name,
+            "native_currency": "ETH",
+            "rpc": Rpcs(
+                default=RpcUrl(
+                    http=AnyHttpUrl(self.http_url), wss=AnyWebsocketUrl(self.ws_url)
+                )
+            ),
+            "block_explorer": BlockExplorer(name="", url="", api_url=""),
+            "apprx_block_time": self.block_time or 12.0,
+        }
+        return types.new_class(
+            "LocalNetwork", (Network,), exec_body=lambda ns: ns.update(attrs)
+        )
+
+    async def start(self) -> "LocalNode":
+        self._http = await asyncio.start_server(self._serve_http, self.host, 0)
+        self.port = self._http.sockets[0].getsockname()[1]
+        self._ws = await serve(self._serve_ws, self.host, 0, max_size=None)
+        self.ws_port = self._ws.sockets[0].getsockname()[1]
+        if self.block_time:
+            self._miner = asyncio.ensure_future(self._mine_forever())
+        return self
+
+    async def stop(self) -> None:
+        if self._miner is not None:
+            self._miner.cancel()
+            self._miner = None
+        if self._ws is not None:
+            self._ws.close()
+            await self._ws.wait_closed()
+            self._ws = None
+        if self._http is not None:
+            self._http.close()
+            # end keep-alive connections, so their handlers finish cleanly
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._http.wait_closed()
+            self._http = None
+
+    async def __aenter__(self) -> "LocalNode":
+        return await self.start()
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    def start_in_thread(self) -> "LocalNode":
+        """Serve from a background thread, for sync clients"""
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop_thread(self) -> None:
+        if self._loop is None or self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = self._thread = None
+
+    # the chain
+
+    async def mine(self, count: int = 1) -> None:
+        """Mine blocks, notifying subscribers"""
+        for block in self.chain.mine(count):
+            await self._notify(block, self.chain.logs[int(block["number"], 16)])
+
+    async def reorg(self, depth: int) -> None:
+        """Reorg out the last `depth` blocks, notifying subscribers"""
+        removed, blocks = self.chain.reorg(depth)
+        await self._notify(None, removed)
+        for block in blocks:
+            await self._notify(block, self.chain.logs[int(block["number"], 16)])
+
+    async def _mine_forever(self) -> None:
+        mined = 0
+        while True:
+            await asyncio.sleep(self.block_time)  # type: ignore[arg-type]
+            await self.mine()
+            mined += 1
+            if self.reorg_every and mined % self.reorg_every == 0:
+                await self.reorg(self.reorg_depth)
+
+    # json-rpc
+
+    def dispatch(self, payload: dict) -> dict:
+        """The response to a single JSON-RPC request, without any faults"""
+        method = payload.get("method", "")
+        self.requests[method] = self.requests.get(method, 0) + 1
+        response: dict[str, Any] = {"jsonrpc": "2.0", "id": payload.get("id")}
+        try:
+            if (handler := getattr(self, f"_rpc_{method}", None)) is None:
+                raise NodeError(-32601, f"the method {method} does not exist")
+            response["result"] = handler(*self._params(payload))
+        except NodeError as exc:
+            response["error"] = {"code": exc.code, "message": exc.message}
+        except (IndexError, KeyError, TypeError, ValueError, AttributeError) as exc:
+            response["error"] = {"code": -32602, "message": f"invalid params: {exc}"}
+        return response
+
+    @staticmethod
+    def _params(payload: dict) -> list:
+        params = payload.get("params", [])
+        return params if isinstance(params, list) else [params]
+
+    async def handle(self, body: bytes) -> tuple[int, bytes]:
+        """An http request body to the status and body of the response"""
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            error = {"code": -32700, "message": "parse error"}
+            return (
+                400,
+                json.dumps({"jsonrpc": "2.0", "id": None, "error": error}).encode(),
+            )
+
+        payloads = payload if isinstance(payload, list) else [payload]
+        if delay := max(
+            (self.faults.delay(elem.get("method", "")) for elem in payloads),
+            default=0.0,
+        ):
+            await asyncio.sleep(delay)
+        if self.faults.should_fail():
+            return 503, b"Service Unavailable"
+        if self.faults.should_rate_limit():
+            errors = [
+                {
+                    "jsonrpc": "2.0",
+                    "id": elem.get("id"),
+                    "error": {"code": 429, "message": RATE_LIMIT_MESSAGE},
+                }
+                for elem in payloads
+            ]
+            return (
+                429,
+                json.dumps(errors if isinstance(payload, list) else errors[0]).encode(),
+            )
+
+        responses = [self.dispatch(elem) for elem in payloads]
+        result = responses if isinstance(payload, list) else responses[0]
+        return 200, json.dumps(result).encode()
+
+    async def _serve_http(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer  # type: ignore[index]
+        try:
+            while await reader.readline():
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, content = await self.handle(body)
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n\r\n".encode() + content
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(task, None)  # type: ignore[arg-type]
+            writer.close()
+
+    async def _serve_ws(self, ws: ServerConnection) -> None:
+        subscriber = Subscriber(ws)
+        self._subscribers.add(subscriber)
+        try:
+            async for message in ws:
+                payload = json.loads(message)
+                if delay := self.faults.delay(payload.get("method", "")):
+                    await asyncio.sleep(delay)
+                await ws.send(json.dumps(self._ws_dispatch(subscriber, payload)))
+        except ConnectionClosed:
+            pass
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def _ws_dispatch(self, subscriber: Subscriber, payload: Any) -> Any:
+        if isinstance(payload, list):
+            return [self._ws_dispatch(subscriber, elem) for elem in payload]
+        method = payload.get("method")
+        if method == "eth_subscribe":
+            kind, *rest = self._params(payload)
+            if kind not in ("newHeads", "logs"):
+                return {
+                    "jsonrpc": "2.0",
+                    "id": payload.get("id"),
+                    "error": {"code": -32602, "message": f"unsupported: {kind}"},
+                }
+            subscription = hex(next(self._subscription_ids))
+            subscriber.subscriptions[subscription] = (kind, rest[0] if rest else {})
+            return {"jsonrpc": "2.0", "id": payload.get("id"), "result": subscription}
+        if method == "eth_unsubscribe":
+            (subscription,) = self._params(payload)
+            found = subscriber.subscriptions.pop(subscription, None) is not None
+            return {"jsonrpc": "2.0", "id": payload.get("id"), "result": found}
+        return self.dispatch(payload)
+
+    async def _notify(self, block: Optional[dict], logs: list[dict]) -> None:
+        header = self.chain.block(block["hash"]) if block is not None else None
+        for subscriber in list(self._subscribers):
+            for subscription, (kind, filter_) in subscriber.subscriptions.items():
+                if kind == "newHeads":
+                    results = [header] if header is not None else []
+                else:
+                    results = [log for log in logs if matches(log, filter_ or {})]
+                for result in results:
+                    await self._send(subscriber, subscription, result)
+
+    async def _send(self, subscriber: Subscriber, subscription: str, result: Any):
+        message = {
+            "jsonrpc": "2.0",
+            "method": "eth_subscription",
+            "params": {"subscription": subscription, "result": result},
+        }
+        try:
+            await subscriber.ws.send(json.dumps(message))
+        except ConnectionClosed:
+            return
+        subscriber.sent += 1
+        if (limit := self.faults.drop_ws_after) and subscriber.sent >= limit:
+            self.faults.dropped += 1
+            subscriber.subscriptions = {}
+            await subscriber.ws.close(1011, "dropped by fault injection")
+
+    # methods
+
+    def _block_number(self, block: Any) -> int:
+        if (number := self.chain.resolve(block)) is None:
+            raise NodeError(-32000, f"unknown block {block}")
+        return number
+
+    def _rpc_eth_chainId(self) -> str:
+        return hex(self.chain.chain_id)
+
+    def _rpc_net_version(self) -> str:
+        return str(self.chain.chain_id)
+
+    def _rpc_web3_clientVersion(self) -> str:
+        return "eth_rpc/LocalNode"
+
+    def _rpc_eth_blockNumber(self) -> str:
+        return hex(self.chain.head)
+
+    def _rpc_eth_gasPrice(self) -> str:
+        return "0x3b9aca00"
+
+    def _rpc_eth_maxPriorityFeePerGas(self) -> str:
+        return "0x3b9aca00"
+
+    def _rpc_eth_estimateGas(self, *params) -> str:
+        return "0x5208"
+
+    def _rpc_eth_getBalance(self, address: str, block: Any = "latest") -> str:
+        return hex(self.chain.balances.get(address.lower(), 0))
+
+    def _rpc_eth_getTransactionCount(self, address: str, block: Any = "latest") -> str:
+        return "0x0"
+
+    def _rpc_eth_getCode(self, address: str, block: Any = "latest") -> str:
+        return "0x"
+
+    def _rpc_eth_getBlockByNumber(
+        self, block: Any, full: bool = False
+    ) -> Optional[dict]:
+        return self.chain.block(block, full)
+
+    def _rpc_eth_getBlockByHash(
+        self, block_hash: str, full: bool = False
+    ) -> Optional[dict]:
+        return self.chain.block(block_hash, full)
+
+    def _rpc_eth_getBlockTransactionCountByNumber(self, block: Any) -> Optional[str]:
+        if (result := self.chain.block(block)) is None:
+            return None
+        return hex(len(result["transactions"]))
+
+    def _rpc_eth_getTransactionByHash(self, tx_hash: str) -> Optional[dict]:
+        return self.chain.transactions.get(tx_hash)
+
+    def _rpc_eth_getTransactionReceipt(self, tx_hash: str) -> Optional[dict]:
+        return self.chain.receipts.get(tx_hash)
+
+    def _rpc_eth_getBlockReceipts(self, block: Any) -> Optional[list[dict]]:
+        if (result := self.chain.block(block)) is None:
+            return None
+        return [self.chain.receipts[tx_hash] for tx_hash in result["transactions"]]
+
+    def _rpc_eth_getTransactionByBlockNumberAndIndex(
+        self, block: Any, index: str
+    ) -> Optional[dict]:
+        if (result := self.chain.block(block, full=True)) is None:
+            return None
+        transactions = result["transactions"]
+        i = int(index, 16)
+        return transactions[i] if i < len(transactions) else None
+
+    def _rpc_eth_call(self, call: dict, block: Any = "latest") -> str:
+        to = (call.get("to") or "").lower()
+        data = call.get("data") or call.get("input")
+        calls = self.chain.calls
+        if (result := calls.get((to, data), calls.get((to, None)))) is None:
+            raise NodeError(3, "execution reverted")
+        return result
+
+    def _rpc_eth_getLogs(self, filter_: dict) -> list[dict]:
+        if filter_.get("blockHash"):
+            return self.chain.get_logs(filter_)
+        start = self._block_number(filter_.get("fromBlock", "latest"))
+        end = self._block_number(filter_.get("toBlock", "latest"))
+        per_block = [
+            [log for log in self.chain.logs.get(number, []) if matches(log, filter_)]
+            for number in range(start, min(end, self.chain.head) + 1)
+        ]
+        counts = [len(logs) for logs in per_block]
+        if (error := self.faults.logs_limit(start, end, counts)) is not None:
+            raise NodeError(-32602, error)
+        return [log for logs in per_block for log in logs]
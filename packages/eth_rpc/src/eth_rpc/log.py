@@ -1,18 +1,22 @@
 import asyncio
 import json
+import time
 from collections.abc import AsyncIterator
+from functools import partial
 from typing import TypeVar
 
 from eth_rpc.models import Log as LogModel
 from eth_rpc.types import HexInt, LogsArgs, LogsParams
 from eth_typing import HexAddress, HexStr
 from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
-from websockets.legacy.client import connect
 
 from ._request import Request
 from .block import Block
 from .constants import DEFAULT_EVENT
+from .event import _logs_error
+from .exceptions import LogResponseExceededError
 from .types import RPCResponseModel
+from .utils import DensityStore, LogCache, StepSizeController, log_cache, log_size
 
 T = TypeVar("T")
 
@@ -41,6 +45,51 @@ class Log(Request, LogModel):
             ),
         )
 
+    @classmethod
+    async def get_logs(
+        cls,
+        from_block: int,
+        to_block: int,
+        address: HexAddress | list[HexAddress] | None = None,
+        topics: list[list[HexStr] | HexStr | None] | None = None,
+        cache: bool | LogCache = False,
+    ) -> AsyncIterator["LogModel"]:
+        """
+        The logs from `from_block` to `to_block`.  With `cache`, finalized logs
+        are kept in the cache from `set_log_cache`, or the cache given, and
+        only the blocks it doesn't have are requested.
+        """
+        if (store := log_cache(cache)) is None:
+            async for log in cls._fetch_logs(from_block, to_block, address, topics):
+                yield log
+            return
+
+        network = cls.rpc().network
+        addresses = [address] if isinstance(address, str) else address
+        async for log in store.get_logs(
+            LogCache.key(network.chain_id, topics or [], addresses),
+            from_block,
+            to_block,
+            partial(cls._fetch_logs, address=address, topics=topics),
+            partial(Block[network].convert, "finalized"),  # type: ignore[valid-type]
+        ):
+            yield log
+
+    @classmethod
+    async def _fetch_logs(
+        cls,
+        from_block: int,
+        to_block: int,
+        address: HexAddress | list[HexAddress] | None = None,
+        topics: list[list[HexStr] | HexStr | None] | None = None,
+    ) -> AsyncIterator["LogModel"]:
+        try:
+            logs = await cls.load_by_number(from_block, to_block, address, topics)
+        except ValueError as err:
+            raise _logs_error(err)
+        for log in logs:
+            yield log
+
     @classmethod
     async def listen(
         cls,
@@ -67,8 +116,7 @@ class Log(Request, LogModel):
 
     @classmethod
     async def _listen(cls):
-        async for w3_connection in connect(
-            cls.rpc().wss,
+        async for w3_connection in cls.rpc().ws_connect(
             ping_interval=60,
             ping_timeout=60,
             max_queue=10000,
@@ -111,10 +159,11 @@ class Log(Request, LogModel):
     async def subscribe_from(
         self,
         start_block: int | None = None,
-        batch_size: int = 50,
+        batch_size: int | None = None,
     ) -> AsyncIterator[LogModel]:
         """
-        Subscribe to logs, but backfilling starting at a specific block number and then listening
+        Subscribe to logs, but backfilling starting at a specific block number and then listening.
+        Without a `batch_size`, each batch is sized from the density of the logs before it.
         """
         queue = asyncio.Queue[LogModel]()
         should_publish_logs = asyncio.Event()
@@ -130,11 +179,37 @@ class Log(Request, LogModel):
         assert start_block
 
         num = start_block
-        while num <= latest:
-            batch_end = min(num + batch_size, latest)
-            for log in await self.load_by_number(num, batch_end):
-                yield log
-            num += batch_size
+        if batch_size:
+            while num <= latest:
+                batch_end = min(num + batch_size, latest)
+                for log in await self.load_by_number(num, batch_end):
+                    yield log
+                num += batch_size
+        else:
+            controller = StepSizeController(
+                key=DensityStore.key(self.rpc().network.chain_id)
+            )
+            while num <= latest:
+                batch_end = min(num + controller.step - 1, latest)
+                blocks = batch_end - num + 1
+                started = time.monotonic()
+                try:
+                    logs = await self.load_by_number(num, batch_end)
+                except ValueError as err:
+                    error = _logs_error(err)
+                    if not isinstance(error, LogResponseExceededError):
+                        raise error
+                    controller.exceeded(blocks, error.recommended_end - num + 1)
+                    continue
+                controller.observe(
+                    blocks,
+                    len(logs),
+                    sum(log_size(log) for log in logs),
+                    time.monotonic() - started,
+                )
+                for log in logs:
+                    yield log
+                num = batch_end + 1
 
         should_publish_logs.set()
         while True:
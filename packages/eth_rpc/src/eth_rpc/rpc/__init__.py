@@ -1,9 +1,41 @@
-from .base import BaseRPC
+from .base import BaseRPC, ConnectionPoolConfig
+from .batch import BatchItem, RPCBatch
+from .cache import ResponseCache
+from .cassette import Cassette
+from .hedge import HedgePolicy
 from .method import Middleware, RPCMethod, add_middleware
+from .metrics import METRICS, Metrics, PrometheusExporter, RPCCost, rpc_cost
+from .rate_limit import ALCHEMY_COMPUTE_UNITS, RateLimiter
+from .retry import CircuitBreaker, RetryBudget, RetryPolicy, RetryReason
+from .scheduler import Priority, RequestScheduler, request_priority
+from .single_flight import SingleFlight
+from .ws import WebSocketTransport
 
 __all__ = [
+    "ALCHEMY_COMPUTE_UNITS",
     "BaseRPC",
+    "BatchItem",
+    "Cassette",
+    "CircuitBreaker",
+    "ConnectionPoolConfig",
+    "HedgePolicy",
+    "METRICS",
+    "Metrics",
     "Middleware",
+    "PrometheusExporter",
+    "Priority",
+    "RPCCost",
+    "RPCBatch",
     "RPCMethod",
+    "RateLimiter",
+    "RequestScheduler",
+    "ResponseCache",
+    "RetryBudget",
+    "RetryPolicy",
+    "RetryReason",
+    "SingleFlight",
+    "WebSocketTransport",
     "add_middleware",
+    "request_priority",
+    "rpc_cost",
 ]
@@ -1,18 +1,126 @@
+import asyncio
+import contextlib
 import itertools
+import json
+import ssl
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from json import JSONDecodeError
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional
 
 import httpx
+from eth_rpc.exceptions import RPCDecodeError, RPCError, RPCStatusError
 from eth_rpc.types import Network
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from websockets.legacy.client import connect
+from websockets.sync.client import connect as sync_connect
+
+from .cache import ResponseCache
+from .cassette import Cassette
+from .decode import loads
+from .dispatcher import BatchDispatcher
+from .hedge import HedgePolicy
+from .metrics import METRICS, Metrics, measuring_cost
+from .pool import Endpoint, EndpointPool
+from .rate_limit import RateLimiter, is_rate_limited
+from .retry import RetryPolicy
+from .scheduler import RequestScheduler
+from .single_flight import SingleFlight
+from .stream import ResultStream
+from .ws import WebSocketTransport
+
+
+@lru_cache(maxsize=None)
+def ssl_context() -> ssl.SSLContext:
+    """
+    One SSL context shared by every http client, since loading the CA bundle is
+    most of the cost of creating a client.
+    """
+    return httpx.create_ssl_context()
+
+
+def make_client(**kwargs) -> httpx.Client:
+    return httpx.Client(verify=ssl_context(), **kwargs)
+
+
+def make_async_client(**kwargs) -> httpx.AsyncClient:
+    return httpx.AsyncClient(verify=ssl_context(), **kwargs)
+
+
+_closing: set[asyncio.Task] = set()
+
+
+def close_async_client(
+    client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop] = None
+) -> None:
+    """
+    Close a replaced async client on the loop its connections belong to,
+    `loop` or else the running loop.  With neither, the loop that opened them
+    has finished and there is nothing left to close them on.
+    """
+    if loop is None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            with contextlib.suppress(RuntimeError):
+                asyncio.run(client.aclose())
+            return
+    if loop.is_closed():
+        return
+
+    def close() -> None:
+        task = loop.create_task(client.aclose())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+    loop.call_soon_threadsafe(close)
+
+
+class ConnectionPoolConfig(BaseModel):
+    """Connection pool settings shared by the sync and async http clients"""
+
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 5.0
+    http2: bool = False
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def make_client(self) -> httpx.Client:
+        return make_client(limits=self.limits, http2=self.http2)
+
+    def make_async_client(self) -> httpx.AsyncClient:
+        return make_async_client(limits=self.limits, http2=self.http2)
 
 
 class BaseRPC(BaseModel):
     _timeout: float = 10.0
     _retries: int = 3
+    _max_batch_size: int = 100
+    _dispatcher: Optional[BatchDispatcher] = PrivateAttr(None)
+    _pool: Optional[EndpointPool] = PrivateAttr(None)
+    _rate_limiter: Optional[RateLimiter] = PrivateAttr(None)
+    _retry_policy: RetryPolicy = PrivateAttr(default_factory=RetryPolicy)
+    _response_cache: Optional[ResponseCache] = PrivateAttr(None)
+    _single_flight: Optional[SingleFlight] = PrivateAttr(None)
+    _trusted: bool = PrivateAttr(False)
+    _websocket: Optional[WebSocketTransport] = PrivateAttr(None)
+    _metrics: Optional[Metrics] = PrivateAttr(None)
+    _cassette: Optional[Cassette] = PrivateAttr(None)
+    _scheduler: Optional[RequestScheduler] = PrivateAttr(None)
 
     network: type[Network]
 
     index: itertools.count = Field(default_factory=lambda: itertools.count())
-    client: httpx.AsyncClient = Field(default_factory=lambda: httpx.AsyncClient())
+    client: httpx.AsyncClient = Field(default_factory=make_async_client)
+    sync_client: httpx.Client = Field(default_factory=make_client)
 
     @property
     def timeout(self) -> httpx.Timeout:
@@ -29,6 +137,198 @@ class BaseRPC(BaseModel):
     def retries(self):
         return self._retries
 
+    def set_retry_policy(self, policy: RetryPolicy):
+        self._retry_policy = policy
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy
+
+    def set_max_batch_size(self, max_batch_size: int):
+        self._max_batch_size = max_batch_size
+
+    @property
+    def max_batch_size(self) -> int:
+        """Maximum number of calls sent in a single JSON-RPC array request"""
+        return self._max_batch_size
+
+    def configure_pool(
+        self,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+    ):
+        """
+        Replace the http clients with clients using these connection pool limits.
+        HTTP/2 requires the `h2` package, ie. `pip install eth-rpc-py[http2]`.
+        """
+        config = ConnectionPoolConfig(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+        )
+        close_async_client(self.client)
+        self.client = config.make_async_client()
+        self.sync_client.close()
+        self.sync_client = config.make_client()
+
+    def enable_auto_batching(
+        self, window: float = 0.0, max_batch_size: Optional[int] = None
+    ):
+        """
+        Send concurrent async calls as JSON-RPC batches.  Calls made within `window`
+        seconds of each other (or the same loop iteration, by default) are flushed
+        together, up to `max_batch_size` calls per batch.
+        """
+        self._dispatcher = BatchDispatcher(
+            self, window=window, max_batch_size=max_batch_size
+        )
+
+    def disable_auto_batching(self):
+        if self._dispatcher is not None:
+            self._dispatcher.flush()
+        self._dispatcher = None
+
+    def set_rate_limiter(self, rate_limiter: Optional[RateLimiter]):
+        """
+        Pace requests through a token bucket, ie. to stay under a provider's
+        compute units per second:
+
+        ```python
+        rpc.set_rate_limiter(RateLimiter.alchemy(compute_units_per_second=330))
+        ```
+        """
+        self._rate_limiter = rate_limiter
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        return self._rate_limiter
+
+    def rate_limit_usage(self) -> Optional[dict]:
+        if self._rate_limiter is None:
+            return None
+        return self._rate_limiter.usage()
+
+    def set_response_cache(self, cache: Optional[ResponseCache]):
+        """
+        Cache results that can no longer change, see `ResponseCache`:
+
+        ```python
+        rpc.set_response_cache(ResponseCache(max_bytes=256 * 1024**2, path="rpc.db"))
+        ```
+        """
+        self._response_cache = cache
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        return self._response_cache
+
+    def enable_single_flight(
+        self, methods: Optional[Iterable[str]] = None
+    ) -> SingleFlight:
+        """
+        Share one request between concurrent async calls with the same method
+        and params.  Only idempotent reads are shared by default.
+        """
+        self._single_flight = (
+            SingleFlight() if methods is None else SingleFlight(methods)
+        )
+        return self._single_flight
+
+    def disable_single_flight(self):
+        self._single_flight = None
+
+    @property
+    def single_flight(self) -> Optional[SingleFlight]:
+        return self._single_flight
+
+    def set_trusted(self, trusted: bool):
+        """
+        Build response models without validating them, for a provider whose
+        data is trusted.  Models with validators are still validated.
+        """
+        self._trusted = trusted
+
+    @property
+    def trusted(self) -> bool:
+        return self._trusted
+
+    def enable_websocket(
+        self, url: Optional[str] = None, connections: int = 1
+    ) -> WebSocketTransport:
+        """
+        Send async requests over long-lived websocket connections to the
+        network's wss url, instead of http.  Sync requests still use http.
+        """
+        self._websocket = WebSocketTransport(url or self.wss, connections=connections)
+        return self._websocket
+
+    def disable_websocket(self) -> Optional[WebSocketTransport]:
+        """Go back to http, returning the websocket transport so it can be closed"""
+        websocket, self._websocket = self._websocket, None
+        return websocket
+
+    @property
+    def websocket(self) -> Optional[WebSocketTransport]:
+        return self._websocket
+
+    def set_metrics(self, metrics: Optional[Metrics]):
+        """Record calls to a `Metrics` registry, ie. `METRICS`, or `None` to stop"""
+        self._metrics = metrics
+
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        if self._metrics is None and measuring_cost():
+            # an `rpc_cost` block is measuring the calls
+            return METRICS
+        return self._metrics
+
+    def set_scheduler(self, scheduler: Optional[RequestScheduler]):
+        """
+        Queue requests by priority class, so bulk reads can't starve critical
+        calls, see `RequestScheduler`:
+
+        ```python
+        rpc.set_scheduler(RequestScheduler(max_concurrency=32))
+        with request_priority(Priority.CRITICAL):
+            await rpc.eth_call(args)
+        ```
+        """
+        self._scheduler = scheduler
+
+    @property
+    def scheduler(self) -> Optional[RequestScheduler]:
+        return self._scheduler
+
+    def set_cassette(self, cassette: Optional[Cassette]):
+        """
+        Record every request and subscription to a cassette, or replay them
+        from one without a node, see `Cassette`
+        """
+        self._cassette = cassette
+
+    @property
+    def cassette(self) -> Optional[Cassette]:
+        return self._cassette
+
+    def ws_connect(self, url: Optional[str] = None, **kwargs) -> Any:
+        """
+        The connections for a subscription loop, `async for ws in rpc.ws_connect()`,
+        recorded or replayed when a cassette is set
+        """
+        url = url or self.wss
+        if self._cassette is not None:
+            return self._cassette.connect(url, **kwargs)
+        return connect(url, **kwargs)
+
+    def ws_connect_sync(self, url: Optional[str] = None, **kwargs) -> Any:
+        url = url or self.wss
+        if self._cassette is not None:
+            return self._cassette.connect_sync(url, **kwargs)
+        return sync_connect(url, **kwargs)
+
     @property
     def wss(self) -> str:
         if (wss := self.network.wss) is None:
@@ -41,6 +341,463 @@ class BaseRPC(BaseModel):
             raise ValueError("http not set")
         return str(http)
 
+    @property
+    def pool(self) -> EndpointPool:
+        """The network's default and backup urls, rebuilt when the network changes"""
+        urls = [(self.http, self.network.rpc.default.weight)] + [
+            (str(backup.http), backup.weight) for backup in self.network.rpc.backups
+        ]
+        if self._pool is None or self._pool.urls != tuple(url for url, _ in urls):
+            previous = {e.url: e for e in self._pool.endpoints} if self._pool else {}
+            self._pool = EndpointPool(
+                [
+                    previous.get(url) or Endpoint(url=url, weight=weight)
+                    for url, weight in urls
+                ]
+            )
+        return self._pool
+
+    def endpoint_stats(self) -> list[dict]:
+        return self.pool.snapshot()
+
+    @staticmethod
+    def _parse(result: httpx.Response) -> Any:
+        try:
+            return loads(result.content)
+        except JSONDecodeError:
+            if result.is_error:
+                raise RPCStatusError(result.status_code, result.content)
+            raise RPCDecodeError(result.content)
+
+    def _record(
+        self,
+        pool: EndpointPool,
+        endpoint: Endpoint,
+        payload: dict | list[dict],
+        result: httpx.Response,
+        latency: float,
+        content: Optional[bytes] = None,
+        bytes_in: Optional[int] = None,
+    ) -> None:
+        """
+        Update the endpoint, rate limiter and metrics with a response.  A
+        streamed response passes its error body, if any, and its size.
+        """
+        if content is None:
+            content = result.content
+        if (metrics := self.metrics) is not None:
+            metrics.on_network(
+                self,
+                payload,
+                latency,
+                len(result.request.content),
+                len(content) if bytes_in is None else bytes_in,
+            )
+        rate_limited = is_rate_limited(result.status_code, content)
+        if rate_limited or pool.is_failure(result):
+            pool.record_failure(endpoint, rate_limited=rate_limited)
+        else:
+            pool.record_success(endpoint, latency)
+        if self._rate_limiter is not None:
+            if rate_limited:
+                self._rate_limiter.on_rate_limited()
+            else:
+                self._rate_limiter.on_success()
+
+    @staticmethod
+    def _ws_rate_limited(response: Any) -> bool:
+        """Whether a websocket response has a rate limiting error"""
+        responses = response if isinstance(response, list) else [response]
+        return any(
+            is_rate_limited(200, json.dumps(elem["error"]).encode())
+            for elem in responses
+            if isinstance(elem, dict) and elem.get("error")
+        )
+
+    @contextmanager
+    def _scheduled_sync(self, url: str, payload: dict | list[dict]) -> Iterator[None]:
+        """Hold one of the scheduler's slots for the endpoint, if there is one"""
+        if (scheduler := self._scheduler) is None:
+            yield
+            return
+        priority = scheduler.priority(payload)
+        scheduler.acquire_sync(url, priority)
+        try:
+            yield
+        finally:
+            scheduler.release(url, priority)
+
+    @asynccontextmanager
+    async def _scheduled(
+        self, url: str, payload: dict | list[dict]
+    ) -> AsyncIterator[None]:
+        if (scheduler := self._scheduler) is None:
+            yield
+            return
+        priority = scheduler.priority(payload)
+        await scheduler.acquire(url, priority)
+        try:
+            yield
+        finally:
+            scheduler.release(url, priority)
+
+    def _attempt_sync(
+        self, pool: EndpointPool, endpoint: Endpoint, payload: dict | list[dict]
+    ) -> httpx.Response:
+        with self._scheduled_sync(endpoint.url, payload):
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire_sync(payload)
+            endpoint.outstanding += 1
+            start = time.monotonic()
+            try:
+                result = self.sync_client.post(
+                    endpoint.url, json=payload, timeout=self.timeout
+                )
+            except httpx.TransportError:
+                pool.record_failure(endpoint)
+                raise
+            finally:
+                endpoint.outstanding -= 1
+        self._record(pool, endpoint, payload, result, time.monotonic() - start)
+        return result
+
+    async def _attempt_async(
+        self, pool: EndpointPool, endpoint: Endpoint, payload: dict | list[dict]
+    ) -> httpx.Response:
+        async with self._scheduled(endpoint.url, payload):
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(payload)
+            endpoint.outstanding += 1
+            start = time.monotonic()
+            try:
+                result = await self.client.post(
+                    endpoint.url, json=payload, timeout=self.timeout
+                )
+            except httpx.TransportError:
+                pool.record_failure(endpoint)
+                raise
+            finally:
+                endpoint.outstanding -= 1
+        self._record(pool, endpoint, payload, result, time.monotonic() - start)
+        return result
+
+    async def _hedge_attempt(
+        self,
+        pool: EndpointPool,
+        endpoint: Endpoint,
+        payload: dict,
+        policy: HedgePolicy,
+    ) -> httpx.Response:
+        start = time.monotonic()
+        try:
+            result = await self._attempt_async(pool, endpoint, payload)
+        except asyncio.CancelledError:
+            # the other request answered first, and this one took at least as long
+            policy.observe(payload["method"], time.monotonic() - start)
+            raise
+        policy.observe(payload["method"], time.monotonic() - start)
+        return result
+
+    def send_sync(self, payload: dict | list[dict]) -> Any:
+        """Send a JSON-RPC request, or a list of requests as a batch"""
+        if self._cassette is not None:
+            return self._cassette.send_sync(payload, self._send_sync)
+        return self._send_sync(payload)
+
+    def _send_sync(self, payload: dict | list[dict]) -> Any:
+        pool = self.pool
+        tried: list[Endpoint] = []
+        while True:
+            endpoint = pool.select(exclude=tried)
+            try:
+                result = self._attempt_sync(pool, endpoint, payload)
+            except httpx.TransportError as exc:
+                tried.append(endpoint)
+                if len(tried) < len(pool) and pool.is_retryable(payload, exc):
+                    continue
+                raise
+            if pool.is_failure(result):
+                tried.append(endpoint)
+                if len(tried) < len(pool) and pool.is_retryable(payload, None):
+                    continue
+            return self._parse(result)
+
+    async def send_async(self, payload: dict | list[dict]) -> Any:
+        """Send a JSON-RPC request, or a list of requests as a batch"""
+        if self._dispatcher is not None and isinstance(payload, dict):
+            return await self._dispatcher.submit(payload)
+        return await self._post_async(payload)
+
+    async def _post_async(self, payload: dict | list[dict]) -> Any:
+        if self._cassette is not None:
+            return await self._cassette.send_async(payload, self._send_async)
+        return await self._send_async(payload)
+
+    async def _send_async(self, payload: dict | list[dict]) -> Any:
+        if self._websocket is not None:
+            async with self._scheduled(self._websocket.url, payload):
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.acquire(payload)
+                start = time.monotonic()
+                response, bytes_out, bytes_in = await self._websocket.request(
+                    payload, timeout=self._timeout
+                )
+            if (metrics := self.metrics) is not None:
+                metrics.on_network(
+                    self, payload, time.monotonic() - start, bytes_out, bytes_in
+                )
+            if self._rate_limiter is not None:
+                if self._ws_rate_limited(response):
+                    self._rate_limiter.on_rate_limited()
+                else:
+                    self._rate_limiter.on_success()
+            return response
+        pool = self.pool
+        tried: list[Endpoint] = []
+        while True:
+            endpoint = pool.select(exclude=tried)
+            try:
+                result = await self._attempt_async(pool, endpoint, payload)
+            except httpx.TransportError as exc:
+                tried.append(endpoint)
+                if len(tried) < len(pool) and pool.is_retryable(payload, exc):
+                    continue
+                raise
+            if pool.is_failure(result):
+                tried.append(endpoint)
+                if len(tried) < len(pool) and pool.is_retryable(payload, None):
+                    continue
+            return self._parse(result)
+
+    def _finish_stream(
+        self,
+        pool: EndpointPool,
+        endpoint: Endpoint,
+        payload: dict,
+        result: httpx.Response,
+        parser: ResultStream,
+        latency: float,
+    ) -> list[Any]:
+        """Record a streamed response, returning any result it did not stream"""
+        response = parser.close()
+        error = response.get("error")
+        self._record(
+            pool,
+            endpoint,
+            payload,
+            result,
+            latency,
+            content=json.dumps(error).encode() if error is not None else b"",
+            bytes_in=result.num_bytes_downloaded,
+        )
+        if error is not None:
+            raise RPCError.from_response(error)
+        return [] if parser.streamed else ResultStream.elements(response)
+
+    def stream_sync(self, payload: dict) -> Iterator[list[Any]]:
+        """
+        Send a request with an array result, ie. `eth_getLogs`, yielding the
+        elements parsed from each chunk of the response body as it arrives.
+
+        The request can only go to another endpoint before the first element
+        is yielded.  Recorded or replayed requests are loaded whole.
+        """
+        if self._cassette is not None:
+            yield ResultStream.elements(self.send_sync(payload))
+            return
+        pool = self.pool
+        tried: list[Endpoint] = []
+        while True:
+            endpoint = pool.select(exclude=tried)
+            with self._scheduled_sync(endpoint.url, payload):
+                if self._rate_limiter is not None:
+                    self._rate_limiter.acquire_sync(payload)
+                yielded = False
+                endpoint.outstanding += 1
+                start = time.monotonic()
+                try:
+                    with self.sync_client.stream(
+                        "POST", endpoint.url, json=payload, timeout=self.timeout
+                    ) as result:
+                        if result.is_error:
+                            result.read()
+                            self._record(
+                                pool,
+                                endpoint,
+                                payload,
+                                result,
+                                time.monotonic() - start,
+                            )
+                            if pool.is_failure(result):
+                                tried.append(endpoint)
+                                if len(tried) < len(pool) and pool.is_retryable(
+                                    payload, None
+                                ):
+                                    continue
+                            yield ResultStream.elements(self._parse(result))
+                            return
+                        parser = ResultStream()
+                        for chunk in result.iter_bytes():
+                            if elements := parser.feed(chunk):
+                                yielded = True
+                                yield elements
+                        yield self._finish_stream(
+                            pool,
+                            endpoint,
+                            payload,
+                            result,
+                            parser,
+                            time.monotonic() - start,
+                        )
+                        return
+                except httpx.TransportError as exc:
+                    pool.record_failure(endpoint)
+                    tried.append(endpoint)
+                    if (
+                        not yielded
+                        and len(tried) < len(pool)
+                        and pool.is_retryable(payload, exc)
+                    ):
+                        continue
+                    raise
+                finally:
+                    endpoint.outstanding -= 1
+
+    async def stream_async(self, payload: dict) -> AsyncIterator[list[Any]]:
+        """
+        Send a request with an array result, ie. `eth_getLogs`, yielding the
+        elements parsed from each chunk of the response body, so decoding
+        overlaps with the transfer.  Requests sent over a websocket are loaded
+        whole.
+        """
+        if self._cassette is not None or self._websocket is not None:
+            yield ResultStream.elements(await self.send_async(payload))
+            return
+        pool = self.pool
+        tried: list[Endpoint] = []
+        while True:
+            endpoint = pool.select(exclude=tried)
+            async with self._scheduled(endpoint.url, payload):
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.acquire(payload)
+                yielded = False
+                endpoint.outstanding += 1
+                start = time.monotonic()
+                try:
+                    async with self.client.stream(
+                        "POST", endpoint.url, json=payload, timeout=self.timeout
+                    ) as result:
+                        if result.is_error:
+                            await result.aread()
+                            self._record(
+                                pool,
+                                endpoint,
+                                payload,
+                                result,
+                                time.monotonic() - start,
+                            )
+                            if pool.is_failure(result):
+                                tried.append(endpoint)
+                                if len(tried) < len(pool) and pool.is_retryable(
+                                    payload, None
+                                ):
+                                    continue
+                            yield ResultStream.elements(self._parse(result))
+                            return
+                        parser = ResultStream()
+                        async for chunk in result.aiter_bytes():
+                            if elements := parser.feed(chunk):
+                                yielded = True
+                                yield elements
+                        yield self._finish_stream(
+                            pool,
+                            endpoint,
+                            payload,
+                            result,
+                            parser,
+                            time.monotonic() - start,
+                        )
+                        return
+                except httpx.TransportError as exc:
+                    pool.record_failure(endpoint)
+                    tried.append(endpoint)
+                    if (
+                        not yielded
+                        and len(tried) < len(pool)
+                        and pool.is_retryable(payload, exc)
+                    ):
+                        continue
+                    raise
+                finally:
+                    endpoint.outstanding -= 1
+
+    async def send_hedged(self, payload: dict, policy: HedgePolicy) -> Any:
+        """
+        Send a read to one endpoint, and if it is slower than the policy's delay,
+        send a duplicate to a second endpoint and use whichever answers first.
+        Requests go over the websocket unhedged while one is enabled, since it
+        is a single connection to a single endpoint.
+        """
+        pool = self.pool
+        method = payload["method"]
+        if (
+            len(pool) < 2
+            or not policy.should_hedge(method)
+            or self._cassette is not None
+            or self._websocket is not None
+        ):
+            return await self.send_async(payload)
+
+        policy.record_request()
+        primary = pool.select()
+        tasks = [
+            asyncio.ensure_future(self._hedge_attempt(pool, primary, payload, policy))
+        ]
+        pending = set(tasks)
+        hedged = False
+        fallback = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=None if hedged else policy.delay(method),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        continue
+                    result = task.result()
+                    if pool.is_failure(result):
+                        continue
+                    response = self._parse(result)
+                    if isinstance(response, dict) and "error" in response:
+                        # ie. a lagging node, give the other request a chance
+                        fallback = fallback or response
+                        continue
+                    return response
+                if not hedged:
+                    # the primary is slow, or failed, so try a second endpoint
+                    hedged = True
+                    if policy.acquire():
+                        secondary = pool.select(exclude=[primary])
+                        tasks.append(
+                            asyncio.ensure_future(
+                                self._hedge_attempt(pool, secondary, payload, policy)
+                            )
+                        )
+                        pending.add(tasks[-1])
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # nothing came back usable, surface the primary request's outcome
+        if fallback is not None:
+            return fallback
+        first = tasks[0]
+        if (exc := first.exception()) is not None:
+            raise exc
+        return self._parse(first.result())
+
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
     )
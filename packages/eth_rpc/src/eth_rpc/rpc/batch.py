@@ -0,0 +1,162 @@
+from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar
+
+from eth_rpc.exceptions import RPCError
+
+if TYPE_CHECKING:
+    from .base import BaseRPC
+    from .method import RPCMethod
+
+T = TypeVar("T")
+
+
+class BatchItem(Generic[T]):
+    """A single call inside a batch, resolved once the batch has been sent"""
+
+    __slots__ = ["method", "payload", "_result", "_error", "_done"]
+
+    def __init__(self, method: "RPCMethod", payload: dict):
+        self.method = method
+        self.payload = payload
+        self._result: Optional[T] = None
+        self._error: Optional[Exception] = None
+        self._done: bool = False
+
+    @property
+    def id(self) -> int:
+        return self.payload["id"]
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def ok(self) -> bool:
+        return self._done and self._error is None
+
+    @property
+    def error(self) -> Optional[Exception]:
+        return self._error
+
+    @property
+    def result(self) -> T:
+        """The decoded result, raising the item's error if the call failed"""
+        if not self._done:
+            raise RuntimeError("Batch has not been executed")
+        if self._error is not None:
+            raise self._error
+        return self._result  # type: ignore
+
+    def set_response(self, response: dict) -> None:
+        try:
+            self._result = self.method._decode(response)
+        except Exception as exc:
+            self._error = exc
+        self._done = True
+
+    def set_error(self, error: Exception) -> None:
+        self._error = error
+        self._done = True
+
+    def __repr__(self):
+        if not self._done:
+            return f"<BatchItem {self.method.name}: pending>"
+        if self._error is not None:
+            return f"<BatchItem {self.method.name}: error={self._error!r}>"
+        return f"<BatchItem {self.method.name}: {self._result!r}>"
+
+
+class RPCBatch:
+    """
+    Collects heterogeneous calls and sends them as JSON-RPC array requests.
+
+    Batches larger than `max_size` are split into several requests.  Every
+    call gets its own `BatchItem`, so a failing call does not fail the batch:
+
+    ```python
+    async with rpc.batch() as batch:
+        block = batch.add(rpc.get_block_by_number, GetBlockByNumberArgs(...))
+        balance = batch.add(rpc.get_balance, GetAccountArgs(...))
+    print(block.result, balance.result)
+    ```
+
+    Middlewares are not applied to batched calls.
+    """
+
+    def __init__(self, rpc: "BaseRPC", max_size: Optional[int] = None):
+        self.rpc = rpc
+        self.max_size = max_size or rpc.max_batch_size
+        self.items: list[BatchItem] = []
+
+    def add(self, method: "RPCMethod[Any, T]", *params: Any) -> BatchItem[T]:
+        if method._rpc is not self.rpc:
+            raise ValueError(f"{method.name} is not bound to this RPC")
+        item: BatchItem[T] = BatchItem(method, method._build_payload(*params))
+        self.items.append(item)
+        return item
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _chunks(self) -> list[list[BatchItem]]:
+        pending = [item for item in self.items if not item.done]
+        return [
+            pending[i : i + self.max_size]
+            for i in range(0, len(pending), self.max_size)
+        ]
+
+    @staticmethod
+    def _resolve(chunk: list[BatchItem], response: Any) -> None:
+        if not isinstance(response, list):
+            # the whole request was rejected, ie. the node does not support batching
+            if isinstance(response, dict) and "error" in response:
+                error = RPCError.from_response(response["error"])
+            else:
+                error = RPCError(f"Invalid batch response: {response}")
+            for item in chunk:
+                item.set_error(error)
+            return
+
+        responses = {
+            elem.get("id"): elem for elem in response if isinstance(elem, dict)
+        }
+        for item in chunk:
+            if (elem := responses.get(item.id)) is None:
+                item.set_error(RPCError(f"No response for request id {item.id}"))
+            else:
+                item.set_response(elem)
+
+    async def execute(self) -> list[BatchItem]:
+        for chunk in self._chunks():
+            try:
+                response = await self.rpc.send_async([item.payload for item in chunk])
+            except Exception as exc:
+                for item in chunk:
+                    item.set_error(exc)
+                continue
+            self._resolve(chunk, response)
+        return self.items
+
+    def execute_sync(self) -> list[BatchItem]:
+        for chunk in self._chunks():
+            try:
+                response = self.rpc.send_sync([item.payload for item in chunk])
+            except Exception as exc:
+                for item in chunk:
+                    item.set_error(exc)
+                continue
+            self._resolve(chunk, response)
+        return self.items
+
+    async def __aenter__(self) -> "RPCBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.execute()
+
+    def __enter__(self) -> "RPCBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.execute_sync()
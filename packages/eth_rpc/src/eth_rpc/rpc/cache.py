@@ -0,0 +1,275 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Optional
+
+from .single_flight import request_key
+
+if TYPE_CHECKING:
+    from .base import BaseRPC
+
+# methods whose result is fixed by a block hash or transaction hash
+HASH_METHODS = frozenset(
+    [
+        "eth_getBlockByHash",
+        "eth_getBlockTransactionCountByHash",
+        "eth_getTransactionByBlockHashAndIndex",
+        "eth_getTransactionByHash",
+        "eth_getTransactionReceipt",
+    ]
+)
+
+# methods whose result is fixed by a block reference, and where it is in the params
+BLOCK_METHODS: dict[str, int] = {
+    "eth_call": 1,
+    "eth_getBalance": 1,
+    "eth_getBlockByNumber": 0,
+    "eth_getBlockReceipts": 0,
+    "eth_getBlockTransactionCountByNumber": 0,
+    "eth_getCode": 1,
+    "eth_getProof": 2,
+    "eth_getStorageAt": 2,
+    "eth_getTransactionByBlockNumberAndIndex": 0,
+    "eth_getTransactionCount": 1,
+}
+
+# the block is known and will never change
+FIXED = -1
+
+
+def _block_number(block: Any) -> Optional[int]:
+    """
+    The block number a reference pins the result to, FIXED for a block hash,
+    or None for a tag like `latest` whose result can still change.
+    """
+    if isinstance(block, bool):
+        return None
+    if isinstance(block, int):
+        return block
+    if isinstance(block, dict):
+        if "blockHash" in block:
+            return FIXED
+        return _block_number(block.get("blockNumber"))
+    if isinstance(block, str):
+        if block == "earliest":
+            return 0
+        if not block.startswith("0x"):
+            return None
+        if len(block) == 66:
+            return FIXED
+        return int(block, 16)
+    return None
+
+
+class LRUCache:
+    """In-memory store bounded by both its number of entries and their size"""
+
+    def __init__(self, max_entries: int = 10_000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if (value := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if (previous := self._entries.pop(key, None)) is not None:
+                self.size -= len(previous)
+            self._entries[key] = value
+            self.size += len(value)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class SQLiteCache:
+    """On-disk store, so cached responses survive restarts"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ResponseCache:
+    """
+    Caches results that can no longer change: lookups by hash, and reads at a
+    numeric block at or below the `finalized` block.  Reads at `latest`,
+    `pending` or any other tag are never cached.
+
+    The finalized block is refreshed at most every `finalized_ttl` seconds,
+    and only when a result is newer than the last known finalized block.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        path: Optional[str] = None,
+        finalized_ttl: float = 12.0,
+    ):
+        self.memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.disk = SQLiteCache(path) if path else None
+        self.finalized_ttl = finalized_ttl
+        self.finalized: Optional[int] = None
+        self._finalized_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _params(payload: dict) -> list:
+        params = payload.get("params", [])
+        return params if isinstance(params, list) else [params]
+
+    def key(self, rpc: "BaseRPC", payload: dict) -> Optional[str]:
+        """The cache key for a request, or None if it can never be cached"""
+        method = payload["method"]
+        params = self._params(payload)
+        if method == "eth_getLogs":
+            block = _block_number(
+                params[0].get("blockHash") or params[0].get("toBlock", "latest")
+            )
+        elif method in BLOCK_METHODS:
+            index = BLOCK_METHODS[method]
+            block = _block_number(params[index]) if index < len(params) else None
+        elif method in HASH_METHODS:
+            block = FIXED
+        else:
+            return None
+        if block is None:
+            return None
+        return request_key(rpc, payload)
+
+    def _required_block(self, payload: dict, result: Any) -> Optional[int]:
+        """The block that has to be finalized before the result can be cached"""
+        method = payload["method"]
+        params = self._params(payload)
+        if method == "eth_getLogs":
+            return _block_number(params[0].get("blockHash") or params[0].get("toBlock"))
+        if method in BLOCK_METHODS:
+            return _block_number(params[BLOCK_METHODS[method]])
+        if method != "eth_getBlockByHash" and isinstance(result, dict):
+            # a transaction can move to another block if its block is reorged out,
+            # and a pending transaction has no block yet
+            return _block_number(result.get("blockNumber"))
+        return FIXED
+
+    def get(self, rpc: "BaseRPC", payload: dict) -> Optional[dict]:
+        if (key := self.key(rpc, payload)) is None:
+            return None
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            if (value := self.disk.get(key)) is not None:
+                self.memory.set(key, value)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": json.loads(value)}
+
+    def _entry(
+        self, rpc: "BaseRPC", payload: dict, response: Any
+    ) -> Optional[tuple[str, bytes, int]]:
+        if not isinstance(response, dict) or response.get("result") is None:
+            return None
+        if (key := self.key(rpc, payload)) is None:
+            return None
+        if (block := self._required_block(payload, response["result"])) is None:
+            return None
+        return key, json.dumps(response["result"]).encode(), block
+
+    def _is_final(self, block: int) -> bool:
+        return block == FIXED or (
+            self.finalized is not None and block <= self.finalized
+        )
+
+    def _should_refresh(self) -> bool:
+        return time.monotonic() - self._finalized_at >= self.finalized_ttl
+
+    def _finalized_payload(self, rpc: "BaseRPC") -> dict:
+        return {
+            "method": "eth_getBlockByNumber",
+            "params": ["finalized", False],
+            "id": next(rpc.index),
+            "jsonrpc": "2.0",
+        }
+
+    def _set_finalized(self, response: Any) -> None:
+        self._finalized_at = time.monotonic()
+        if isinstance(response, dict) and isinstance(response.get("result"), dict):
+            self.finalized = int(response["result"]["number"], 16)
+
+    def _put(self, key: str, value: bytes) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def store_sync(self, rpc: "BaseRPC", payload: dict, response: Any) -> None:
+        if (entry := self._entry(rpc, payload, response)) is None:
+            return
+        key, value, block = entry
+        if not self._is_final(block) and self._should_refresh():
+            try:
+                self._set_finalized(rpc.send_sync(self._finalized_payload(rpc)))
+            except Exception:
+                # ie. the node does not support the finalized tag
+                self._finalized_at = time.monotonic()
+        if self._is_final(block):
+            self._put(key, value)
+
+    async def store(self, rpc: "BaseRPC", payload: dict, response: Any) -> None:
+        if (entry := self._entry(rpc, payload, response)) is None:
+            return
+        key, value, block = entry
+        if not self._is_final(block) and self._should_refresh():
+            try:
+                self._set_finalized(await rpc.send_async(self._finalized_payload(rpc)))
+            except Exception:
+                # ie. the node does not support the finalized tag
+                self._finalized_at = time.monotonic()
+        if self._is_final(block):
+            self._put(key, value)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.memory),
+            "bytes": self.memory.size,
+            "finalized": self.finalized,
+        }
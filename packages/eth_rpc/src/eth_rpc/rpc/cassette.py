@@ -0,0 +1,315 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from typing import IO, Any, AsyncIterator, Awaitable, Callable, Literal, Optional
+
+from eth_rpc.exceptions import CassetteMissError
+from websockets.exceptions import ConnectionClosedOK
+from websockets.legacy.client import connect
+from websockets.sync.client import connect as sync_connect
+
+Mode = Literal["record", "replay"]
+
+
+def _key(payload: dict | list[dict]) -> str:
+    """Identifies a request by its method and params, ignoring its id"""
+    if isinstance(payload, list):
+        return "[" + ",".join(_key(elem) for elem in payload) + "]"
+    return json.dumps(
+        [payload.get("method"), payload.get("params", [])],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def _with_ids(
+    payload: dict | list[dict], request: dict | list[dict], response: Any
+) -> Any:
+    """A recorded response, renumbered to answer a new request with the same key"""
+    if isinstance(payload, dict):
+        if isinstance(response, dict):
+            return {**response, "id": payload["id"]}
+        return response
+    if not isinstance(response, list):
+        return response
+    # batch responses can come back in any order, so map them by position
+    position = {elem["id"]: i for i, elem in enumerate(request)}
+    return [
+        (
+            {**elem, "id": payload[position[elem["id"]]]["id"]}
+            if isinstance(elem, dict) and elem.get("id") in position
+            else elem
+        )
+        for elem in response
+    ]
+
+
+class Cassette:
+    """
+    Records every JSON-RPC request and response, and every websocket
+    subscription message, to a JSON lines file (gzipped if the path ends in
+    `.gz`), and serves them back in replay mode without a node:
+
+    ```python
+    rpc.set_cassette(Cassette("pipeline.jsonl.gz", mode="record"))
+    ...
+    rpc.set_cassette(Cassette("pipeline.jsonl.gz", latency_scale=0.1))
+    ```
+
+    Replayed requests are matched by method and params.  A request made more
+    times than it was recorded gets its last recorded response again.
+    `latency_scale` replays the recorded latencies scaled by that factor, or
+    without any delay if None.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: Mode = "replay",
+        latency_scale: Optional[float] = None,
+    ):
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.recorded = 0
+        self.replayed = 0
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+        self._sessions = 0
+        # replay state
+        self._responses: dict[str, deque[tuple[Any, Any, float]]] = {}
+        self._streams: dict[str, deque[list[tuple[float, str]]]] = {}
+        if mode == "record":
+            self._file = self._open("wt")
+        else:
+            self._load()
+
+    def _open(self, mode: str) -> IO[str]:
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode, encoding="utf-8")  # type: ignore[return-value]
+        return open(self.path, mode, encoding="utf-8")
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def _write(self, entry: dict) -> None:
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                raise ValueError("cassette is closed")
+            self._file.write(line)
+            self.recorded += 1
+
+    def _load(self) -> None:
+        sessions: dict[int, tuple[Optional[str], list[tuple[float, str]]]] = {}
+        with self._open("rt") as f:
+            for line in f:
+                entry = json.loads(line)
+                if "session" not in entry:
+                    self._responses.setdefault(_key(entry["request"]), deque()).append(
+                        (entry["request"], entry["response"], entry["latency"])
+                    )
+                    continue
+                key, messages = sessions.setdefault(entry["session"], (None, []))
+                if "send" in entry and key is None:
+                    # a session is identified by its first message, the subscription
+                    sessions[entry["session"]] = (
+                        _key(json.loads(entry["send"])),
+                        messages,
+                    )
+                elif "recv" in entry:
+                    messages.append((entry["delay"], entry["recv"]))
+        for key, messages in sessions.values():
+            if key is not None:
+                self._streams.setdefault(key, deque()).append(messages)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    # json-rpc requests
+
+    def _replay(self, payload: dict | list[dict]) -> tuple[Any, float]:
+        with self._lock:
+            recorded = self._responses.get(_key(payload))
+            if not recorded:
+                raise CassetteMissError(f"request not recorded: {_key(payload)}")
+            request, response, latency = (
+                recorded.popleft() if len(recorded) > 1 else recorded[0]
+            )
+            self.replayed += 1
+        delay = latency * self.latency_scale if self.latency_scale else 0.0
+        return _with_ids(payload, request, response), delay
+
+    def _record(self, payload: dict | list[dict], response: Any, latency: float):
+        self._write({"request": payload, "response": response, "latency": latency})
+
+    def send_sync(self, payload: dict | list[dict], send: Callable[[Any], Any]) -> Any:
+        if not self.recording:
+            response, delay = self._replay(payload)
+            if delay:
+                time.sleep(delay)
+            return response
+        start = time.monotonic()
+        response = send(payload)
+        self._record(payload, response, time.monotonic() - start)
+        return response
+
+    async def send_async(
+        self, payload: dict | list[dict], send: Callable[[Any], Awaitable[Any]]
+    ) -> Any:
+        if not self.recording:
+            response, delay = self._replay(payload)
+            if delay:
+                await asyncio.sleep(delay)
+            return response
+        start = time.monotonic()
+        response = await send(payload)
+        self._record(payload, response, time.monotonic() - start)
+        return response
+
+    # websocket subscriptions
+
+    def _next_session(self) -> int:
+        with self._lock:
+            self._sessions += 1
+            return self._sessions
+
+    def _stream(self, message: str) -> list[tuple[float, str]]:
+        key = _key(json.loads(message))
+        with self._lock:
+            streams = self._streams.get(key)
+            if not streams:
+                raise CassetteMissError(f"subscription not recorded: {key}")
+            return streams.popleft()
+
+    def _has_stream(self, message: Optional[str]) -> bool:
+        if message is None:
+            return any(self._streams.values())
+        return bool(self._streams.get(_key(json.loads(message))))
+
+    def connect(self, url: str, **kwargs) -> AsyncIterator[Any]:
+        """
+        Replaces `websockets.legacy.client.connect(...)` in a subscription loop,
+        yielding a connection per reconnect.
+        """
+        if self.recording:
+            return self._record_connect(url, **kwargs)
+        return self._replay_connect()
+
+    async def _record_connect(self, url: str, **kwargs) -> AsyncIterator[Any]:
+        async for ws in connect(url, **kwargs):
+            yield RecordingConnection(self, ws)
+
+    async def _replay_connect(self) -> AsyncIterator[Any]:
+        subscription: Optional[str] = None
+        # reconnect while the same subscription has recorded sessions left
+        while self._has_stream(subscription):
+            conn = ReplayConnection(self)
+            yield conn
+            if (subscription := conn.subscription) is None:
+                return
+
+    def connect_sync(self, url: str, **kwargs) -> Any:
+        """Replaces `websockets.sync.client.connect(...)`"""
+        if self.recording:
+            return SyncRecordingConnection(self, sync_connect(url, **kwargs))
+        return SyncReplayConnection(self)
+
+
+class RecordingConnection:
+    def __init__(self, cassette: Cassette, ws: Any):
+        self.cassette = cassette
+        self.ws = ws
+        self.session = cassette._next_session()
+        self._last = time.monotonic()
+
+    async def send(self, message: str) -> None:
+        self.cassette._write({"session": self.session, "send": message})
+        await self.ws.send(message)
+
+    async def recv(self) -> str:
+        message = await self.ws.recv()
+        now = time.monotonic()
+        self.cassette._write(
+            {"session": self.session, "recv": message, "delay": now - self._last}
+        )
+        self._last = now
+        return message
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.ws, name)
+
+
+class SyncRecordingConnection(RecordingConnection):
+    def send(self, message: str) -> None:  # type: ignore[override]
+        self.cassette._write({"session": self.session, "send": message})
+        self.ws.send(message)
+
+    def recv(self, timeout: Optional[float] = None) -> str:  # type: ignore[override]
+        message = self.ws.recv(timeout=timeout)
+        now = time.monotonic()
+        self.cassette._write(
+            {"session": self.session, "recv": message, "delay": now - self._last}
+        )
+        self._last = now
+        return message
+
+
+class ReplayConnection:
+    """Plays back a recorded session, then closes like the node hung up"""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self.subscription: Optional[str] = None
+        self.messages: deque[tuple[float, str]] = deque()
+
+    def _send(self, message: str) -> None:
+        if self.subscription is None:
+            self.messages.extend(self.cassette._stream(message))
+            self.subscription = message
+
+    def _next(self) -> tuple[float, str]:
+        if not self.messages:
+            raise ConnectionClosedOK(None, None)
+        delay, message = self.messages.popleft()
+        scale = self.cassette.latency_scale
+        return (delay * scale if scale else 0.0), message
+
+    async def send(self, message: str) -> None:
+        self._send(message)
+
+    async def recv(self) -> str:
+        delay, message = self._next()
+        if delay:
+            await asyncio.sleep(delay)
+        return message
+
+    async def close(self) -> None:
+        self.messages.clear()
+
+
+class SyncReplayConnection(ReplayConnection):
+    def send(self, message: str) -> None:  # type: ignore[override]
+        self._send(message)
+
+    def recv(self, timeout: Optional[float] = None) -> str:  # type: ignore[override]
+        delay, message = self._next()
+        if delay:
+            time.sleep(delay)
+        return message
+
+    def close(self) -> None:  # type: ignore[override]
+        self.messages.clear()
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, ClassVar, Optional
 
 from eth_rpc.models import AccessListResponse, Account, FeeHistory, PendingTransaction
 from eth_rpc.transaction import AlchemyReceiptsResponse
@@ -27,104 +27,212 @@ from eth_rpc.types import (
     TransactionRequest,
 )
 from eth_typing import HexAddress, HexStr
+from pydantic import ConfigDict, PrivateAttr
 
 from ..block import Block
 from ..log import Log
 from .base import BaseRPC
+from .batch import RPCBatch
+from .hedge import HedgePolicy
 from .method import RPCMethod
 
 
 class RPC(BaseRPC):
-    chain_id: RPCMethod = RPCMethod[NoArgs, HexInteger](name="eth_chainId")
-    max_priority_fee_per_gas: RPCMethod = RPCMethod[NoArgs, HexInteger](
-        name="eth_maxPriorityFeePerGas"
-    )
-    fee_history: RPCMethod = RPCMethod[FeeHistoryArgs, FeeHistory](
-        name="eth_feeHistory"
-    )
-    eth_call: RPCMethod = RPCMethod[EthCallArgs, HexStr](name="eth_call")
-    get_block_by_hash: RPCMethod = RPCMethod[GetBlockByHashArgs, Block](
-        name="eth_getBlockByHash"
+    """
+    The JSON-RPC methods of a network.  Methods are declared as `ClassVar`
+    descriptors and bound to each RPC on first access, so they are not
+    pydantic fields: they are missing from `model_fields` and `model_dump`,
+    see `method_names`.  A subclass can still declare or override a method as
+    a field, and assign one on an instance; both are bound to that RPC.
+    """
+
+    _methods: dict[str, RPCMethod] = PrivateAttr(default_factory=dict)
+    _hedge_policy: Optional[HedgePolicy] = PrivateAttr(None)
+
+    chain_id: ClassVar[RPCMethod[NoArgs, HexInteger]] = RPCMethod[NoArgs, HexInteger](
+        name="eth_chainId"
     )
-    get_block_by_number: RPCMethod = RPCMethod[GetBlockByNumberArgs, Block](
-        name="eth_getBlockByNumber"
+    max_priority_fee_per_gas: ClassVar[RPCMethod[NoArgs, HexInteger]] = RPCMethod[
+        NoArgs, HexInteger
+    ](name="eth_maxPriorityFeePerGas")
+    fee_history: ClassVar[RPCMethod[FeeHistoryArgs, FeeHistory]] = RPCMethod[
+        FeeHistoryArgs, FeeHistory
+    ](name="eth_feeHistory")
+    eth_call: ClassVar[RPCMethod[EthCallArgs, HexStr]] = RPCMethod[EthCallArgs, HexStr](
+        name="eth_call"
     )
-    get_block_tx_count_by_number: RPCMethod = RPCMethod[BlockNumberArg, HexInteger](
+    get_block_by_hash: ClassVar[RPCMethod[GetBlockByHashArgs, Block]] = RPCMethod[
+        GetBlockByHashArgs, Block
+    ](name="eth_getBlockByHash")
+    get_block_by_number: ClassVar[RPCMethod[GetBlockByNumberArgs, Block]] = RPCMethod[
+        GetBlockByNumberArgs, Block
+    ](name="eth_getBlockByNumber")
+    get_block_tx_count_by_number: ClassVar[
+        RPCMethod[BlockNumberArg, HexInteger]
+    ] = RPCMethod[BlockNumberArg, HexInteger](
         name="eth_getBlockTransactionCountByNumber",
     )
-    get_tx_by_hash: RPCMethod = RPCMethod[TransactionRequest, TransactionModel | None](
+    get_tx_by_hash: ClassVar[RPCMethod[TransactionRequest, TransactionModel | None]] = (
+        RPCMethod[TransactionRequest, TransactionModel | None](
+            name="eth_getTransactionByHash"
+        )
+    )
+    get_pending_tx_by_hash: ClassVar[
+        RPCMethod[TransactionRequest, PendingTransaction | None]
+    ] = RPCMethod[TransactionRequest, PendingTransaction | None](
         name="eth_getTransactionByHash"
     )
-    get_pending_tx_by_hash: RPCMethod = RPCMethod[
-        TransactionRequest, PendingTransaction | None
-    ](name="eth_getTransactionByHash")
-    estimate_gas: RPCMethod = RPCMethod[CallWithBlockArgs, HexInteger](
-        name="eth_estimateGas"
-    )
-    block_number: RPCMethod = RPCMethod[NoArgs, HexInteger](name="eth_blockNumber")
-    create_access_list: RPCMethod = RPCMethod[CallWithBlockArgs, AccessListResponse](
-        name="eth_createAccessList"
-    )
-    get_storage_at: RPCMethod = RPCMethod[GetStorageArgs, HexStr](
-        name="eth_getStorageAt"
-    )
-    get_code: RPCMethod = RPCMethod[GetCodeArgs, HexStr](name="eth_getCode")
-    get_tx_receipt: RPCMethod = RPCMethod[
-        TransactionRequest, TransactionReceiptModel | None
-    ](name="eth_getTransactionReceipt")
-    get_block_receipts: RPCMethod = RPCMethod[
-        list[HexInteger | HexStr], list[TransactionReceiptModel]
-    ](name="eth_getBlockReceipts")
-    get_tx_by_block_hash: RPCMethod = RPCMethod[
-        GetTransactionByBlockHash, TransactionModel
-    ](name="eth_getTransactionByBlockHashAndIndex")
-    get_tx_by_block_number: RPCMethod = RPCMethod[
-        GetTransactionByBlockNumber, TransactionModel
-    ](name="eth_getTransactionByBlockNumberAndIndex")
-    get_balance: RPCMethod = RPCMethod[GetAccountArgs, HexInteger](
-        name="eth_getBalance"
-    )
-    get_account: RPCMethod = RPCMethod[GetAccountArgs, Account](name="eth_getAccount")
-    get_tx_count: RPCMethod = RPCMethod[GetAccountArgs, HexInteger](
-        name="eth_getTransactionCount"
-    )
-    get_logs: RPCMethod = RPCMethod[LogsArgs, list[Log]](name="eth_getLogs")
-
-    send_raw_tx: RPCMethod = RPCMethod[RawTransaction, HexStr](
-        name="eth_sendRawTransaction"
+    estimate_gas: ClassVar[RPCMethod[CallWithBlockArgs, HexInteger]] = RPCMethod[
+        CallWithBlockArgs, HexInteger
+    ](name="eth_estimateGas")
+    block_number: ClassVar[RPCMethod[NoArgs, HexInteger]] = RPCMethod[
+        NoArgs, HexInteger
+    ](name="eth_blockNumber")
+    create_access_list: ClassVar[RPCMethod[CallWithBlockArgs, AccessListResponse]] = (
+        RPCMethod[CallWithBlockArgs, AccessListResponse](name="eth_createAccessList")
+    )
+    get_storage_at: ClassVar[RPCMethod[GetStorageArgs, HexStr]] = RPCMethod[
+        GetStorageArgs, HexStr
+    ](name="eth_getStorageAt")
+    get_code: ClassVar[RPCMethod[GetCodeArgs, HexStr]] = RPCMethod[GetCodeArgs, HexStr](
+        name="eth_getCode"
+    )
+    get_tx_receipt: ClassVar[
+        RPCMethod[TransactionRequest, TransactionReceiptModel | None]
+    ] = RPCMethod[TransactionRequest, TransactionReceiptModel | None](
+        name="eth_getTransactionReceipt"
     )
+    get_block_receipts: ClassVar[
+        RPCMethod[list[HexInteger | HexStr], list[TransactionReceiptModel]]
+    ] = RPCMethod[list[HexInteger | HexStr], list[TransactionReceiptModel]](
+        name="eth_getBlockReceipts"
+    )
+    get_tx_by_block_hash: ClassVar[
+        RPCMethod[GetTransactionByBlockHash, TransactionModel]
+    ] = RPCMethod[GetTransactionByBlockHash, TransactionModel](
+        name="eth_getTransactionByBlockHashAndIndex"
+    )
+    get_tx_by_block_number: ClassVar[
+        RPCMethod[GetTransactionByBlockNumber, TransactionModel]
+    ] = RPCMethod[GetTransactionByBlockNumber, TransactionModel](
+        name="eth_getTransactionByBlockNumberAndIndex"
+    )
+    get_balance: ClassVar[RPCMethod[GetAccountArgs, HexInteger]] = RPCMethod[
+        GetAccountArgs, HexInteger
+    ](name="eth_getBalance")
+    get_account: ClassVar[RPCMethod[GetAccountArgs, Account]] = RPCMethod[
+        GetAccountArgs, Account
+    ](name="eth_getAccount")
+    get_tx_count: ClassVar[RPCMethod[GetAccountArgs, HexInteger]] = RPCMethod[
+        GetAccountArgs, HexInteger
+    ](name="eth_getTransactionCount")
+    get_logs: ClassVar[RPCMethod[LogsArgs, list[Log]]] = RPCMethod[LogsArgs, list[Log]](
+        name="eth_getLogs"
+    )
+
+    send_raw_tx: ClassVar[RPCMethod[RawTransaction, HexStr]] = RPCMethod[
+        RawTransaction, HexStr
+    ](name="eth_sendRawTransaction")
 
     # oasis specific methods
-    oasis_calldata_public_key: RPCMethod[NoArgs, OasisCalldataPublicKey] = RPCMethod[
-        NoArgs, OasisCalldataPublicKey
-    ](name="oasis_callDataPublicKey")
+    oasis_calldata_public_key: ClassVar[RPCMethod[NoArgs, OasisCalldataPublicKey]] = (
+        RPCMethod[NoArgs, OasisCalldataPublicKey](name="oasis_callDataPublicKey")
+    )
 
     # debug methods
-    debug_tracecall: RPCMethod = RPCMethod[TraceArgs, Any](name="debug_traceCall")
+    debug_tracecall: ClassVar[RPCMethod[TraceArgs, Any]] = RPCMethod[TraceArgs, Any](
+        name="debug_traceCall"
+    )
 
     # alchemy
-    alchemy_get_block_receipts: RPCMethod = RPCMethod[
-        AlchemyBlockReceipt, AlchemyReceiptsResponse
-    ](name="alchemy_getTransactionReceipts")
-    alchemy_token_balances: RPCMethod = RPCMethod[
+    alchemy_get_block_receipts: ClassVar[
+        RPCMethod[AlchemyBlockReceipt, AlchemyReceiptsResponse]
+    ] = RPCMethod[AlchemyBlockReceipt, AlchemyReceiptsResponse](
+        name="alchemy_getTransactionReceipts"
+    )
+    alchemy_token_balances: ClassVar[
+        RPCMethod[list[HexAddress], AlchemyTokenBalances]
+    ] = RPCMethod[
         list[HexAddress],
         AlchemyTokenBalances,
-    ](name="alchemy_getTokenBalances")
+    ](
+        name="alchemy_getTokenBalances"
+    )
 
-    def model_post_init(self, __context):
-        rpc_methods = []
-        for method in dir(self):
-            if method[0] == "_":
-                continue
-            try:
-                attr = getattr(self, method)
-                if isinstance(attr, RPCMethod):
-                    rpc_methods.append((method, attr))
-            except Exception:
-                pass
-
-        for name, method in rpc_methods:
-            new_method = method.model_copy()
-            setattr(self, name, new_method.set_rpc(self).set_network(self.network))
+    def batch(self, max_size: Optional[int] = None) -> RPCBatch:
+        """
+        Group calls into JSON-RPC batch requests, sent when the context exits:
+
+        ```python
+        async with rpc.batch() as batch:
+            items = [
+                batch.add(rpc.get_tx_receipt, TransactionRequest(tx_hash=tx_hash))
+                for tx_hash in tx_hashes
+            ]
+        receipts = [item.result for item in items]
+        ```
+        """
+        return RPCBatch(self, max_size=max_size)
+
+    def enable_hedging(self, policy: Optional[HedgePolicy] = None) -> HedgePolicy:
+        """
+        Hedge every method covered by the policy.  Hedging needs at least one
+        backup url on the network, and is skipped while a websocket is enabled.
+        """
+        policy = policy or HedgePolicy()
+        self._hedge_policy = policy
+        for method in self._methods.values():
+            if policy.should_hedge(method.name):
+                method.set_hedge_policy(policy)
+        return policy
 
+    def disable_hedging(self) -> None:
+        self._hedge_policy = None
+        for method in self._methods.values():
+            method.set_hedge_policy(None)
+
+    @classmethod
+    def method_names(cls) -> list[str]:
+        """The attribute names of the RPC methods declared on the class"""
+        names = [
+            name
+            for klass in reversed(cls.__mro__)
+            for name, attr in vars(klass).items()
+            if isinstance(attr, RPCMethod)
+        ]
+        fields = [
+            name
+            for name, field in cls.model_fields.items()
+            if isinstance(field.default, RPCMethod)
+        ]
+        return list(dict.fromkeys(names + fields))
+
+    def model_post_init(self, __context):
+        # methods a subclass declares as fields are bound like the descriptors
+        for name, value in self.__dict__.items():
+            if isinstance(value, RPCMethod):
+                self.__dict__[name] = self._bind_method(name, value)
         return super().model_post_init(__context)
+
+    def __setattr__(self, name: str, value: Any):
+        if isinstance(value, RPCMethod) and name in self.method_names():
+            self._methods.pop(name, None)
+            method = self._bind_method(name, value)
+            if name in self.__dict__:
+                self.__dict__[name] = method
+            return
+        super().__setattr__(name, value)
+
+    def _bind_method(self, name: str, method: RPCMethod) -> RPCMethod:
+        """This RPC's copy of a declared method, made on first access"""
+        if (bound := self._methods.get(name)) is None:
+            bound = method.model_copy()
+            bound.set_rpc(self).set_network(self.network)
+            if (policy := self._hedge_policy) is not None and policy.should_hedge(
+                bound.name
+            ):
+                bound.set_hedge_policy(policy)
+            self._methods[name] = bound
+        return bound
+
+    model_config = ConfigDict(ignored_types=(RPCMethod,))
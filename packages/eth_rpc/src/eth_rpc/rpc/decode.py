@@ -0,0 +1,214 @@
+import types
+from inspect import isclass
+from typing import Annotated, Any, Callable, Optional, Union, get_args, get_origin
+
+from eth_rpc.types import HexInt, Network
+from eth_rpc.utils import RPCModel
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    BeforeValidator,
+    PlainValidator,
+    TypeAdapter,
+    WrapValidator,
+)
+from pydantic_core import PydanticUndefined
+
+try:
+    import orjson
+
+    loads: Callable[[bytes | str], Any] = orjson.loads
+except ImportError:  # pragma: no cover
+    import json
+
+    loads = json.loads
+
+Converter = Callable[[Any], Any]
+
+VALIDATORS = (AfterValidator, BeforeValidator, PlainValidator, WrapValidator)
+IMMUTABLE = (type(None), bool, int, float, str, bytes)
+
+_adapters: dict[Any, TypeAdapter] = {}
+# None marks a model that has to be validated
+_plans: dict[type[BaseModel], Optional[Converter]] = {}
+_building: set[type[BaseModel]] = set()
+_output_plans: dict[Any, Optional[Converter]] = {}
+
+
+def result_adapter(output: Any) -> TypeAdapter:
+    """A TypeAdapter per output type, so its schema is only built once"""
+    if (adapter := _adapters.get(output)) is None:
+        adapter = _adapters[output] = TypeAdapter(output)
+    return adapter
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _hex_int(value: Any) -> int:
+    if isinstance(value, str):
+        return int(value, 16)
+    return int(value)
+
+
+def _converter(annotation: Any, metadata: tuple = ()) -> Optional[Converter]:
+    """
+    Converts raw JSON to an annotation's python value without validation, or
+    None if the annotation needs validators to load.
+    """
+    if any(isinstance(m, VALIDATORS) for m in metadata):
+        return None
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        base, *extra = get_args(annotation)
+        return _converter(base, tuple(extra))
+    if annotation is HexInt:
+        return _hex_int
+    if annotation in (str, bool, int, Any):
+        return _identity
+    if supertype := getattr(annotation, "__supertype__", None):
+        # a NewType, ie. HexStr
+        return _converter(supertype)
+    if origin in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1 or (inner := _converter(args[0])) is None:
+            return None
+        if inner is _identity:
+            return _identity
+        return lambda value: None if value is None else inner(value)
+    if origin is list:
+        (arg,) = get_args(annotation)
+        if (item := _converter(arg)) is None:
+            return None
+        if item is _identity:
+            return _identity
+        return lambda value: [item(elem) for elem in value]
+    if isclass(annotation) and issubclass(annotation, BaseModel):
+        return construct_plan(annotation)
+    return None
+
+
+def output_plan(output: Any) -> Optional[Converter]:
+    if output not in _output_plans:
+        _output_plans[output] = _converter(output)
+    return _output_plans[output]
+
+
+def construct_plan(model: type[BaseModel]) -> Optional[Converter]:
+    """
+    Builds a model from raw JSON like `model_construct`, converting hex fields
+    but skipping validation.  Models with validators can't be constructed.
+    """
+    if model in _plans:
+        return _plans[model]
+    if model in _building:
+        # recursive models are validated
+        return None
+
+    _building.add(model)
+    try:
+        plan = _build_plan(model)
+    finally:
+        _building.discard(model)
+    _plans[model] = plan
+    return plan
+
+
+def _build_plan(model: type[BaseModel]) -> Optional[Converter]:
+    decorators = model.__pydantic_decorators__
+    if (
+        decorators.validators
+        or decorators.field_validators
+        or decorators.root_validators
+        or decorators.model_validators
+    ):
+        return None
+    post_init = model.model_post_init
+    if post_init is not BaseModel.model_post_init and (
+        post_init.__name__ != "init_private_attributes"
+    ):
+        # a custom model_post_init could depend on validated fields
+        return None
+
+    # generate straight-line code for the model, like dataclasses does for __init__
+    namespace: dict[str, Any] = {"model": model, "new": model.__new__}
+    lines = ["def build(data):", "    values = {}"]
+    defaults = []
+    for i, (name, field) in enumerate(model.model_fields.items()):
+        if (convert := _converter(field.annotation, tuple(field.metadata))) is None:
+            return None
+        alias = field.alias or name
+        value = "data[%r]" % alias
+        if convert is not _identity:
+            namespace[f"convert_{i}"] = convert
+            value = f"convert_{i}({value})"
+        if field.is_required():
+            lines.append(f"    values[{name!r}] = {value}")
+        else:
+            namespace[f"field_{i}"] = field
+            lines.append(f"    if {alias!r} in data:")
+            lines.append(f"        values[{name!r}] = {value}")
+            defaults.append((i, name))
+    lines.append("    fields_set = set(values)")
+    for i, name in defaults:
+        lines.append(f"    if {name!r} not in values:")
+        lines.append(
+            f"        values[{name!r}] = field_{i}.get_default(call_default_factory=True)"
+        )
+
+    private = []
+    for i, (name, attr) in enumerate(model.__private_attributes__.items()):
+        if attr.default_factory is not None:
+            namespace[f"private_{i}"] = attr.default_factory
+            private.append(f"{name!r}: private_{i}()")
+        elif attr.default is PydanticUndefined:
+            continue
+        elif isinstance(attr.default, IMMUTABLE):
+            namespace[f"private_{i}"] = attr.default
+            private.append(f"{name!r}: private_{i}")
+        else:
+            namespace[f"private_{i}"] = attr
+            private.append(f"{name!r}: private_{i}.get_default()")
+
+    lines += [
+        "    obj = new(model)",
+        "    setattr(obj, '__dict__', values)",
+        "    setattr(obj, '__pydantic_fields_set__', fields_set)",
+        "    setattr(obj, '__pydantic_extra__', None)",
+        (
+            f"    setattr(obj, '__pydantic_private__', {{{', '.join(private)}}})"
+            if private
+            else "    setattr(obj, '__pydantic_private__', None)"
+        ),
+        "    return obj",
+    ]
+    namespace["setattr"] = object.__setattr__
+    exec("\n".join(lines), namespace)
+    build = namespace["build"]
+    return build
+
+
+def decode_result(
+    output: Any,
+    result: Any,
+    network: Optional[type[Network]] = None,
+    trusted: bool = False,
+) -> Any:
+    """
+    Loads a JSON-RPC result into the output type.  Trusted results are built
+    without validation when the output type allows it.
+    """
+    value = None
+    if trusted and result is not None:
+        if (plan := output_plan(output)) is not None:
+            try:
+                value = plan(result)
+            except (KeyError, TypeError, ValueError):
+                # not the shape we expected, let validation report it
+                value = None
+    if value is None:
+        value = result_adapter(output).validate_python(result)
+    if isinstance(value, RPCModel):
+        value.set_network(network)
+    return value
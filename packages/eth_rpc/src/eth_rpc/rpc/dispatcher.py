@@ -0,0 +1,90 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, Optional
+
+from eth_rpc.exceptions import RPCError
+
+if TYPE_CHECKING:
+    from .base import BaseRPC
+
+
+class BatchDispatcher:
+    """
+    Collects requests made within a short window and flushes them as a single
+    JSON-RPC batch, resolving each caller's future with its own response.
+
+    With `window=0` the batch is flushed on the next loop iteration, which picks
+    up every request issued by coroutines started together, ie. by `asyncio.gather`.
+    """
+
+    def __init__(
+        self,
+        rpc: "BaseRPC",
+        window: float = 0.0,
+        max_batch_size: Optional[int] = None,
+    ):
+        self.rpc = rpc
+        self.window = window
+        self.max_batch_size = max_batch_size or rpc.max_batch_size
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._handle: Optional[asyncio.Handle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, payload: dict) -> Any:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((payload, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._handle is None:
+            if self.window > 0:
+                self._handle = loop.call_later(self.window, self.flush)
+            else:
+                self._handle = loop.call_soon(self.flush)
+        return await future
+
+    def flush(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        task = asyncio.ensure_future(self._send(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, pending: list[tuple[dict, asyncio.Future]]) -> None:
+        try:
+            if len(pending) == 1:
+                payload, future = pending[0]
+                response = await self.rpc._post_async(payload)
+                if not future.done():
+                    future.set_result(response)
+                return
+            response = await self.rpc._post_async([payload for payload, _ in pending])
+        except Exception as exc:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        if not isinstance(response, list):
+            # the batch was rejected as a whole, every caller gets the same error
+            for _, future in pending:
+                if not future.done():
+                    future.set_result(response)
+            return
+
+        responses = {
+            elem.get("id"): elem for elem in response if isinstance(elem, dict)
+        }
+        for payload, future in pending:
+            if future.done():
+                continue
+            if (elem := responses.get(payload["id"])) is None:
+                future.set_exception(
+                    RPCError(f"No response for request id {payload['id']}")
+                )
+            else:
+                future.set_result(elem)
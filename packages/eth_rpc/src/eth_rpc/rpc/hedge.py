@@ -0,0 +1,113 @@
+from collections import deque
+from typing import Iterable, Optional
+
+# reads that return the same answer no matter how many times they are sent
+IDEMPOTENT_METHODS = frozenset(
+    [
+        "eth_blockNumber",
+        "eth_call",
+        "eth_chainId",
+        "eth_estimateGas",
+        "eth_feeHistory",
+        "eth_gasPrice",
+        "eth_getBalance",
+        "eth_getBlockByHash",
+        "eth_getBlockByNumber",
+        "eth_getBlockReceipts",
+        "eth_getCode",
+        "eth_getLogs",
+        "eth_getStorageAt",
+        "eth_getTransactionByHash",
+        "eth_getTransactionCount",
+        "eth_getTransactionReceipt",
+        "eth_maxPriorityFeePerGas",
+    ]
+)
+
+DEFAULT_HEDGED_METHODS = frozenset(
+    ["eth_blockNumber", "eth_call", "eth_getBlockByHash", "eth_getBlockByNumber"]
+)
+
+
+class HedgePolicy:
+    """
+    Sends a duplicate of a slow read to a second endpoint.
+
+    A request is hedged once it has been outstanding for longer than the
+    `percentile` of its method's recent latencies (clamped to `min_delay` and
+    `max_delay`), or straight away if it fails.  The percentile is recomputed
+    every `refresh` observed latencies.  Every request earns `budget` hedge
+    tokens and each hedge spends one, so at most `budget` extra requests are
+    sent, ie. 5%.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        min_delay: float = 0.01,
+        max_delay: float = 1.0,
+        methods: Iterable[str] = DEFAULT_HEDGED_METHODS,
+        window: int = 1000,
+        min_samples: int = 20,
+        max_tokens: float = 10.0,
+        refresh: int = 50,
+    ):
+        methods = frozenset(methods)
+        if unsafe := methods - IDEMPOTENT_METHODS:
+            raise ValueError(f"Can not hedge non-idempotent methods: {sorted(unsafe)}")
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.methods = methods
+        self.window = window
+        self.min_samples = min_samples
+        self.max_tokens = max_tokens
+        self.refresh = refresh
+        self.requests = 0
+        self.hedges = 0
+        self._tokens = 0.0
+        self._latencies: dict[str, deque[float]] = {}
+        self._delays: dict[str, float] = {}
+        self._stale: dict[str, int] = {}
+
+    def should_hedge(self, method: str) -> bool:
+        return method in self.methods
+
+    def observe(self, method: str, latency: float) -> None:
+        if (latencies := self._latencies.get(method)) is None:
+            latencies = self._latencies[method] = deque(maxlen=self.window)
+        latencies.append(latency)
+        self._stale[method] = self._stale.get(method, 0) + 1
+
+    def delay(self, method: str) -> float:
+        latencies = self._latencies.get(method)
+        if not latencies or len(latencies) < self.min_samples:
+            return self.max_delay
+        delay = self._delays.get(method)
+        if delay is None or self._stale[method] >= self.refresh:
+            ordered = sorted(latencies)
+            index = min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)
+            delay = min(max(ordered[index], self.min_delay), self.max_delay)
+            self._delays[method] = delay
+            self._stale[method] = 0
+        return delay
+
+    def record_request(self) -> None:
+        self.requests += 1
+        self._tokens = min(self._tokens + self.budget, self.max_tokens)
+
+    def acquire(self) -> bool:
+        """Spend a hedge token, if the budget allows another hedge"""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self.hedges += 1
+        return True
+
+    @property
+    def hedge_rate(self) -> Optional[float]:
+        if not self.requests:
+            return None
+        return self.hedges / self.requests
@@ -1,43 +1,118 @@
-from typing import Awaitable, Callable, ClassVar, Generic, ParamSpec
-
-from pydantic import BaseModel
-
-from .base import Params, Response, RPCMethodBase
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Optional,
+    ParamSpec,
+    Sequence,
+    overload,
+)
+
+from pydantic import PrivateAttr
+
+from ..batch import BatchItem, RPCBatch
+from .base import Middleware, Params, Response, RPCMethodBase
+
+if TYPE_CHECKING:
+    from ..core import RPC
 
 P = ParamSpec("P")
 
 
-class Middleware(BaseModel):
-    def update(self, method: "RPCMethod", make_request, params=None): ...
-
-
 class RPCMethod(RPCMethodBase[Params, Response], Generic[Params, Response]):
-    middlewares: ClassVar[list[Callable]] = []
+    """
+    Declared on an `RPC` class, a method is a descriptor: each RPC binds its
+    own copy the first time the method is accessed.
+    """
+
+    _attr_name: Optional[str] = PrivateAttr(None)
+    # the wrapped call_async and call_sync, built once per middleware change
+    _async_chain: Optional[tuple[Any, Callable]] = PrivateAttr(None)
+    _sync_chain: Optional[tuple[Any, Callable]] = PrivateAttr(None)
+
+    def __set_name__(self, owner: type, name: str):
+        self._attr_name = name
+
+    @overload
+    def __get__(
+        self, rpc: None, owner: Optional[type] = None
+    ) -> "RPCMethod[Params, Response]": ...
+
+    @overload
+    def __get__(
+        self, rpc: "RPC", owner: Optional[type] = None
+    ) -> "RPCMethod[Params, Response]": ...
+
+    def __get__(
+        self, rpc: Optional["RPC"], owner: Optional[type] = None
+    ) -> "RPCMethod[Params, Response]":
+        """The declaration on the class, or the RPC's own bound copy"""
+        if rpc is None or self._attr_name is None:
+            return self
+        return rpc._bind_method(self._attr_name, self)
 
     @classmethod
-    def add_middleware(cls, middleware: Callable):
+    def add_middleware(cls, middleware: Callable | Middleware):
         cls.middlewares.append(middleware)
+        RPCMethodBase.middleware_version += 1
 
-    def __call__(self, *params: Params) -> Awaitable[Response]:
-        async def run():
-            make_request = self.call_async
-            for middleware in self.middlewares:
+    def __copy__(self):
+        copied = super().__copy__()
+        # the chains call this method, so a copy compiles its own
+        copied._async_chain = copied._sync_chain = None
+        return copied
+
+    def __deepcopy__(self, memo: Optional[dict[int, Any]] = None):
+        copied = super().__deepcopy__(memo)
+        copied._async_chain = copied._sync_chain = None
+        return copied
+
+    def _chain_key(self) -> tuple[int, int]:
+        return (RPCMethodBase.middleware_version, len(self.middlewares))
+
+    def _compile(self, make_request: Callable, is_async: bool) -> Callable:
+        for middleware in self.middlewares:
+            if isinstance(middleware, Middleware):
+                # hooks run inside call_async and call_sync
+                continue
+            if is_async:
                 make_request = middleware(self, make_request, is_async=True)
-            return await make_request(*params)
+            else:
+                make_request = middleware(self, make_request)
+        return make_request
 
-        return run()
+    def __call__(self, *params: Params) -> Awaitable[Response]:
+        key = self._chain_key()
+        if self._async_chain is None or self._async_chain[0] != key:
+            self._async_chain = (key, self._compile(self.call_async, is_async=True))
+        return self._async_chain[1](*params)
 
     @property
     def sync(self) -> Callable[..., Response]:
-        make_request = self.call_sync
+        key = self._chain_key()
+        if self._sync_chain is None or self._sync_chain[0] != key:
+            self._sync_chain = (key, self._compile(self.call_sync, is_async=False))
+        return self._sync_chain[1]
 
-        for middleware in self.middlewares:
-            make_request = middleware(self, make_request)
+    def _batch(self, params_list: Sequence[Params]) -> RPCBatch:
+        batch = RPCBatch(self.rpc)
+        for params in params_list:
+            batch.add(self, params)
+        return batch
 
-        return make_request
+    async def many(self, params_list: Sequence[Params]) -> list[BatchItem[Response]]:
+        """Call this method once per params, sending the calls as JSON-RPC batches"""
+        return await self._batch(params_list).execute()
+
+    def many_sync(self, params_list: Sequence[Params]) -> list[BatchItem[Response]]:
+        return self._batch(params_list).execute_sync()
 
 
-def add_middleware(middleware: list[Callable] | Callable):
+def add_middleware(
+    middleware: list[Callable | Middleware] | Callable | Middleware,
+):
     if not isinstance(middleware, list):
         middleware = [middleware]
 
@@ -1,14 +1,26 @@
-import itertools
 import time
-from json import JSONDecodeError
-from typing import TYPE_CHECKING, Generic, Optional, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    ClassVar,
+    Generic,
+    Iterator,
+    Optional,
+    TypeVar,
+    get_origin,
+)
 
-import httpx
-from eth_rpc._response import RPCResponse
-from eth_rpc.exceptions import RPCDecodeError
+from eth_rpc.exceptions import RPCError
 from eth_rpc.types import HexAddress, HexInt, HexStr, Network, NoArgs
 from pydantic import BaseModel, ConfigDict, PrivateAttr
 
+from ..decode import decode_result
+from ..hedge import HedgePolicy
+from ..metrics import CallTimer
+from ..single_flight import request_key
+
 if TYPE_CHECKING:
     from ..core import RPC
 
@@ -24,13 +36,59 @@ Params = TypeVar(
 Response = TypeVar("Response")
 
 
+class Middleware(BaseModel):
+    """
+    Hooks run around every call with its raw JSON-RPC payload and response:
+
+    ```python
+    class CountCalls(Middleware):
+        calls: dict[str, int] = {}
+
+        def before(self, method, payload):
+            self.calls[payload["method"]] = self.calls.get(payload["method"], 0) + 1
+
+    add_middleware(CountCalls())
+    ```
+
+    `before` can return a response to skip sending the request, `after` can
+    replace the response before it is decoded, and `on_error` can return a
+    response to recover from a failed request.
+    """
+
+    def update(self, method: "RPCMethodBase", make_request, params=None): ...
+
+    def before(self, method: "RPCMethodBase", payload: dict) -> Optional[dict]:
+        return None
+
+    def after(self, method: "RPCMethodBase", payload: dict, response: dict) -> dict:
+        return response
+
+    def on_error(
+        self, method: "RPCMethodBase", payload: dict, exc: Exception
+    ) -> Optional[dict]:
+        return None
+
+
 class RPCMethodBase(BaseModel, Generic[Params, Response]):
+    # wrapper functions, `middleware(method, make_request, is_async)`, and
+    # `Middleware` hooks
+    middlewares: ClassVar[list[Callable | Middleware]] = []
+    # bumped whenever a middleware is added, so compiled chains are rebuilt
+    middleware_version: ClassVar[int] = 0
+
     name: str
-    client: Optional[httpx.AsyncClient] = None
-    index: Optional[itertools.count] = None
-    retries: int = 10
+    hedge_policy: Optional[HedgePolicy] = None
     _rpc: "RPC | None" = PrivateAttr(None)
     _network: type[Network] | None = PrivateAttr(None)
+    _hooks_key: Optional[tuple[int, int]] = PrivateAttr(None)
+    _hooks_cache: tuple[Middleware, ...] = PrivateAttr(())
+
+    @property
+    def rpc(self) -> "RPC":
+        """The RPC this method is bound to"""
+        if self._rpc is None:
+            raise ValueError(f"{self.name} is not bound to an RPC")
+        return self._rpc
 
     def set_rpc(self, rpc: "RPC") -> "RPCMethodBase":
         self._rpc = rpc
@@ -40,80 +98,276 @@ class RPCMethodBase(BaseModel, Generic[Params, Response]):
         self._network = network
         return self
 
-    def set_client(self, client: httpx.AsyncClient, index: itertools.count):
-        self.client = client
-        self.index = index
-
-    def call_sync(self, *params: Params) -> Response:
-        _, Output = self.__pydantic_generic_metadata__["args"]
+    def set_hedge_policy(self, policy: Optional[HedgePolicy]) -> "RPCMethodBase":
+        """Hedge slow async calls to a second endpoint, see `HedgePolicy`"""
+        if policy is not None and not policy.should_hedge(self.name):
+            raise ValueError(f"{self.name} is not hedged by this policy")
+        self.hedge_policy = policy
+        return self
 
+    def _build_payload(self, *params: Params) -> dict:
         payload = {
             "method": self.name,
-            "id": next(self._rpc.index),
+            "id": next(self.rpc.index),
             "jsonrpc": "2.0",
         }
-        if not params:
+        if not params or params[0] == NoArgs(()):
             payload["params"] = []
         elif isinstance(params[0], HexInt):
             payload["params"] = hex(params[0])
         elif isinstance(params[0], str) or isinstance(params[0], list):
+            # this is a HexStr or list of Hex Strings
             payload["params"] = params[0]
         elif isinstance(params[0], BaseModel):
-            payload["params"] = list(params[0].model_dump().values()) if params else []
+            payload["params"] = list(params[0].model_dump().values())
         else:
             raise TypeError(f"Invalid Input Type: {type(params[0])}")
-        while True:
-            tries = 0
-            try:
-                response = self._send_sync(self._rpc, payload)
-                break
-            except (httpx.ReadTimeout, httpx.ConnectTimeout) as exc:
-                tries += 1
-                time.sleep(1)
-                if tries == self._rpc.retries:
-                    raise exc
+        return payload
+
+    def _decode(self, response: dict) -> Response:
+        _, Output = self.__pydantic_generic_metadata__["args"]
+
+        self._check(response)
+        return decode_result(
+            Output,
+            response.get("result"),
+            network=self._network,
+            trusted=self._rpc is not None and self._rpc.trusted,
+        )
+
+    @staticmethod
+    def _check(response: dict) -> dict:
         if "error" in response:
-            raise ValueError(response["error"]["message"])
-        return RPCResponse[Output](**response).result  # type: ignore
+            raise RPCError.from_response(response["error"])
+        return response
+
+    def _timed_decode(self, response: dict, timer: Optional[CallTimer]) -> Response:
+        if timer is None:
+            return self._decode(response)
+        start = time.perf_counter()
+        try:
+            return self._decode(response)
+        finally:
+            timer.decode_time += time.perf_counter() - start
+
+    def _hooks(self) -> tuple["Middleware", ...]:
+        """The registered `Middleware` hooks, collected once per registry change"""
+        key = (RPCMethodBase.middleware_version, len(self.middlewares))
+        if self._hooks_key != key:
+            self._hooks_cache = tuple(
+                m for m in self.middlewares if isinstance(m, Middleware)
+            )
+            self._hooks_key = key
+        return self._hooks_cache
+
+    def _before(self, hooks: tuple["Middleware", ...], payload: dict) -> Optional[dict]:
+        for hook in hooks:
+            if (response := hook.before(self, payload)) is not None:
+                return response
+        return None
+
+    def _after(
+        self, hooks: tuple["Middleware", ...], payload: dict, response: dict
+    ) -> dict:
+        for hook in reversed(hooks):
+            response = hook.after(self, payload, response)
+        return response
+
+    def _on_error(
+        self, hooks: tuple["Middleware", ...], payload: dict, exc: Exception
+    ) -> Optional[dict]:
+        for hook in hooks:
+            if (response := hook.on_error(self, payload, exc)) is not None:
+                return response
+        return None
+
+    def call_sync(self, *params: Params) -> Response:
+        payload = self._build_payload(*params)
+        rpc = self.rpc
+        hooks = self._hooks()
+        metrics = rpc.metrics
+        timer = metrics.begin(rpc, payload) if metrics is not None else None
+        try:
+            if not hooks or (response := self._before(hooks, payload)) is None:
+                try:
+                    response = self._respond_sync(payload, timer)
+                except Exception as exc:
+                    if (
+                        not hooks
+                        or (response := self._on_error(hooks, payload, exc)) is None
+                    ):
+                        raise
+            if hooks:
+                response = self._after(hooks, payload, response)
+            return self._timed_decode(response, timer)
+        except Exception as exc:
+            if timer is not None:
+                timer.error = type(exc).__name__
+            raise
+        finally:
+            if timer is not None:
+                metrics.end(rpc, payload, timer)  # type: ignore[union-attr]
 
     async def call_async(self, *params: Params) -> Response:
+        payload = self._build_payload(*params)
+        rpc = self.rpc
+        hooks = self._hooks()
+        metrics = rpc.metrics
+        timer = metrics.begin(rpc, payload) if metrics is not None else None
+        try:
+            if not hooks or (response := self._before(hooks, payload)) is None:
+                try:
+                    response = await self._respond_async(payload, timer)
+                except Exception as exc:
+                    if (
+                        not hooks
+                        or (response := self._on_error(hooks, payload, exc)) is None
+                    ):
+                        raise
+            if hooks:
+                response = self._after(hooks, payload, response)
+            return self._timed_decode(response, timer)
+        except Exception as exc:
+            if timer is not None:
+                timer.error = type(exc).__name__
+            raise
+        finally:
+            if timer is not None:
+                metrics.end(rpc, payload, timer)  # type: ignore[union-attr]
+
+    def _list_output(self) -> Any:
         _, Output = self.__pydantic_generic_metadata__["args"]
+        if get_origin(Output) is not list:
+            raise TypeError(f"{self.name} does not return a list, it can't be streamed")
+        return Output
 
-        payload = {
-            "method": self.name,
-            "id": next(self._rpc.index),
-            "jsonrpc": "2.0",
-        }
-        if not params or params == NoArgs:
-            payload["params"] = []
-        elif isinstance(params[0], HexInt):
-            payload["params"] = hex(params[0])
-        elif isinstance(params[0], str) or isinstance(params[0], list):
-            # this is a HexStr or list of Hex Strings
-            payload["params"] = params[0]
-        elif isinstance(params[0], BaseModel):
-            payload["params"] = list(params[0].model_dump().values()) if params else []
+    def _decode_elements(
+        self, output: Any, values: list[Any], timer: Optional[CallTimer]
+    ) -> list[Any]:
+        start = time.perf_counter()
+        try:
+            return decode_result(
+                output, values, network=self._network, trusted=self.rpc.trusted
+            )
+        finally:
+            if timer is not None:
+                timer.decode_time += time.perf_counter() - start
 
-        response = await self._send_async(self._rpc, payload)
-        if "error" in response:
-            raise ValueError(response["error"]["message"])
-        return RPCResponse[Output](**response, network=self._network).result  # type: ignore
+    def stream_sync(self, *params: Params) -> Iterator[Any]:
+        """
+        Call a method with a list result, yielding each element as soon as it
+        is parsed and decoded, see `BaseRPC.stream_sync`.  Failed requests are
+        retried until the first element arrives.  The response cache, batching
+        and middleware are skipped.
+        """
+        output = self._list_output()
+        payload = self._build_payload(*params)
+        rpc = self.rpc
+        metrics = rpc.metrics
+        timer = metrics.begin(rpc, payload) if metrics is not None else None
+        policy = rpc.retry_policy.for_method(self.name)
+
+        def elements() -> Iterator[Any]:
+            for values in rpc.stream_sync(payload):
+                yield from self._decode_elements(output, values, timer)
 
-    @staticmethod
-    def _send_sync(rpc: "RPC", payload: dict) -> dict:
-        result = httpx.post(rpc.http, json=payload, timeout=rpc.timeout)
         try:
-            return result.json()
-        except JSONDecodeError:
-            raise RPCDecodeError(result.content)
+            yield from policy.stream_sync(payload, rpc.retries, elements)
+        except Exception as exc:
+            if timer is not None:
+                timer.error = type(exc).__name__
+            raise
+        finally:
+            if timer is not None:
+                metrics.end(rpc, payload, timer)  # type: ignore[union-attr]
+
+    async def stream(self, *params: Params) -> AsyncIterator[Any]:
+        """
+        Call a method with a list result, yielding each element as soon as it
+        is parsed and decoded, ie. the logs of a large `eth_getLogs` range:
+
+        ```python
+        async for log in rpc.get_logs.stream(LogsArgs(params=params)):
+            ...
+        ```
+        """
+        output = self._list_output()
+        payload = self._build_payload(*params)
+        rpc = self.rpc
+        metrics = rpc.metrics
+        timer = metrics.begin(rpc, payload) if metrics is not None else None
+        policy = rpc.retry_policy.for_method(self.name)
+
+        async def elements() -> AsyncIterator[Any]:
+            async for values in rpc.stream_async(payload):
+                for elem in self._decode_elements(output, values, timer):
+                    yield elem
 
-    @staticmethod
-    async def _send_async(rpc: "RPC", payload: dict) -> dict:
-        result = await rpc.client.post(rpc.http, json=payload, timeout=rpc.timeout)
         try:
-            return result.json()
-        except JSONDecodeError:
-            raise RPCDecodeError(result.content)
+            async for elem in policy.stream_async(payload, rpc.retries, elements):
+                yield elem
+        except Exception as exc:
+            if timer is not None:
+                timer.error = type(exc).__name__
+            raise
+        finally:
+            if timer is not None:
+                metrics.end(rpc, payload, timer)  # type: ignore[union-attr]
+
+    def _respond_sync(self, payload: dict, timer: Optional[CallTimer]) -> dict:
+        rpc = self.rpc
+        if (cache := rpc.response_cache) is not None and (
+            response := cache.get(rpc, payload)
+        ):
+            if timer is not None:
+                timer.cache_hit = True
+            return response
+        policy = rpc.retry_policy.for_method(self.name)
+        return policy.call_sync(payload, rpc.retries, lambda: self._fetch_sync(payload))
+
+    async def _respond_async(self, payload: dict, timer: Optional[CallTimer]) -> dict:
+        rpc = self.rpc
+        if (cache := rpc.response_cache) is not None and (
+            response := cache.get(rpc, payload)
+        ):
+            if timer is not None:
+                timer.cache_hit = True
+            return response
+        if (flight := rpc.single_flight) is not None and flight.shares(self.name):
+            return await flight.do(
+                request_key(rpc, payload), lambda: self._retry_fetch(payload)
+            )
+        return await self._retry_fetch(payload)
+
+    async def _retry_fetch(self, payload: dict) -> dict:
+        policy = self.rpc.retry_policy.for_method(self.name)
+        return await policy.call_async(
+            payload, self.rpc.retries, lambda: self._fetch(payload)
+        )
+
+    def _fetch_sync(self, payload: dict) -> dict:
+        response = self._check(self._send_sync(self.rpc, payload))
+        if (cache := self.rpc.response_cache) is not None:
+            cache.store_sync(self.rpc, payload, response)
+        return response
+
+    async def _fetch(self, payload: dict) -> dict:
+        if self.hedge_policy is not None:
+            response = await self.rpc.send_hedged(payload, self.hedge_policy)
+        else:
+            response = await self._send_async(self.rpc, payload)
+        self._check(response)
+        if (cache := self.rpc.response_cache) is not None:
+            await cache.store(self.rpc, payload, response)
+        return response
+
+    @staticmethod
+    def _send_sync(rpc: "RPC", payload: dict | list[dict]) -> Any:
+        return rpc.send_sync(payload)
+
+    @staticmethod
+    async def _send_async(rpc: "RPC", payload: dict | list[dict]) -> Any:
+        return await rpc.send_async(payload)
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
@@ -0,0 +1,347 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+from .rate_limit import ALCHEMY_COMPUTE_UNITS
+
+if TYPE_CHECKING:
+    from .base import BaseRPC
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASES = ("total", "queue", "network", "decode")
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # the last count is for values above every bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "buckets": self.cumulative(),
+        }
+
+
+class CallTimer:
+    """Timings and sizes for a single method call"""
+
+    __slots__ = [
+        "network",
+        "method",
+        "start",
+        "network_time",
+        "decode_time",
+        "network_requests",
+        "bytes_out",
+        "bytes_in",
+        "cache_hit",
+        "error",
+        "costs",
+    ]
+
+    def __init__(self, network: str, method: str, costs: tuple["RPCCost", ...]):
+        self.network = network
+        self.method = method
+        self.start = time.perf_counter()
+        self.network_time = 0.0
+        self.decode_time = 0.0
+        self.network_requests = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.cache_hit = False
+        self.error: Optional[str] = None
+        self.costs = costs
+
+
+class MethodStats:
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.network_requests = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.errors: dict[str, int] = {}
+        self.latency = {phase: Histogram() for phase in PHASES}
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "network_requests": self.network_requests,
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "errors": dict(self.errors),
+            "latency": {
+                phase: histogram.snapshot() for phase, histogram in self.latency.items()
+            },
+        }
+
+
+class RPCCost:
+    """What a block of code cost in RPC terms, see `rpc_cost`"""
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.network_requests = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.errors = 0
+        self.latency = 0.0
+        self.methods: dict[str, int] = {}
+        self.requests_by_method: dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def add(self, timer: CallTimer, latency: float) -> None:
+        self.calls += 1
+        self.cache_hits += timer.cache_hit
+        self.network_requests += timer.network_requests
+        self.bytes_out += timer.bytes_out
+        self.bytes_in += timer.bytes_in
+        self.errors += timer.error is not None
+        self.latency += latency
+        self.methods[timer.method] = self.methods.get(timer.method, 0) + 1
+        if timer.network_requests:
+            self.requests_by_method[timer.method] = (
+                self.requests_by_method.get(timer.method, 0) + timer.network_requests
+            )
+
+    def compute_units(self, costs: dict[str, float] = ALCHEMY_COMPUTE_UNITS) -> float:
+        """The requests sent, priced by a provider's cost table"""
+        return sum(
+            costs.get(method, 0) * count
+            for method, count in self.requests_by_method.items()
+        )
+
+    def __repr__(self):
+        return (
+            f"<RPCCost calls={self.calls} network_requests={self.network_requests} "
+            f"bytes_in={self.bytes_in} latency={self.latency:.3f}s>"
+        )
+
+
+_active_costs: ContextVar[tuple[RPCCost, ...]] = ContextVar("_active_costs", default=())
+
+
+@contextmanager
+def rpc_cost() -> Iterator[RPCCost]:
+    """
+    Reports the RPC calls made inside the block, including those made by tasks
+    it starts:
+
+    ```python
+    with rpc_cost() as cost:
+        await Block.latest()
+    print(cost.calls, cost.bytes_in, cost.compute_units())
+    ```
+    """
+    cost = RPCCost()
+    token = _active_costs.set(_active_costs.get() + (cost,))
+    start = time.perf_counter()
+    try:
+        yield cost
+    finally:
+        cost.elapsed = time.perf_counter() - start
+        _active_costs.reset(token)
+
+
+def measuring_cost() -> bool:
+    """Whether calls are being made inside an `rpc_cost` block"""
+    return bool(_active_costs.get())
+
+
+class Metrics:
+    """
+    Request counts, errors by class, bytes and latency histograms, keyed by
+    network and method.
+
+    A call's latency is split into the time spent on the network, decoding the
+    response, and everything else (rate limiting, batching windows, retry
+    backoff), reported as the queue phase.
+    """
+
+    def __init__(self):
+        self.stats: dict[tuple[str, str], MethodStats] = {}
+        self.exporters: list[Callable[[CallTimer, float], None]] = []
+        self._inflight: dict[tuple[int, Any], CallTimer] = {}
+        self._lock = threading.Lock()
+
+    def add_exporter(self, exporter: Callable[[CallTimer, float], None]) -> None:
+        """Call `exporter(timer, latency)` after every call, ie. to push to statsd"""
+        self.exporters.append(exporter)
+
+    def _stats(self, network: str, method: str) -> MethodStats:
+        if (stats := self.stats.get((network, method))) is None:
+            stats = self.stats[(network, method)] = MethodStats()
+        return stats
+
+    def begin(self, rpc: "BaseRPC", payload: dict) -> CallTimer:
+        timer = CallTimer(rpc.network.name, payload["method"], _active_costs.get())
+        self._inflight[(id(rpc), payload["id"])] = timer
+        return timer
+
+    def end(self, rpc: "BaseRPC", payload: dict, timer: CallTimer) -> None:
+        self._inflight.pop((id(rpc), payload["id"]), None)
+        latency = time.perf_counter() - timer.start
+        with self._lock:
+            stats = self._stats(timer.network, timer.method)
+            stats.calls += 1
+            stats.cache_hits += timer.cache_hit
+            stats.network_requests += timer.network_requests
+            stats.bytes_out += timer.bytes_out
+            stats.bytes_in += timer.bytes_in
+            if timer.error is not None:
+                stats.errors[timer.error] = stats.errors.get(timer.error, 0) + 1
+            stats.latency["total"].observe(latency)
+            stats.latency["network"].observe(timer.network_time)
+            stats.latency["decode"].observe(timer.decode_time)
+            stats.latency["queue"].observe(
+                max(latency - timer.network_time - timer.decode_time, 0.0)
+            )
+        for cost in timer.costs:
+            cost.add(timer, latency)
+        for exporter in self.exporters:
+            exporter(timer, latency)
+
+    def on_network(
+        self,
+        rpc: "BaseRPC",
+        payload: dict | list[dict],
+        elapsed: float,
+        bytes_out: int,
+        bytes_in: int,
+    ) -> None:
+        """Attribute a request's time and bytes to the calls it carried"""
+        payloads = payload if isinstance(payload, list) else [payload]
+        share = len(payloads)
+        network = rpc.network.name
+        for elem in payloads:
+            timer = self._inflight.get((id(rpc), elem["id"]))
+            if timer is not None:
+                timer.network_time += elapsed
+                timer.network_requests += 1
+                timer.bytes_out += bytes_out // share
+                timer.bytes_in += bytes_in // share
+                continue
+            # ie. part of an RPCBatch, which has no per-call timer
+            with self._lock:
+                stats = self._stats(network, elem["method"])
+                stats.network_requests += 1
+                stats.bytes_out += bytes_out // share
+                stats.bytes_in += bytes_in // share
+                stats.latency["network"].observe(elapsed)
+
+    def snapshot(self) -> dict[str, dict[str, dict]]:
+        with self._lock:
+            result: dict[str, dict[str, dict]] = {}
+            for (network, method), stats in self.stats.items():
+                result.setdefault(network, {})[method] = stats.snapshot()
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+
+    def prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format"""
+        counters = [
+            ("calls", "eth_rpc_calls_total", "Method calls"),
+            ("cache_hits", "eth_rpc_cache_hits_total", "Calls served from cache"),
+            ("network_requests", "eth_rpc_requests_total", "Requests sent"),
+            ("bytes_out", "eth_rpc_sent_bytes_total", "Bytes sent"),
+            ("bytes_in", "eth_rpc_received_bytes_total", "Bytes received"),
+        ]
+        with self._lock:
+            items = sorted(self.stats.items())
+            lines = []
+            for attr, name, help in counters:
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} counter"]
+                for (network, method), stats in items:
+                    labels = f'network="{network}",method="{method}"'
+                    lines.append(f"{name}{{{labels}}} {getattr(stats, attr)}")
+
+            name = "eth_rpc_errors_total"
+            lines += [f"# HELP {name} Failed calls", f"# TYPE {name} counter"]
+            for (network, method), stats in items:
+                for error, count in sorted(stats.errors.items()):
+                    labels = f'network="{network}",method="{method}",error="{error}"'
+                    lines.append(f"{name}{{{labels}}} {count}")
+
+            name = "eth_rpc_latency_seconds"
+            lines += [f"# HELP {name} Call latency", f"# TYPE {name} histogram"]
+            for (network, method), stats in items:
+                for phase, histogram in stats.latency.items():
+                    labels = f'network="{network}",method="{method}",phase="{phase}"'
+                    for bound, count in histogram.cumulative():
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+class PrometheusExporter:
+    """
+    Serves the metrics for Prometheus to scrape, from a background thread.  Only
+    local connections are accepted unless `addr` is set, ie. to "0.0.0.0".
+    """
+
+    def __init__(
+        self, metrics: Metrics = METRICS, port: int = 9100, addr: str = "127.0.0.1"
+    ):
+        self.metrics = metrics
+        self.port = port
+        self.addr = addr
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def start(self) -> "PrometheusExporter":
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.addr, self.port), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,150 @@
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import httpx
+
+# methods where the node assigns state (ie. the nonce), so resending after an
+# ambiguous failure could apply the request twice
+NON_RETRYABLE_METHODS = frozenset(
+    [
+        "eth_sendTransaction",
+        "eth_sendRawTransaction",
+        "eth_sendRawTransactionConditional",
+        "eth_sendBundle",
+        "eth_sendPrivateTransaction",
+        "eth_sendPrivateRawTransaction",
+    ]
+)
+
+
+@dataclass
+class Endpoint:
+    """An RPC url with a rolling health score"""
+
+    url: str
+    weight: float = 1.0
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    outstanding: int = 0
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = field(default=0.0, repr=False)
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def score(self, default_latency: float) -> float:
+        """Expected cost of sending the next request here, lower is better"""
+        latency = self.latency if self.latency is not None else default_latency
+        return (
+            (self.outstanding + 1) * latency * (1 + 4 * self.error_rate) / self.weight
+        )
+
+
+class EndpointPool:
+    """
+    Routes requests across a network's default and backup urls.
+
+    Requests go to the available endpoint with the fewest outstanding requests,
+    scaled by its latency EWMA, error rate and weight.  Endpoints that keep
+    failing, or that rate limit us, are ejected for a while.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        alpha: float = 0.2,
+        eject_after: int = 3,
+        eject_for: float = 30.0,
+        rate_limit_eject_for: float = 5.0,
+    ):
+        if not endpoints:
+            raise ValueError("EndpointPool requires at least one endpoint")
+        self.endpoints = endpoints
+        self.alpha = alpha
+        self.eject_after = eject_after
+        self.eject_for = eject_for
+        self.rate_limit_eject_for = rate_limit_eject_for
+
+    @classmethod
+    def from_urls(cls, urls: Iterable[tuple[str, float]], **kwargs) -> "EndpointPool":
+        return cls([Endpoint(url=url, weight=weight) for url, weight in urls], **kwargs)
+
+    @property
+    def urls(self) -> tuple[str, ...]:
+        return tuple(endpoint.url for endpoint in self.endpoints)
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def select(self, exclude: Iterable[Endpoint] = ()) -> Endpoint:
+        excluded = {id(endpoint) for endpoint in exclude}
+        candidates = [
+            endpoint for endpoint in self.endpoints if id(endpoint) not in excluded
+        ] or self.endpoints
+        now = time.monotonic()
+        available = [endpoint for endpoint in candidates if endpoint.is_available(now)]
+        if not available:
+            # everything is ejected, use whichever endpoint comes back first
+            return min(candidates, key=lambda endpoint: endpoint.ejected_until)
+
+        latencies = [e.latency for e in self.endpoints if e.latency is not None]
+        default_latency = sum(latencies) / len(latencies) if latencies else 1.0
+        return min(available, key=lambda endpoint: endpoint.score(default_latency))
+
+    def record_success(self, endpoint: Endpoint, latency: float) -> None:
+        endpoint.requests += 1
+        endpoint.consecutive_failures = 0
+        endpoint.error_rate *= 1 - self.alpha
+        if endpoint.latency is None:
+            endpoint.latency = latency
+        else:
+            endpoint.latency += self.alpha * (latency - endpoint.latency)
+
+    def record_failure(self, endpoint: Endpoint, rate_limited: bool = False) -> None:
+        endpoint.requests += 1
+        endpoint.errors += 1
+        endpoint.consecutive_failures += 1
+        endpoint.error_rate += self.alpha * (1 - endpoint.error_rate)
+
+        now = time.monotonic()
+        if rate_limited:
+            endpoint.rate_limited += 1
+            endpoint.ejected_until = max(
+                endpoint.ejected_until, now + self.rate_limit_eject_for
+            )
+        elif endpoint.consecutive_failures >= self.eject_after:
+            endpoint.ejected_until = now + self.eject_for
+
+    def snapshot(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "url": endpoint.url,
+                "weight": endpoint.weight,
+                "latency": endpoint.latency,
+                "error_rate": endpoint.error_rate,
+                "outstanding": endpoint.outstanding,
+                "requests": endpoint.requests,
+                "errors": endpoint.errors,
+                "rate_limited": endpoint.rate_limited,
+                "available": endpoint.is_available(now),
+            }
+            for endpoint in self.endpoints
+        ]
+
+    @staticmethod
+    def is_retryable(payload: dict | list[dict], exc: Optional[Exception]) -> bool:
+        """Whether a failed request can be sent again to another endpoint"""
+        if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+            # the request never reached the node
+            return True
+        payloads = payload if isinstance(payload, list) else [payload]
+        return not any(p.get("method") in NON_RETRYABLE_METHODS for p in payloads)
+
+    @staticmethod
+    def is_failure(response: httpx.Response) -> bool:
+        return response.status_code == 429 or response.status_code >= 500
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+# compute units per method, from Alchemy's pricing table
+ALCHEMY_COMPUTE_UNITS: dict[str, float] = {
+    "alchemy_getTokenBalances": 26,
+    "alchemy_getTransactionReceipts": 250,
+    "debug_traceCall": 309,
+    "eth_blockNumber": 10,
+    "eth_call": 26,
+    "eth_chainId": 0,
+    "eth_createAccessList": 10,
+    "eth_estimateGas": 87,
+    "eth_feeHistory": 10,
+    "eth_getBalance": 19,
+    "eth_getBlockByHash": 16,
+    "eth_getBlockByNumber": 16,
+    "eth_getBlockReceipts": 500,
+    "eth_getBlockTransactionCountByNumber": 20,
+    "eth_getCode": 26,
+    "eth_getLogs": 75,
+    "eth_getStorageAt": 17,
+    "eth_getTransactionByBlockHashAndIndex": 15,
+    "eth_getTransactionByBlockNumberAndIndex": 15,
+    "eth_getTransactionByHash": 17,
+    "eth_getTransactionCount": 26,
+    "eth_getTransactionReceipt": 15,
+    "eth_maxPriorityFeePerGas": 10,
+    "eth_sendRawTransaction": 250,
+}
+
+# substrings of error responses that mean the provider is throttling us
+RATE_LIMIT_MESSAGES = (
+    b"exceeded its compute units per second capacity",
+    b"rate limit",
+    b"Rate limit",
+    b"Too Many Requests",
+    b"too many requests",
+    b"-32005",
+)
+
+
+def is_rate_limited(status_code: int, content: bytes) -> bool:
+    if status_code == 429:
+        return True
+    # error responses are small, don't scan large results
+    if len(content) > 4096:
+        return False
+    return any(message in content for message in RATE_LIMIT_MESSAGES)
+
+
+class RateLimiter:
+    """
+    Token bucket that paces requests by their cost, ie. compute units.
+
+    The refill rate adapts with AIMD: every successful request adds `increase`
+    units/second back (up to `max_rate`), and a rate limited response multiplies
+    the rate by `decrease` and empties the bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        costs: Optional[dict[str, float]] = None,
+        default_cost: float = 1.0,
+        min_rate: Optional[float] = None,
+        increase: Optional[float] = None,
+        decrease: float = 0.5,
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = burst if burst is not None else rate
+        self.costs = costs if costs is not None else {}
+        self.default_cost = default_cost
+        self.min_rate = min_rate if min_rate is not None else rate / 100
+        self.increase = increase if increase is not None else rate / 100
+        self.decrease = decrease
+
+        self.tokens = self.capacity
+        self.consumed = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.rate_limited = 0
+        self.waited = 0.0
+        self._updated = time.monotonic()
+        self._started = self._updated
+        self._lock = threading.Lock()
+
+    @classmethod
+    def alchemy(cls, compute_units_per_second: float, **kwargs) -> "RateLimiter":
+        return cls(compute_units_per_second, costs=ALCHEMY_COMPUTE_UNITS, **kwargs)
+
+    def cost(self, payload: dict | list[dict]) -> float:
+        payloads = payload if isinstance(payload, list) else [payload]
+        return sum(
+            self.costs.get(elem.get("method", ""), self.default_cost)
+            for elem in payloads
+        )
+
+    def _reserve(self, cost: float) -> float:
+        """Take the tokens, returning how long to wait until they are available"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self.tokens -= cost
+            self.consumed += cost
+            self.requests += 1
+            if self.tokens >= 0:
+                return 0.0
+            self.throttled += 1
+            wait = -self.tokens / self.rate
+            self.waited += wait
+            return wait
+
+    def acquire_sync(self, payload: dict | list[dict]) -> None:
+        if wait := self._reserve(self.cost(payload)):
+            time.sleep(wait)
+
+    async def acquire(self, payload: dict | list[dict]) -> None:
+        if wait := self._reserve(self.cost(payload)):
+            await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_rate_limited(self) -> None:
+        with self._lock:
+            self.rate_limited += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.tokens = min(self.tokens, 0)
+
+    def usage(self) -> dict:
+        """Current budget and how much of it has been used"""
+        elapsed = time.monotonic() - self._started
+        return {
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+            "tokens": self.tokens,
+            "capacity": self.capacity,
+            "consumed": self.consumed,
+            "consumed_per_second": self.consumed / elapsed if elapsed else 0.0,
+            "utilization": self.rate / self.max_rate,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "rate_limited": self.rate_limited,
+            "waited": self.waited,
+        }
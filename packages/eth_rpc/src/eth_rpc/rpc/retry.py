@@ -0,0 +1,293 @@
+import asyncio
+import copy
+import random
+import time
+from enum import Enum
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+import httpx
+from eth_rpc.exceptions import CircuitOpenError, RPCError, RPCStatusError
+from websockets.exceptions import ConnectionClosed
+
+from .pool import EndpointPool
+from .rate_limit import is_rate_limited
+
+T = TypeVar("T")
+
+# error messages from a node that is behind the block being requested
+NODE_LAG_MESSAGES = ("header not found", "unknown block", "block not found")
+
+
+class RetryReason(str, Enum):
+    TRANSPORT = "transport"
+    SERVER_ERROR = "server_error"
+    RATE_LIMITED = "rate_limited"
+    NODE_LAG = "node_lag"
+
+
+def classify_error(exc: Exception) -> Optional[RetryReason]:
+    """Why a failed request is worth retrying, or None if it is not"""
+    if isinstance(exc, (httpx.TransportError, ConnectionClosed, asyncio.TimeoutError)):
+        return RetryReason.TRANSPORT
+    if isinstance(exc, RPCStatusError):
+        if exc.status_code == 429:
+            return RetryReason.RATE_LIMITED
+        if exc.status_code >= 500:
+            return RetryReason.SERVER_ERROR
+        return None
+    if isinstance(exc, RPCError):
+        message = str(exc.message or "")
+        if exc.code in (429, -32005) or is_rate_limited(200, message.encode()):
+            return RetryReason.RATE_LIMITED
+        if any(lag in message.lower() for lag in NODE_LAG_MESSAGES):
+            return RetryReason.NODE_LAG
+    return None
+
+
+class RetryBudget:
+    """Every request earns `ratio` retry tokens and each retry spends one"""
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast after `failure_threshold` consecutive transport or
+    server errors.  After `reset_timeout` seconds a single request is let
+    through as a probe: if it succeeds the circuit closes, and if it fails, or
+    doesn't answer within another `reset_timeout`, the circuit stays open.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "open":
+            return False
+        if state == "half_open":
+            # hold the other requests until the probe answers
+            self.opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """
+    Retries failed calls with exponential backoff and full jitter.
+
+    `retries` defaults to `BaseRPC.retries`.  Retries draw from a shared
+    `RetryBudget` so an outage does not multiply the load on the node.  With a
+    `CircuitBreaker`, transport or server errors left after any backup endpoints
+    have been tried count towards tripping it, and calls fail fast while it is
+    open.  Methods can be given their own settings, sharing the budget and
+    breaker:
+
+    ```python
+    policy = RetryPolicy(base_delay=0.2)
+    policy.override("eth_getLogs", retries=8, max_delay=30.0)
+    rpc.set_retry_policy(policy)
+    ```
+    """
+
+    def __init__(
+        self,
+        retries: Optional[int] = None,
+        base_delay: float = 0.1,
+        max_delay: float = 10.0,
+        retry_on: frozenset[RetryReason] = frozenset(RetryReason),
+        budget: Optional[RetryBudget] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self.budget = budget if budget is not None else RetryBudget()
+        self.breaker = breaker
+        self.attempts = 0
+        self.retried = 0
+        self._overrides: dict[str, "RetryPolicy"] = {}
+
+    def override(self, method: str, **kwargs: Any) -> "RetryPolicy":
+        policy = copy.copy(self)
+        policy._overrides = {}
+        for key, value in kwargs.items():
+            if not hasattr(policy, key):
+                raise TypeError(f"Invalid RetryPolicy option: {key}")
+            setattr(policy, key, value)
+        self._overrides[method] = policy
+        return policy
+
+    def for_method(self, method: str) -> "RetryPolicy":
+        return self._overrides.get(method, self)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def _before(self) -> None:
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpenError("Circuit breaker is open, not sending request")
+        self.attempts += 1
+        self.budget.deposit()
+
+    def _record(self, success: bool) -> None:
+        if self.breaker is None:
+            return
+        if success:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def _after_error(
+        self, payload: dict, exc: Exception, attempt: int, retries: int
+    ) -> Optional[float]:
+        """Record the failure, returning how long to wait before retrying"""
+        reason = classify_error(exc)
+        if reason in (RetryReason.TRANSPORT, RetryReason.SERVER_ERROR):
+            self._record(success=False)
+        else:
+            # the node answered, so it is up
+            self._record(success=True)
+
+        if reason is None or reason not in self.retry_on or attempt >= retries:
+            return None
+        if reason in (
+            RetryReason.TRANSPORT,
+            RetryReason.SERVER_ERROR,
+        ) and not EndpointPool.is_retryable(payload, exc):
+            # the request may have been applied, ie. a sent transaction
+            return None
+        if not self.budget.withdraw():
+            return None
+        self.retried += 1
+        return self.backoff(attempt)
+
+    def call_sync(self, payload: dict, retries: int, send: Callable[[], T]) -> T:
+        retries = self.retries if self.retries is not None else retries
+        attempt = 0
+        while True:
+            self._before()
+            try:
+                result = send()
+            except Exception as exc:
+                if (delay := self._after_error(payload, exc, attempt, retries)) is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self._record(success=True)
+            return result
+
+    async def call_async(
+        self, payload: dict, retries: int, send: Callable[[], Awaitable[T]]
+    ) -> T:
+        retries = self.retries if self.retries is not None else retries
+        attempt = 0
+        while True:
+            self._before()
+            try:
+                result = await send()
+            except Exception as exc:
+                if (delay := self._after_error(payload, exc, attempt, retries)) is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self._record(success=True)
+            return result
+
+    def stream_sync(
+        self, payload: dict, retries: int, open: Callable[[], Iterator[T]]
+    ) -> Iterator[T]:
+        """
+        Yield the elements of a streamed result, retrying the stream until its
+        first element arrives.  Once elements have been yielded, an error is
+        raised as it can't be retried without repeating them.
+        """
+        retries = self.retries if self.retries is not None else retries
+        attempt = 0
+        while True:
+            self._before()
+            started = False
+            try:
+                for elem in open():
+                    started = True
+                    yield elem
+            except Exception as exc:
+                if (
+                    started
+                    or (delay := self._after_error(payload, exc, attempt, retries))
+                    is None
+                ):
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self._record(success=True)
+            return
+
+    async def stream_async(
+        self, payload: dict, retries: int, open: Callable[[], AsyncIterator[T]]
+    ) -> AsyncIterator[T]:
+        """The async version of `stream_sync`"""
+        retries = self.retries if self.retries is not None else retries
+        attempt = 0
+        while True:
+            self._before()
+            started = False
+            try:
+                async for elem in open():
+                    started = True
+                    yield elem
+            except Exception as exc:
+                if (
+                    started
+                    or (delay := self._after_error(payload, exc, attempt, retries))
+                    is None
+                ):
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self._record(success=True)
+            return
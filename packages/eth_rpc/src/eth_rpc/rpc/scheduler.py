@@ -0,0 +1,255 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Iterator, Optional
+
+
+class Priority(str, Enum):
+    CRITICAL = "critical"
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+# most urgent first
+PRIORITIES = (Priority.CRITICAL, Priority.INTERACTIVE, Priority.BULK)
+
+# the class of a request when none is selected, by method
+DEFAULT_PRIORITIES: dict[str, Priority] = {
+    "eth_sendRawTransaction": Priority.CRITICAL,
+    "eth_sendTransaction": Priority.CRITICAL,
+    "eth_getTransactionCount": Priority.CRITICAL,
+    "eth_getLogs": Priority.BULK,
+    "eth_getBlockReceipts": Priority.BULK,
+    "debug_traceBlockByNumber": Priority.BULK,
+    "debug_traceBlockByHash": Priority.BULK,
+    "trace_block": Priority.BULK,
+    "trace_filter": Priority.BULK,
+}
+
+_priority: ContextVar[Optional[Priority]] = ContextVar("_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority: Optional[Priority | str]) -> Iterator[None]:
+    """
+    Send the requests made inside the block, including by tasks it starts,
+    with this priority:
+
+    ```python
+    with request_priority(Priority.BULK):
+        async for event in transfer_event.backfill(start_block, end_block):
+            ...
+    ```
+    """
+    if priority is None:
+        yield
+        return
+    token = _priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _Waiter:
+    __slots__ = ["priority", "enqueued", "granted", "future", "event"]
+
+    def __init__(self, priority: Priority):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.future: Optional[asyncio.Future] = None
+        self.event: Optional[threading.Event] = None
+
+    def grant(self) -> None:
+        self.granted = True
+        if self.future is not None:
+            loop = self.future.get_loop()
+            loop.call_soon_threadsafe(_resolve, self.future)
+        elif self.event is not None:
+            self.event.set()
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _Lanes:
+    """The queued and in-flight requests for one endpoint"""
+
+    def __init__(self):
+        self.active = {priority: 0 for priority in Priority}
+        self.waiting: dict[Priority, deque[_Waiter]] = {
+            priority: deque() for priority in Priority
+        }
+        # start-time fair queuing: a class's finish tag advances by 1 / weight
+        # per request, and the class with the lowest next tag goes first
+        self.finish = {priority: 0.0 for priority in Priority}
+        self.vtime = 0.0
+
+
+class RequestScheduler:
+    """
+    Queues the requests sent to each endpoint by priority class, so bulk
+    traffic like a backfill cannot starve latency-sensitive calls.
+
+    Critical requests (transaction sends and nonce reads, by default) are
+    dispatched first and are only bounded by their own limit.  Interactive
+    and bulk requests share `max_concurrency` in-flight requests per endpoint
+    by weighted fair queuing, each up to its own limit.  Keep
+    `max_concurrency` below the http client's connection limit so critical
+    requests always find a connection.
+
+    A request's class comes from `request_priority`, or else its method:
+
+    ```python
+    rpc.set_scheduler(RequestScheduler(max_concurrency=32, limits={"bulk": 4}))
+    ```
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        limits: Optional[dict[Priority | str, Optional[int]]] = None,
+        weights: Optional[dict[Priority | str, float]] = None,
+        methods: Optional[dict[str, Priority | str]] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.limits: dict[Priority, Optional[int]] = {
+            Priority.CRITICAL: None,
+            Priority.INTERACTIVE: None,
+            Priority.BULK: max(max_concurrency // 4, 1),
+        }
+        self.limits |= {Priority(key): value for key, value in (limits or {}).items()}
+        self.weights: dict[Priority, float] = {
+            Priority.CRITICAL: 1.0,
+            Priority.INTERACTIVE: 4.0,
+            Priority.BULK: 1.0,
+        }
+        self.weights |= {Priority(key): value for key, value in (weights or {}).items()}
+        self.methods: dict[str, Priority] = DEFAULT_PRIORITIES | {
+            method: Priority(priority) for method, priority in (methods or {}).items()
+        }
+        self.dispatched = {priority: 0 for priority in Priority}
+        self.waited = {priority: 0.0 for priority in Priority}
+        self._lanes: dict[str, _Lanes] = {}
+        self._lock = threading.Lock()
+
+    def priority(self, payload: dict | list[dict]) -> Priority:
+        if (priority := _priority.get()) is not None:
+            return priority
+        payloads = payload if isinstance(payload, list) else [payload]
+        # a batch goes with its most urgent call
+        return min(
+            (
+                self.methods.get(elem["method"], Priority.INTERACTIVE)
+                for elem in payloads
+            ),
+            key=PRIORITIES.index,
+        )
+
+    def _lanes_for(self, url: str) -> _Lanes:
+        if (lanes := self._lanes.get(url)) is None:
+            lanes = self._lanes[url] = _Lanes()
+        return lanes
+
+    def _below_limit(self, lanes: _Lanes, priority: Priority) -> bool:
+        limit = self.limits[priority]
+        return limit is None or lanes.active[priority] < limit
+
+    def _start(self, lanes: _Lanes, priority: Priority) -> None:
+        waiter = lanes.waiting[priority].popleft()
+        lanes.active[priority] += 1
+        self.dispatched[priority] += 1
+        self.waited[priority] += time.monotonic() - waiter.enqueued
+        waiter.grant()
+
+    def _dispatch(self, lanes: _Lanes) -> None:
+        while lanes.waiting[Priority.CRITICAL] and self._below_limit(
+            lanes, Priority.CRITICAL
+        ):
+            self._start(lanes, Priority.CRITICAL)
+
+        shared = (Priority.INTERACTIVE, Priority.BULK)
+        while sum(lanes.active[p] for p in shared) < self.max_concurrency:
+            ready = [
+                p for p in shared if lanes.waiting[p] and self._below_limit(lanes, p)
+            ]
+            if not ready:
+                return
+            starts = {p: max(lanes.vtime, lanes.finish[p]) for p in ready}
+            priority = min(ready, key=lambda p: starts[p] + 1 / self.weights[p])
+            lanes.vtime = starts[priority]
+            lanes.finish[priority] = starts[priority] + 1 / self.weights[priority]
+            self._start(lanes, priority)
+
+    def _enqueue(self, url: str, waiter: _Waiter) -> None:
+        lanes = self._lanes_for(url)
+        lanes.waiting[waiter.priority].append(waiter)
+        self._dispatch(lanes)
+
+    def _abandon(self, url: str, waiter: _Waiter) -> None:
+        with self._lock:
+            if waiter.granted:
+                self._release(url, waiter.priority)
+            else:
+                self._lanes_for(url).waiting[waiter.priority].remove(waiter)
+
+    async def acquire(self, url: str, priority: Priority) -> None:
+        """Wait for this class's turn to send a request to the endpoint"""
+        waiter = _Waiter(priority)
+        with self._lock:
+            self._enqueue(url, waiter)
+            if waiter.granted:
+                return
+            # granted under the lock, so it is set before any later grant
+            waiter.future = asyncio.get_running_loop().create_future()
+        try:
+            await waiter.future
+        except BaseException:
+            self._abandon(url, waiter)
+            raise
+
+    def acquire_sync(self, url: str, priority: Priority) -> None:
+        waiter = _Waiter(priority)
+        with self._lock:
+            self._enqueue(url, waiter)
+            if waiter.granted:
+                return
+            waiter.event = threading.Event()
+        try:
+            waiter.event.wait()
+        except BaseException:
+            self._abandon(url, waiter)
+            raise
+
+    def _release(self, url: str, priority: Priority) -> None:
+        lanes = self._lanes_for(url)
+        lanes.active[priority] -= 1
+        self._dispatch(lanes)
+
+    def release(self, url: str, priority: Priority) -> None:
+        with self._lock:
+            self._release(url, priority)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "dispatched": {p.value: n for p, n in self.dispatched.items()},
+                "waited": {p.value: t for p, t in self.waited.items()},
+                "endpoints": {
+                    url: {
+                        p.value: {
+                            "active": lanes.active[p],
+                            "waiting": len(lanes.waiting[p]),
+                        }
+                        for p in Priority
+                    }
+                    for url, lanes in self._lanes.items()
+                },
+            }
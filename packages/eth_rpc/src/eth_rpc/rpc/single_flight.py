@@ -0,0 +1,43 @@
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable
+
+from .hedge import IDEMPOTENT_METHODS
+
+if TYPE_CHECKING:
+    from .base import BaseRPC
+
+
+def request_key(rpc: "BaseRPC", payload: dict) -> str:
+    """Identifies a request by its network, method and params, ignoring its id"""
+    params = json.dumps(
+        payload.get("params", []), sort_keys=True, separators=(",", ":")
+    )
+    return f"{rpc.network.chain_id}:{payload['method']}:{params}"
+
+
+class SingleFlight:
+    """
+    Shares one in-flight request between concurrent identical calls, ie. every
+    coroutine asking for the latest block during a block tick.
+
+    The request runs as its own task, so a caller being cancelled does not
+    cancel it for the others.
+    """
+
+    def __init__(self, methods: Iterable[str] = IDEMPOTENT_METHODS):
+        self.methods = frozenset(methods)
+        self.shared = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def shares(self, method: str) -> bool:
+        return method in self.methods
+
+    async def do(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        if (task := self._inflight.get(key)) is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
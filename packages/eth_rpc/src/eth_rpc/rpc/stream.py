@@ -0,0 +1,142 @@
+import codecs
+import json
+import re
+from typing import Any
+
+from eth_rpc.exceptions import RPCDecodeError, RPCError
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# parser states
+OBJECT, KEY, COLON, VALUE, ELEMENT, DONE = range(6)
+
+
+class ResultStream:
+    """
+    Parses a JSON-RPC response as its body arrives, returning the elements of
+    an array result as soon as each one is complete.  Only the element being
+    parsed is buffered, so memory stays bounded however large the result is.
+
+    ```python
+    parser = ResultStream()
+    for chunk in response.iter_bytes():
+        for log in parser.feed(chunk):
+            ...
+    parser.close()
+    ```
+
+    The other members of the response, ie. `id` or `error`, are collected in
+    `response`.
+    """
+
+    def __init__(self):
+        self.response: dict[str, Any] = {}
+        self.streamed = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = OBJECT
+        self._key: str = ""
+
+    @property
+    def done(self) -> bool:
+        return self._state == DONE
+
+    def feed(self, data: bytes, final: bool = False) -> list[Any]:
+        self._buffer = self._buffer[self._pos :] + self._decoder.decode(data, final)
+        self._pos = 0
+        elements: list[Any] = []
+        while self._state != DONE and self._step(elements, final):
+            pass
+        return elements
+
+    def close(self) -> dict[str, Any]:
+        """Finish parsing, returning the response without its streamed result"""
+        if self._state != DONE:
+            self.feed(b"", final=True)
+        if self._state != DONE:
+            raise RPCDecodeError(self._buffer[self._pos :].encode())
+        return self.response
+
+    def _skip(self) -> bool:
+        """Skip whitespace, returning whether there is anything left to parse"""
+        self._pos = WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+        return self._pos < len(self._buffer)
+
+    def _value(self, final: bool) -> tuple[bool, Any]:
+        try:
+            value, end = self._json.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise RPCDecodeError(self._buffer[self._pos :].encode())
+            return False, None
+        if end == len(self._buffer) and not final:
+            # a number could still be missing digits
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _step(self, elements: list[Any], final: bool) -> bool:  # noqa: C901
+        if not self._skip():
+            return False
+        char = self._buffer[self._pos]
+        if self._state == OBJECT:
+            if char != "{":
+                raise RPCDecodeError(self._buffer[self._pos :].encode())
+            self._pos += 1
+            self._state = KEY
+        elif self._state == KEY:
+            if char == "}":
+                self._pos += 1
+                self._state = DONE
+            elif char == ",":
+                self._pos += 1
+            else:
+                complete, key = self._value(final)
+                if not complete:
+                    return False
+                self._key = key
+                self._state = COLON
+        elif self._state == COLON:
+            if char != ":":
+                raise RPCDecodeError(self._buffer[self._pos :].encode())
+            self._pos += 1
+            self._state = VALUE
+        elif self._state == VALUE:
+            if self._key == "result" and char == "[":
+                self._pos += 1
+                self.streamed = True
+                self._state = ELEMENT
+            else:
+                complete, value = self._value(final)
+                if not complete:
+                    return False
+                self.response[self._key] = value
+                self._state = KEY
+        elif self._state == ELEMENT:
+            if char == "]":
+                self._pos += 1
+                self._state = KEY
+            elif char == ",":
+                self._pos += 1
+            else:
+                complete, value = self._value(final)
+                if not complete:
+                    return False
+                elements.append(value)
+        return True
+
+    @staticmethod
+    def elements(response: Any) -> list[Any]:
+        """The elements of an already parsed response's array result"""
+        if not isinstance(response, dict):
+            raise RPCDecodeError(response)
+        if "error" in response:
+            raise RPCError.from_response(response["error"])
+        result = response.get("result")
+        if result is None:
+            return []
+        if not isinstance(result, list):
+            raise RPCDecodeError(result)
+        return result
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import logging
+from typing import Any, Optional
+
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
+from websockets.legacy.client import WebSocketClientProtocol, connect
+
+from .decode import loads
+from .pool import EndpointPool
+
+logger = logging.getLogger(__name__)
+
+
+class WebSocketConnection:
+    """
+    A single websocket carrying many requests at once, matched to their
+    responses by id.  Pending requests are re-sent after a reconnect.
+    """
+
+    def __init__(self, transport: "WebSocketTransport"):
+        self.transport = transport
+        self.ws: Optional[WebSocketClientProtocol] = None
+        self.connected = asyncio.Event()
+        self.closed = False
+        # keyed by the request id, or the first id of a batch
+        self.pending: dict[int, tuple[dict | list[dict], asyncio.Future]] = {}
+        self._ids: dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    @staticmethod
+    def _request_ids(payload: dict | list[dict]) -> list[int]:
+        payloads = payload if isinstance(payload, list) else [payload]
+        return [elem["id"] for elem in payloads]
+
+    async def request(self, payload: dict | list[dict]) -> tuple[Any, int, int]:
+        """The response, and the bytes sent and received for it"""
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        body = json.dumps(payload)
+        ids = self._request_ids(payload)
+        key = ids[0]
+        self.pending[key] = (payload, future)
+        for id_ in ids:
+            self._ids[id_] = key
+        try:
+            if self.connected.is_set():
+                # if this fails the request is re-sent once reconnected
+                try:
+                    await self.ws.send(body)  # type: ignore[union-attr]
+                except ConnectionClosed:
+                    pass
+            response, bytes_in = await future
+            return response, len(body), bytes_in
+        finally:
+            self.pending.pop(key, None)
+            for id_ in ids:
+                self._ids.pop(id_, None)
+
+    def _dispatch(self, message: Any, size: int) -> None:
+        if isinstance(message, list):
+            ids = [elem.get("id") for elem in message if isinstance(elem, dict)]
+        elif isinstance(message, dict):
+            # subscription notifications have no id and are ignored
+            ids = [message.get("id")]
+        else:
+            return
+        for id_ in ids:
+            if id_ is not None and (key := self._ids.get(id_)) is not None:
+                _, future = self.pending[key]
+                if not future.done():
+                    future.set_result((message, size))
+                return
+
+    def _fail_unretryable(self, exc: Exception) -> None:
+        for payload, future in list(self.pending.values()):
+            if not future.done() and not EndpointPool.is_retryable(payload, None):
+                future.set_exception(exc)
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for _, future in list(self.pending.values()):
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _run(self) -> None:
+        delay = self.transport.min_reconnect_delay
+        while not self.closed:
+            try:
+                ws = await connect(
+                    self.transport.url,
+                    ping_interval=self.transport.ping_interval,
+                    ping_timeout=self.transport.ping_interval,
+                    max_size=None,
+                )
+            except (OSError, InvalidHandshake, asyncio.TimeoutError):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.transport.max_reconnect_delay)
+                continue
+
+            delay = self.transport.min_reconnect_delay
+            self.ws = ws
+            # set before re-sending, so new requests send themselves
+            self.connected.set()
+            try:
+                for payload, future in list(self.pending.values()):
+                    if not future.done():
+                        await ws.send(json.dumps(payload))
+                while True:
+                    # recv raises on a clean close too, unlike iterating
+                    message = await ws.recv()
+                    try:
+                        decoded = loads(message)
+                    except ValueError:
+                        logger.warning("Skipping a websocket message that isn't JSON")
+                        continue
+                    self._dispatch(decoded, len(message))
+            except ConnectionClosed as exc:
+                self._fail_unretryable(exc)
+            except Exception as exc:
+                # the next request starts a new connection
+                logger.exception("Websocket connection failed")
+                self._fail_pending(exc)
+                self._task = None
+                await ws.close()
+                return
+            finally:
+                self.connected.clear()
+                self.ws = None
+            if not self.closed:
+                self.transport.reconnects += 1
+
+    async def close(self) -> None:
+        self.closed = True
+        if self.ws is not None:
+            await self.ws.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class WebSocketTransport:
+    """
+    Sends ordinary JSON-RPC requests over a few long-lived websocket
+    connections instead of one http request each.  Requests are spread over
+    the connection with the fewest in flight.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        connections: int = 1,
+        ping_interval: Optional[float] = 20.0,
+        min_reconnect_delay: float = 0.1,
+        max_reconnect_delay: float = 5.0,
+    ):
+        self.url = url
+        self.size = connections
+        self.ping_interval = ping_interval
+        self.min_reconnect_delay = min_reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+        self.connections: list[WebSocketConnection] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _connection(self) -> WebSocketConnection:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # connections are bound to the loop they were opened in
+            self._loop = loop
+            self.connections = [WebSocketConnection(self) for _ in range(self.size)]
+        connection = min(self.connections, key=lambda conn: len(conn.pending))
+        connection.start()
+        return connection
+
+    async def request(
+        self, payload: dict | list[dict], timeout: Optional[float] = None
+    ) -> tuple[Any, int, int]:
+        """The response, and the bytes sent and received for it"""
+        return await asyncio.wait_for(self._connection().request(payload), timeout)
+
+    async def close(self) -> None:
+        for connection in self.connections:
+            await connection.close()
@@ -1,14 +1,19 @@
 import asyncio
 import json
 import re
+import time
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
 from contextvars import ContextVar
+from functools import partial
 from typing import Generic, Optional, TypeVar
 
 from eth_rpc import Event, EventData, get_current_network
 from eth_rpc.block import Block
+from eth_rpc.event import _event_size, _logs_error
+from eth_rpc.exceptions import LogResponseExceededError
 from eth_rpc.log import Log
+from eth_rpc.models import Log as LogModel
 from eth_rpc.types import (
     BLOCK_STRINGS,
     EvmDataDict,
@@ -17,10 +22,17 @@ from eth_rpc.types import (
     LogsParams,
     SubscriptionResponse,
 )
+from eth_rpc.utils import (
+    CursorStore,
+    DensityStore,
+    StepSizeController,
+    cursor_store,
+    ordered_chunks,
+)
 from eth_typing import HexAddress, HexStr
 from pydantic import BaseModel, ConfigDict, Field
-from websockets.exceptions import ConnectionClosedError
-from websockets.legacy.client import WebSocketClientProtocol, connect
+from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
+from websockets.legacy.client import WebSocketClientProtocol
 
 from .._request import Request
 from ..constants import DEFAULT_CONTEXT, DEFAULT_EVENT
@@ -38,6 +50,12 @@ class EventSubscriber(Request, Generic[U]):
     receivers: dict[HexStr, list[Receiver[U]]] = Field(default_factory=dict)
     events: list[Event] = Field(default_factory=list)
     step_size: int | None = Field(default=None)
+    # yield events as each eth_getLogs response arrives, see `Event.get_logs`
+    stream: bool = Field(default=False)
+    # fetch up to this many windows at once, see `Event.backfill`
+    concurrency: int = Field(default=1)
+    # start after the last block fully emitted by a previous run, see `Event.backfill`
+    resume: bool | CursorStore = Field(default=False)
 
     _start_block: Optional[int | BLOCK_STRINGS] = None
     _end_block: Optional[int | BLOCK_STRINGS] = None
@@ -53,6 +71,32 @@ class EventSubscriber(Request, Generic[U]):
         """The nested list makes it so any match to topic0 will be selected"""
         return [[e.get_topic0 for e in self.events]]
 
+    def _event_data(
+        self, result: LogModel, topic_dict: dict[HexStr, Event]
+    ) -> Optional[EventData[U]]:
+        event = topic_dict[result.topics[0]]
+
+        if len(result.topics) != event.plan.topics:
+            # this happens when an event has the same topic0, but different indexed events so it doesn't match up to the expected ABI
+            return None
+
+        return EventData[U](
+            name=event.name,
+            log=result,
+            event=event.process(
+                result.topics,
+                result.data,
+            ),
+            network=self.network,
+        )
+
+    async def _stream_logs(
+        self, args: LogsArgs, topic_dict: dict[HexStr, Event]
+    ) -> AsyncIterator[EventData[U]]:
+        async for result in self.rpc().get_logs.stream(args):
+            if (event_data := self._event_data(result, topic_dict)) is not None:
+                yield event_data
+
     async def _get_logs(
         self,
         start_block: int,
@@ -60,20 +104,46 @@ class EventSubscriber(Request, Generic[U]):
         addresses: list[HexAddress] = [],
     ) -> AsyncIterator[EventData[U]]:
         topic_dict = {event.get_topic0: event for event in self.events}
-        cur_end = start_block + self.step_size - 1 if self.step_size else end_block
+        store = cursor_store(self.resume)
+        key = self._cursor_key(addresses)
+        if store is not None:
+            last = await store.load(key)
+            if last is not None and last >= start_block:
+                start_block = last + 1
+            if start_block > end_block:
+                return
+
+        if self.concurrency > 1:
+            async for event_data in self._get_logs_concurrently(
+                start_block, end_block, addresses, topic_dict, store, key
+            ):
+                yield event_data
+            return
+
+        controller = (
+            None
+            if self.step_size
+            else self._step_controller(addresses, end_block - start_block + 1)
+        )
+        step = self.step_size or controller.step  # type: ignore[union-attr]
+        cur_end = min(start_block + step - 1, end_block)
 
         while True:
-            try:
-                response = await self.rpc().get_logs(
-                    LogsArgs(
-                        params=LogsParams(
-                            address=addresses,
-                            from_block=start_block,
-                            to_block=cur_end,
-                            topics=self.get_topics(),
-                        )
-                    )
+            args = LogsArgs(
+                params=LogsParams(
+                    address=addresses,
+                    from_block=start_block,
+                    to_block=cur_end,
+                    topics=self.get_topics(),
                 )
+            )
+            blocks = cur_end - start_block + 1
+            window = self._window_logs(args, topic_dict)
+            if controller is not None:
+                window = controller.window(blocks, window, _event_size)
+            try:
+                async for event_data in window:
+                    yield event_data
             except ValueError as err:
                 # TODO: confirm this error is due to the cur_end being too far in the future
                 message = err.args[0]
@@ -90,35 +160,110 @@ class EventSubscriber(Request, Generic[U]):
                     if len(boundaries) != 2:
                         raise err
                     cur_end = int(boundaries[1], 16)
+                    if controller is not None:
+                        controller.exceeded(blocks, cur_end - start_block + 1)
                 else:
                     raise err
                 continue
 
-            for result in response:
-                event = topic_dict[result.topics[0]]
-
-                # TODO: this is just a placeholder
-                if len(result.topics) != (len(event.get_indexed()) + 1):
-                    # this happens when an event has the same topic0, but different indexed events so it doesn't match up to the expected ABI
-                    # print("INDEX MISMATCH", result.transaction_hash, result.log_index)
-                    continue
-
-                event_data = EventData[U](
-                    name=event.name,
-                    log=result,
-                    event=event.process(
-                        result.topics,
-                        result.data,
-                    ),
-                    network=self.network,
-                )
-                yield event_data
-
+            if store is not None:
+                await store.save(key, cur_end)
             start_block = cur_end + 1
-            cur_end = start_block + self.step_size - 1 if self.step_size else end_block
-            if start_block >= end_block:
+            step = self.step_size or controller.step  # type: ignore[union-attr]
+            cur_end = min(start_block + step - 1, end_block)
+            if start_block > end_block:
                 break
 
+    async def _window_logs(
+        self, args: LogsArgs, topic_dict: dict[HexStr, Event]
+    ) -> AsyncIterator[EventData[U]]:
+        if self.stream:
+            async for event_data in self._stream_logs(args, topic_dict):
+                yield event_data
+            return
+        for result in await self.rpc().get_logs(args):
+            if (decoded := self._event_data(result, topic_dict)) is not None:
+                yield decoded
+
+    def _step_controller(
+        self, addresses: list[HexAddress], blocks: int
+    ) -> StepSizeController:
+        return StepSizeController(
+            key=DensityStore.key(
+                self.network.chain_id,
+                addresses,
+                [event.get_topic0 for event in self.events],
+            ),
+            blocks=blocks,
+        )
+
+    def _cursor_key(self, addresses: list[HexAddress]) -> str:
+        return CursorStore.key(
+            self.network.chain_id,
+            [event.get_topic0 for event in self.events],
+            addresses,
+        )
+
+    async def _get_logs_concurrently(
+        self,
+        start_block: int,
+        end_block: int,
+        addresses: list[HexAddress],
+        topic_dict: dict[HexStr, Event],
+        store: Optional[CursorStore] = None,
+        key: Optional[str] = None,
+    ) -> AsyncIterator[EventData[U]]:
+        controller = (
+            None
+            if self.step_size
+            else self._step_controller(addresses, end_block - start_block + 1)
+        )
+
+        async def fetch(from_block: int, to_block: int) -> list[EventData[U]]:
+            args = LogsArgs(
+                params=LogsParams(
+                    address=addresses,
+                    from_block=from_block,
+                    to_block=to_block,
+                    topics=self.get_topics(),
+                )
+            )
+            blocks = to_block - from_block + 1
+            started = time.monotonic()
+            try:
+                events = [
+                    event_data
+                    async for event_data in self._window_logs(args, topic_dict)
+                ]
+            except ValueError as err:
+                error = _logs_error(err)
+                if controller is not None and isinstance(
+                    error, LogResponseExceededError
+                ):
+                    controller.exceeded(blocks, error.recommended_end - from_block + 1)
+                raise error
+            if controller is not None:
+                controller.observe(
+                    blocks,
+                    len(events),
+                    sum(_event_size(event_data) for event_data in events),
+                    time.monotonic() - started,
+                )
+            return events
+
+        on_chunk = (
+            partial(store.save, key) if store is not None and key is not None else None
+        )
+        async for event_data in ordered_chunks(
+            fetch,
+            start_block,
+            end_block,
+            self.step_size or (lambda: controller.step),  # type: ignore[union-attr]
+            self.concurrency,
+            on_chunk=on_chunk,
+        ):
+            yield event_data
+
     async def get_logs(
         self,
         start_block: int | BLOCK_STRINGS,
@@ -161,8 +306,7 @@ class EventSubscriber(Request, Generic[U]):
         result = Log(**result_dict, network=self.network)  # type: ignore
         event = event_dict[result.topics[0]]
 
-        # TODO: this is just a placeholder
-        if len(result.topics) != (len(event.get_indexed()) + 1):
+        if len(result.topics) != event.plan.topics:
             # print("INDEX MISMATCH", result.transaction_hash, result.log_index)
             return None
 
@@ -184,8 +328,7 @@ class EventSubscriber(Request, Generic[U]):
         topic_dict = {event.get_topic0: event for event in self.events}
 
         rpc = self._rpc()
-        async for w3_connection in connect(
-            rpc.wss,
+        async for w3_connection in rpc.ws_connect(
             ping_interval=60,
             ping_timeout=60,
             max_queue=10000,
@@ -214,6 +357,9 @@ class EventSubscriber(Request, Generic[U]):
 
                 except asyncio.exceptions.TimeoutError:
                     pass
+                except ConnectionClosedOK:
+                    # the node closed the connection, reconnect right away
+                    break
                 except (
                     ConnectionClosedError,
                     ConnectionResetError,
@@ -18,8 +18,8 @@ from eth_typing import HexAddress, HexStr
 from pydantic import BaseModel, ConfigDict, model_validator
 from pydantic.alias_generators import to_camel
 from typing_extensions import TypeVar
-from websockets.exceptions import ConnectionClosedError
-from websockets.legacy.client import WebSocketClientProtocol, connect
+from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
+from websockets.legacy.client import WebSocketClientProtocol
 
 from ._request import Request
 from ._transport import _force_get_global_rpc
@@ -250,8 +250,7 @@ class Transaction(Request, TransactionModel, Generic[Network]):
         self,
     ) -> AsyncIterator[PendingTransaction]:  # noqa: C901
         rpc = _force_get_global_rpc()
-        async for w3_connection in connect(
-            rpc.wss,
+        async for w3_connection in rpc.ws_connect(
             ping_interval=60,
             ping_timeout=60,
             max_queue=10000,
@@ -282,6 +281,9 @@ class Transaction(Request, TransactionModel, Generic[Network]):
                         yield transaction
                 except asyncio.exceptions.TimeoutError:
                     pass
+                except ConnectionClosedOK:
+                    # the node closed the connection, reconnect right away
+                    break
                 except (
                     ConnectionClosedError,
                     ConnectionResetError,
@@ -17,6 +17,8 @@ class BlockExplorer(BaseModel):
 class RpcUrl(BaseModel):
     http: AnyHttpUrl
     wss: Optional[AnyWebsocketUrl] = Field(default=None)
+    # relative share of requests when spread across the default and backup urls
+    weight: float = 1.0
 
 
 class Rpcs(BaseModel):
@@ -51,6 +53,7 @@ class Network(BaseModel):
         http: str | None = None,
         wss: str | None = None,
         api_key: str | None = None,
+        backups: list[str] | None = None,
     ):
         if http:
             cls.rpc.default.http = AnyHttpUrl(http)
@@ -60,6 +63,8 @@ class Network(BaseModel):
             cls.wss = str(cls.rpc.default.wss)
         if api_key:
             cls.block_explorer.api_key = api_key
+        if backups is not None:
+            cls.rpc.backups = [RpcUrl(http=AnyHttpUrl(url)) for url in backups]
         return cls
 
     @classmethod
@@ -1,7 +1,19 @@
-from typing import TYPE_CHECKING, Generator, Generic, NewType, Optional, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Generator,
+    Generic,
+    Iterator,
+    NewType,
+    Optional,
+    TypeVar,
+)
 
 if TYPE_CHECKING:
     from eth_rpc.rpc.method import RPCMethod
+    from eth_rpc.rpc.scheduler import Priority
 
 # used to indicate methods with no arguments
 NoArgs = NewType("NoArgs", tuple[()])
@@ -11,23 +23,64 @@ ReturnType = TypeVar("ReturnType")
 
 
 class RPCResponseModel(Generic[ArgType, ReturnType]):
-    __slots__ = ["func", "arg"]
+    __slots__ = ["func", "arg", "priority"]
 
-    func: "RPCMethod"
-    arg: ArgType | NoArgs
+    def __init__(
+        self,
+        func: "RPCMethod",
+        arg: Optional[ArgType | NoArgs] = None,
+        priority: Optional["Priority | str"] = None,
+    ):
+        # annotated here rather than on the class, where mypy would read the
+        # method as a descriptor of this class
+        self.func: "RPCMethod" = func
+        self.arg: ArgType | NoArgs = arg if arg is not None else NoArgs(())
+        self.priority: Optional["Priority | str"] = priority
 
-    def __init__(self, func: "RPCMethod", arg: Optional[ArgType] = None):
-        self.func = func
-        self.arg = arg if arg is not None else NoArgs(())
+    def with_priority(
+        self, priority: "Priority | str"
+    ) -> "RPCResponseModel[ArgType, ReturnType]":
+        """Send the request with this priority, see `RequestScheduler`"""
+        return RPCResponseModel(self.func, self.arg, priority)
 
     @property
     def sync(self) -> ReturnType:
+        if self.priority is not None:
+            from eth_rpc.rpc.scheduler import request_priority
+
+            with request_priority(self.priority):
+                return self._call_sync()
+        return self._call_sync()
+
+    def _call_sync(self) -> ReturnType:
         if self.arg:
             return self.func.sync(self.arg)
         response = self.func.sync()
         return response
 
+    async def _prioritized(self) -> ReturnType:
+        from eth_rpc.rpc.scheduler import request_priority
+
+        with request_priority(self.priority):
+            return await self._call()
+
+    def _call(self) -> Awaitable[ReturnType]:
+        if self.arg:
+            return self.func(self.arg)
+        return self.func()
+
     def __await__(self) -> Generator[None, None, ReturnType]:
+        if self.priority is not None:
+            return self._prioritized().__await__()
+        return self._call().__await__()
+
+    def stream(self) -> AsyncIterator[Any]:
+        """Yield the elements of a list result as they arrive"""
+        if self.arg:
+            return self.func.stream(self.arg)
+        return self.func.stream()
+
+    def stream_sync(self) -> Iterator[Any]:
         if self.arg:
-            return self.func(self.arg).__await__()
-        return self.func().__await__()
+            return self.func.stream_sync(self.arg)
+        return self.func.stream_sync()
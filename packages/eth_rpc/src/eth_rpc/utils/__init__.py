@@ -1,5 +1,15 @@
 from .address import address_to_topic, to_checksum
 from .bloom import BloomFilter
+from .cursor import (
+    CursorStore,
+    FileCursorStore,
+    MemoryCursorStore,
+    SqliteCursorStore,
+    cursor_store,
+    filter_key,
+    get_cursor_store,
+    set_cursor_store,
+)
 from .datetime import convert_datetime_to_iso_8601, load_datetime_string
 from .dual_async import handle_maybe_awaitable, run
 from .event_receipt import (
@@ -9,12 +19,21 @@ from .event_receipt import (
     get_single_event_from_receipt,
     get_single_event_from_tx_hash,
 )
+from .log_cache import LogCache, get_log_cache, log_cache, set_log_cache
 from .model import RPCModel
-from .streams import acombine, combine, ordered_iterator, sort_key
+from .step_size import (
+    DensityStore,
+    StepSizeController,
+    get_density_store,
+    log_size,
+    set_density_store,
+)
+from .streams import acombine, combine, ordered_chunks, ordered_iterator, sort_key
 from .types import is_annotation, to_bytes32, to_hex_str, to_topic, transform_primitive
 
 __all__ = [
     "BloomFilter",
+    "DensityStore",
     "RPCModel",
     "run",
     "acombine",
@@ -22,16 +41,33 @@ __all__ = [
     "to_bytes32",
     "combine",
     "convert_datetime_to_iso_8601",
+    "cursor_store",
+    "CursorStore",
     "EventReceiptUtility",
+    "FileCursorStore",
+    "filter_key",
+    "get_cursor_store",
+    "get_density_store",
     "get_events_from_receipt",
+    "get_log_cache",
     "get_events_from_tx_hash",
     "get_single_event_from_receipt",
     "get_single_event_from_tx_hash",
     "handle_maybe_awaitable",
     "is_annotation",
     "load_datetime_string",
+    "log_cache",
+    "log_size",
+    "LogCache",
+    "MemoryCursorStore",
+    "ordered_chunks",
     "ordered_iterator",
+    "set_cursor_store",
+    "set_density_store",
+    "set_log_cache",
     "sort_key",
+    "SqliteCursorStore",
+    "StepSizeController",
     "to_checksum",
     "to_hex_str",
     "to_topic",
@@ -1,18 +1,56 @@
+import asyncio
 from collections.abc import Coroutine
-from typing import Any, Literal, overload
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, Optional, overload
+from weakref import WeakKeyDictionary
 
 import httpx
+from eth_rpc.rpc.base import ConnectionPoolConfig, close_async_client
 from httpx import Response
 
-from .dual_async import DualAsync, MaybeAwaitable, run
+from .dual_async import DualAsync, run
+
+if TYPE_CHECKING:
+    from eth_rpc.types import MaybeAwaitable
 
 
 class HTTPClient(DualAsync):
+    # shared keep-alive clients, so repeated requests reuse connections.  An
+    # async client's connections belong to the loop that opened them, so each
+    # running loop gets its own.
+    pool_config: ClassVar[ConnectionPoolConfig] = ConnectionPoolConfig()
+    _sync_client: ClassVar[Optional[httpx.Client]] = None
+    _async_clients: ClassVar[
+        WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]
+    ] = WeakKeyDictionary()
+
+    @classmethod
+    def configure_pool(cls, config: ConnectionPoolConfig) -> None:
+        """Replace the shared clients with clients using these pool settings"""
+        cls.pool_config = config
+        if cls._sync_client is not None:
+            cls._sync_client.close()
+            cls._sync_client = None
+        for loop, client in list(cls._async_clients.items()):
+            close_async_client(client, loop)
+        cls._async_clients.clear()
+
+    @classmethod
+    def sync_client(cls) -> httpx.Client:
+        if cls._sync_client is None:
+            cls._sync_client = cls.pool_config.make_client()
+        return cls._sync_client
+
+    @classmethod
+    def async_client(cls) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if (client := cls._async_clients.get(loop)) is None:
+            client = cls._async_clients[loop] = cls.pool_config.make_async_client()
+        return client
+
     async def _request(self, method, url, *args, sync: bool, **kwargs):
         if sync:
-            return httpx.request(method, url, *args, **kwargs)
-        async with httpx.AsyncClient() as client:
-            return await client.request(method, url, *args, **kwargs)
+            return self.sync_client().request(method, url, *args, **kwargs)
+        return await self.async_client().request(method, url, *args, **kwargs)
 
     # GET
     @overload
@@ -23,7 +61,9 @@ class HTTPClient(DualAsync):
         self, url, *args, sync: Literal[False] = ..., **kwargs
     ) -> Coroutine[Any, Any, Response]: ...
 
-    def get(self, url, *args, sync: bool = False, **kwargs) -> MaybeAwaitable[Response]:
+    def get(
+        self, url, *args, sync: bool = False, **kwargs
+    ) -> "MaybeAwaitable[Response]":
         return run(self._request, "GET", url, *args, sync=sync, **kwargs)
 
     # PUT
@@ -35,7 +75,9 @@ class HTTPClient(DualAsync):
         self, url, *args, sync: Literal[False] = ..., **kwargs
     ) -> Coroutine[Any, Any, Response]: ...
 
-    def put(self, url, *args, sync: bool = False, **kwargs) -> MaybeAwaitable[Response]:
+    def put(
+        self, url, *args, sync: bool = False, **kwargs
+    ) -> "MaybeAwaitable[Response]":
         return run(self._request, "PUT", url, *args, sync=sync, **kwargs)
 
     # POST
@@ -49,7 +91,7 @@ class HTTPClient(DualAsync):
 
     def post(
         self, url, *args, sync: bool = False, **kwargs
-    ) -> MaybeAwaitable[Response]:
+    ) -> "MaybeAwaitable[Response]":
         return run(self._request, "POST", url, *args, sync=sync, **kwargs)
 
     # DELETE
@@ -63,5 +105,5 @@ class HTTPClient(DualAsync):
 
     def delete(
         self, url, *args, sync: bool = False, **kwargs
-    ) -> MaybeAwaitable[Response]:
+    ) -> "MaybeAwaitable[Response]":
         return run(self._request, "DELETE", url, *args, sync=sync, **kwargs)
@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+
+def filter_key(
+    chain_id: int,
+    topics: list[Any],
+    addresses: Optional[Sequence[str]] = None,
+) -> str:
+    """
+    A stable key for a log filter on a chain, the same for any order or
+    casing of the addresses
+    """
+    filters = json.dumps(
+        [topics, sorted(address.lower() for address in addresses or [])],
+        sort_keys=True,
+    )
+    return f"{chain_id}:{hashlib.sha256(filters.encode()).hexdigest()[:32]}"
+
+
+class CursorStore(ABC):
+    """
+    Where a backfill records the last block it fully emitted, so it can
+    resume there after a restart.  Implement `load` and `save` to keep
+    cursors elsewhere, ie. in a database.
+    """
+
+    @abstractmethod
+    async def load(self, key: str) -> Optional[int]: ...
+
+    @abstractmethod
+    async def save(self, key: str, block_number: int) -> None: ...
+
+    @staticmethod
+    def key(
+        chain_id: int,
+        topics: list[Any],
+        addresses: Optional[Sequence[str]] = None,
+    ) -> str:
+        """
+        The cursor for a backfill of these topics, including any filters on
+        indexed topics, from these addresses
+        """
+        return filter_key(chain_id, topics, addresses)
+
+
+class MemoryCursorStore(CursorStore):
+    """Keeps cursors for the life of the process"""
+
+    def __init__(self):
+        self._cursors: dict[str, int] = {}
+
+    async def load(self, key: str) -> Optional[int]:
+        return self._cursors.get(key)
+
+    async def save(self, key: str, block_number: int) -> None:
+        self._cursors[key] = block_number
+
+
+class FileCursorStore(CursorStore):
+    """Keeps cursors in a JSON file, read and written off the event loop"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict[str, int]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text())
+
+    async def load(self, key: str) -> Optional[int]:
+        return await asyncio.to_thread(self._load, key)
+
+    async def save(self, key: str, block_number: int) -> None:
+        await asyncio.to_thread(self._save, key, block_number)
+
+    def _load(self, key: str) -> Optional[int]:
+        return self._read().get(key)
+
+    def _save(self, key: str, block_number: int) -> None:
+        with self._lock:
+            cursors = self._read()
+            cursors[key] = block_number
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(cursors))
+            os.replace(tmp, self.path)
+
+
+class SqliteCursorStore(CursorStore):
+    """
+    Keeps cursors in a `cursors` table of a sqlite database, queried off the
+    event loop
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cursors "
+                "(key TEXT PRIMARY KEY, block_number INTEGER NOT NULL)"
+            )
+
+    async def load(self, key: str) -> Optional[int]:
+        return await asyncio.to_thread(self._load, key)
+
+    async def save(self, key: str, block_number: int) -> None:
+        await asyncio.to_thread(self._save, key, block_number)
+
+    def _load(self, key: str) -> Optional[int]:
+        with closing(sqlite3.connect(self.path)) as conn:
+            row = conn.execute(
+                "SELECT block_number FROM cursors WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _save(self, key: str, block_number: int) -> None:
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "INSERT INTO cursors (key, block_number) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET block_number = excluded.block_number",
+                (key, block_number),
+            )
+
+
+_cursor_store: CursorStore = MemoryCursorStore()
+
+
+def set_cursor_store(store: CursorStore | str | Path) -> None:
+    """
+    Keep backfill cursors in this store, or in a sqlite database at a path
+    ending in `.db` or `.sqlite`, else a JSON file at the path
+    """
+    global _cursor_store
+    if not isinstance(store, CursorStore):
+        if Path(store).suffix in (".db", ".sqlite"):
+            store = SqliteCursorStore(store)
+        else:
+            store = FileCursorStore(store)
+    _cursor_store = store
+
+
+def get_cursor_store() -> CursorStore:
+    return _cursor_store
+
+
+def cursor_store(resume: "bool | CursorStore") -> Optional[CursorStore]:
+    """The store for a backfill's `resume` option, if it resumes"""
+    if isinstance(resume, CursorStore):
+        return resume
+    return get_cursor_store() if resume else None
@@ -0,0 +1,260 @@
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+from .cursor import filter_key
+
+if TYPE_CHECKING:
+    from eth_rpc.models import Log
+
+
+class LogCache:
+    """
+    Raw logs kept in a sqlite database, with an index of the block ranges
+    that have been fully fetched for each filter.  A read of a range only
+    requests the gaps in the index from the node, and serves the rest from
+    the database.
+
+    Only finalized blocks are stored and marked as fetched, so a reorg can't
+    leave stale logs in the cache.  With `max_bytes`, the filters read least
+    recently are evicted once the logs outgrow it.  Without a `path`, the
+    cache is kept in memory.
+
+    ```python
+    cache = LogCache("~/.cache/eth_rpc/logs.db", max_bytes=2**30)
+    async for event in transfer_event.backfill(start_block, end_block, cache=cache):
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.path = Path(path).expanduser() if path is not None else None
+        self.max_bytes = max_bytes
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path if self.path is not None else ":memory:",
+            check_same_thread=False,
+        )
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS logs ("
+                " key TEXT NOT NULL, block_number INTEGER NOT NULL,"
+                " log_index INTEGER NOT NULL, log TEXT NOT NULL,"
+                " PRIMARY KEY (key, block_number, log_index));"
+                "CREATE TABLE IF NOT EXISTS ranges ("
+                " key TEXT NOT NULL, start INTEGER NOT NULL, end INTEGER NOT NULL,"
+                " PRIMARY KEY (key, start));"
+                "CREATE TABLE IF NOT EXISTS filters ("
+                " key TEXT PRIMARY KEY, bytes INTEGER NOT NULL, accessed REAL NOT NULL);"
+            )
+
+    @staticmethod
+    def key(
+        chain_id: int,
+        topics: list[Any],
+        addresses: Optional[Sequence[str]] = None,
+    ) -> str:
+        """The filter for these topics, including filters on indexed topics"""
+        return filter_key(chain_id, topics, addresses)
+
+    def ranges(self, key: str) -> list[tuple[int, int]]:
+        """The block ranges fully fetched for a filter"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT start, end FROM ranges WHERE key = ? ORDER BY start", (key,)
+            ).fetchall()
+
+    def gaps(self, key: str, start: int, end: int) -> list[tuple[int, int]]:
+        """The block ranges between `start` and `end` that aren't cached"""
+        with self._lock:
+            covered = self._conn.execute(
+                "SELECT start, end FROM ranges WHERE key = ? AND start <= ? AND end >= ?"
+                " ORDER BY start",
+                (key, end, start),
+            ).fetchall()
+        gaps = []
+        cursor = start
+        for range_start, range_end in covered:
+            if range_start > cursor:
+                gaps.append((cursor, range_start - 1))
+            cursor = max(cursor, range_end + 1)
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def load(self, key: str, start: int, end: int) -> list["Log"]:
+        """The cached logs from `start` to `end`, in order"""
+        from eth_rpc.models import Log
+
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT log FROM logs WHERE key = ? AND block_number BETWEEN ? AND ?"
+                " ORDER BY block_number, log_index",
+                (key, start, end),
+            ).fetchall()
+            self._conn.execute(
+                "UPDATE filters SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return [Log.model_validate_json(row[0]) for row in rows]
+
+    def store(self, key: str, start: int, end: int, logs: list["Log"]) -> None:
+        """Keep the logs of a fully fetched range, and mark it as fetched"""
+        rows = [
+            (key, log.block_number, log.log_index, log.model_dump_json(by_alias=True))
+            for log in logs
+            if start <= log.block_number <= end
+        ]
+        with self._lock, self._conn:
+            added = 0
+            for row in rows:
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO logs (key, block_number, log_index, log)"
+                    " VALUES (?, ?, ?, ?)",
+                    row,
+                ).rowcount
+                if inserted:
+                    added += len(row[3])
+            self._cover(key, start, end)
+            self._conn.execute(
+                "INSERT INTO filters (key, bytes, accessed) VALUES (?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET"
+                " bytes = bytes + excluded.bytes, accessed = excluded.accessed",
+                (key, added, time.time()),
+            )
+            self._evict()
+
+    def _cover(self, key: str, start: int, end: int) -> None:
+        # merge with the ranges this overlaps or touches
+        overlapping = self._conn.execute(
+            "SELECT start, end FROM ranges WHERE key = ? AND start <= ? AND end >= ?",
+            (key, end + 1, start - 1),
+        ).fetchall()
+        for range_start, range_end in overlapping:
+            start = min(start, range_start)
+            end = max(end, range_end)
+        self._conn.execute(
+            "DELETE FROM ranges WHERE key = ? AND start BETWEEN ? AND ?",
+            (key, start, end),
+        )
+        self._conn.execute(
+            "INSERT INTO ranges (key, start, end) VALUES (?, ?, ?)", (key, start, end)
+        )
+
+    def size(self) -> int:
+        """The bytes of logs in the cache"""
+        with self._lock:
+            return self._size()
+
+    def _size(self) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(bytes), 0) FROM filters"
+        ).fetchone()[0]
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+        total = self._size()
+        filters = self._conn.execute(
+            "SELECT key, bytes FROM filters ORDER BY accessed"
+        ).fetchall()
+        for key, size in filters:
+            if total <= self.max_bytes:
+                break
+            self._delete(key)
+            total -= size
+
+    def _delete(self, key: str) -> None:
+        for table in ("logs", "ranges", "filters"):
+            self._conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+
+    def clear(self, key: Optional[str] = None) -> None:
+        """Remove a filter's logs, or every filter's"""
+        with self._lock, self._conn:
+            if key is not None:
+                self._delete(key)
+            else:
+                for table in ("logs", "ranges", "filters"):
+                    self._conn.execute(f"DELETE FROM {table}")
+
+    def compact(self) -> None:
+        """
+        Evict down to `max_bytes`, and give the space of evicted and cleared
+        logs back to the filesystem
+        """
+        with self._lock:
+            with self._conn:
+                self._evict()
+            self._conn.execute("VACUUM")
+
+    async def get_logs(
+        self,
+        key: str,
+        start: int,
+        end: int,
+        fetch: Callable[[int, int], AsyncIterator["Log"]],
+        finalized: Callable[[], Awaitable[int]],
+    ) -> AsyncIterator["Log"]:
+        """
+        The logs from `start` to `end` in order, read from the cache where
+        the range has been fetched, and from `fetch` for the gaps.  The
+        finalized part of each gap is cached once it has been fetched whole.
+        If the finalized block can't be read, the logs are fetched but not
+        cached.
+        """
+        cursor = start
+        last_finalized: Optional[int] = None
+        for gap_start, gap_end in self.gaps(key, start, end):
+            if cursor < gap_start:
+                for log in self.load(key, cursor, gap_start - 1):
+                    yield log
+            if last_finalized is None:
+                try:
+                    last_finalized = await finalized()
+                except Exception:
+                    # ie. the node does not support the finalized tag, so
+                    # nothing is known to be final and nothing is stored
+                    last_finalized = -1
+            fetched = []
+            async for log in fetch(gap_start, gap_end):
+                if log.block_number <= last_finalized:
+                    fetched.append(log)
+                yield log
+            if gap_start <= last_finalized:
+                self.store(key, gap_start, min(gap_end, last_finalized), fetched)
+            cursor = gap_end + 1
+        if cursor <= end:
+            for log in self.load(key, cursor, end):
+                yield log
+
+
+_log_cache = LogCache()
+
+
+def set_log_cache(
+    cache: LogCache | str | Path, max_bytes: Optional[int] = None
+) -> None:
+    """Cache logs in this cache, or in a sqlite database at this path"""
+    global _log_cache
+    if not isinstance(cache, LogCache):
+        cache = LogCache(cache, max_bytes=max_bytes)
+    _log_cache = cache
+
+
+def get_log_cache() -> LogCache:
+    return _log_cache
+
+
+def log_cache(cache: "bool | LogCache") -> Optional[LogCache]:
+    """The cache for a read's `cache` option, if it is cached"""
+    if isinstance(cache, LogCache):
+        return cache
+    return get_log_cache() if cache else None
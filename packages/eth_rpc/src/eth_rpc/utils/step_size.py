@@ -0,0 +1,260 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence, TypeVar
+
+if TYPE_CHECKING:
+    from eth_rpc.models import Log
+
+T = TypeVar("T")
+
+# logs per window, under the 10k log cap most providers have
+TARGET_LOGS = 2_000
+TARGET_BYTES = 4_000_000
+# the first window, when nothing has been learned about the logs yet
+DEFAULT_STEP = 500
+# a window can grow by at most this factor
+GROWTH = 2.0
+# weight of the latest window in the density estimate
+ALPHA = 0.3
+# a window this many times more or less dense resets the estimate
+RESET_RATIO = 4.0
+
+
+def log_size(log: "Log") -> int:
+    """Roughly how many bytes a log takes in an eth_getLogs response"""
+    return 320 + len(log.data) + 70 * len(log.topics)
+
+
+class DensityStore:
+    """
+    The log density learned for each (chain id, addresses, topic0) filter,
+    so a backfill starts with the window size the last one ended with.  With
+    a `path`, densities are loaded from that JSON file, and saved to it at
+    most every `flush_interval` seconds and at exit, see `flush`.
+
+    Each filter has its logs per block (`density`), bytes per log (`size`)
+    and the most logs to ask for in one response (`logs`).
+    """
+
+    def __init__(self, path: Optional[str | Path] = None, flush_interval: float = 5.0):
+        self.path = Path(path).expanduser() if path is not None else None
+        self.flush_interval = flush_interval
+        self._densities: dict[str, dict[str, Optional[float]]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flushed = time.monotonic()
+        if self.path is not None:
+            if self.path.exists():
+                self._densities = json.loads(self.path.read_text())
+            atexit.register(self.flush)
+
+    @staticmethod
+    def key(
+        chain_id: int,
+        addresses: Optional[Sequence[str]] = None,
+        topic0: Optional[str | list[str]] = None,
+    ) -> str:
+        if isinstance(topic0, list):
+            topic0 = ",".join(sorted(topic0))
+        address_key = ",".join(sorted(a.lower() for a in addresses or [])) or "*"
+        return f"{chain_id}:{address_key}:{topic0 or '*'}"
+
+    def get(self, key: str) -> Optional[dict[str, Optional[float]]]:
+        return self._densities.get(key)
+
+    def set(self, key: str, learned: dict[str, Optional[float]]) -> None:
+        with self._lock:
+            self._densities[key] = learned
+            self._dirty = self.path is not None
+        if time.monotonic() - self._flushed >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the densities learned since the last write to the file"""
+        with self._lock:
+            if not self._dirty or self.path is None:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._densities))
+            os.replace(tmp, self.path)
+            self._dirty = False
+            self._flushed = time.monotonic()
+
+
+_density_store = DensityStore()
+
+
+def set_density_store(store: DensityStore | str | Path) -> None:
+    """Keep learned log densities in this store, or in a JSON file at this path"""
+    global _density_store
+    if not isinstance(store, DensityStore):
+        store = DensityStore(store)
+    _density_store = store
+
+
+def get_density_store() -> DensityStore:
+    return _density_store
+
+
+class StepSizeController:
+    """
+    Sizes the block range of each eth_getLogs window from the windows before
+    it, aiming for `target_logs` logs and `target_bytes` bytes per response.
+
+    The log density is a moving average, reset when a window is much more or
+    less dense than expected.  A window grows at most 2x at a time.  It is
+    halved when a response is slower than `target_latency`.  When a response
+    is too large, it is cut to the node's recommended range, and the target is
+    lowered under the node's cap.
+
+    With a `key`, the density is loaded from and saved to the density store,
+    see `set_density_store`.  Without a learned density, the first window
+    covers all `blocks` blocks to fetch, and shrinks when the node returns
+    too many results.  Without `blocks`, it is 500 blocks.
+
+    ```python
+    controller = StepSizeController(key=DensityStore.key(1, [usdc], topic0))
+    end = start + controller.step - 1
+    ...
+    controller.observe(end - start + 1, len(logs), latency=latency)
+    ```
+    """
+
+    def __init__(
+        self,
+        step_size: Optional[int] = None,
+        min_step: int = 1,
+        max_step: int = 100_000,
+        target_logs: int = TARGET_LOGS,
+        target_bytes: int = TARGET_BYTES,
+        target_latency: float = 5.0,
+        key: Optional[str] = None,
+        store: Optional[DensityStore] = None,
+        blocks: Optional[int] = None,
+    ):
+        self.min_step = min_step
+        self.max_step = max_step
+        self.target_logs = target_logs
+        self.target_bytes = target_bytes
+        self.target_latency = target_latency
+        self.key = key
+        self.store = store if store is not None else get_density_store()
+        # logs per block, and bytes per log
+        self.density: Optional[float] = None
+        self.size: Optional[float] = None
+        if key is not None and (learned := self.store.get(key)) is not None:
+            self.density = learned.get("density")
+            self.size = learned.get("size")
+            if learned.get("logs"):
+                self.target_logs = min(target_logs, int(learned["logs"]))  # type: ignore[arg-type]
+
+        if step_size is not None:
+            self.step = self._clamp(step_size)
+        elif self.density is not None:
+            self.step = self._clamp(self._target())
+        elif blocks is not None:
+            self.step = max(self.min_step, blocks)
+        else:
+            self.step = self._clamp(DEFAULT_STEP)
+
+    def _clamp(self, step: float) -> int:
+        return max(self.min_step, min(self.max_step, int(step)))
+
+    def _target(self) -> float:
+        """The window that should hold the target logs and bytes"""
+        if not self.density:
+            return self.max_step
+        step = self.target_logs / self.density
+        if self.size:
+            step = min(step, self.target_bytes / (self.density * self.size))
+        return step
+
+    def observe(
+        self,
+        blocks: int,
+        logs: int,
+        size: Optional[int] = None,
+        latency: Optional[float] = None,
+    ) -> None:
+        """Learn from a window of `blocks` blocks that returned `logs` logs"""
+        density = logs / max(blocks, 1)
+        if self.density is None or not (
+            self.density / RESET_RATIO <= density <= self.density * RESET_RATIO
+        ):
+            self.density = density
+        else:
+            self.density += ALPHA * (density - self.density)
+        if size is not None and logs:
+            per_log = size / logs
+            self.size = (
+                per_log
+                if self.size is None
+                else self.size + ALPHA * (per_log - self.size)
+            )
+
+        step = min(self._target(), self.step * GROWTH)
+        if latency is not None and latency > self.target_latency:
+            step = min(step, self.step / 2)
+        self.step = self._clamp(step)
+        self._save()
+
+    def exceeded(self, blocks: int, recommended: Optional[int] = None) -> None:
+        """
+        A window of `blocks` blocks was too large for the node, which may
+        recommend a number of blocks that fits
+        """
+        if recommended is None or not 0 < recommended < blocks:
+            recommended = blocks // 2
+        if self.density:
+            # the node caps responses below the target, so aim under its cap
+            self.target_logs = max(
+                1, min(self.target_logs, int(self.density * recommended * 0.8))
+            )
+        self.step = self._clamp(min(self.step, recommended))
+        self._save()
+
+    def _save(self) -> None:
+        if self.key is not None and self.density is not None:
+            self.store.set(
+                self.key,
+                {"density": self.density, "size": self.size, "logs": self.target_logs},
+            )
+
+    async def window(
+        self, blocks: int, items: AsyncIterator[T], size: Callable[[T], int]
+    ) -> AsyncIterator[T]:
+        """
+        Yield the logs of a window of `blocks` blocks, then observe it.  The
+        time spent by the consumer between logs doesn't count as latency.
+        """
+        logs = total = 0
+        paused = 0.0
+        started = time.monotonic()
+        async for item in items:
+            logs += 1
+            total += size(item)
+            yielded = time.monotonic()
+            yield item
+            paused += time.monotonic() - yielded
+        self.observe(blocks, logs, total, time.monotonic() - started - paused)
+
+    def window_sync(
+        self, blocks: int, items: Iterator[T], size: Callable[[T], int]
+    ) -> Iterator[T]:
+        """`window`, for a sync iterator"""
+        logs = total = 0
+        paused = 0.0
+        started = time.monotonic()
+        for item in items:
+            logs += 1
+            total += size(item)
+            yielded = time.monotonic()
+            yield item
+            paused += time.monotonic() - yielded
+        self.observe(blocks, logs, total, time.monotonic() - started - paused)
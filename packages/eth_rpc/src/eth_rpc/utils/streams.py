@@ -1,9 +1,15 @@
-from collections.abc import AsyncIterator, Iterator
-from typing import TYPE_CHECKING
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import TYPE_CHECKING, Optional, TypeVar
+
+from eth_rpc.exceptions import LogResponseExceededError
 
 if TYPE_CHECKING:
     from eth_rpc.models import EventData
 
+T = TypeVar("T")
+
 
 def sort_key(row: "EventData"):
     return (row.tx.block_number, row.tx.transaction_index, row.tx.log_index)
@@ -59,3 +65,71 @@ def ordered_iterator(events: list["EventData"]) -> Iterator["EventData"]:
         key=lambda x: (x.tx.block_number, x.tx.transaction_index, x.tx.log_index),
     ):
         yield event
+
+
+async def _fetch_range(
+    fetch: Callable[[int, int], Awaitable[list[T]]], start: int, end: int
+) -> list[T]:
+    try:
+        return await fetch(start, end)
+    except LogResponseExceededError as err:
+        if start >= end:
+            raise
+        split = err.recommended_end
+        if not start <= split < end:
+            split = (start + end) // 2
+    return await _fetch_range(fetch, start, split) + await _fetch_range(
+        fetch, split + 1, end
+    )
+
+
+async def ordered_chunks(
+    fetch: Callable[[int, int], Awaitable[list[T]]],
+    start_block: int,
+    end_block: int,
+    step_size: int | Callable[[], int],
+    concurrency: int,
+    on_chunk: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> AsyncIterator[T]:
+    """
+    Fetch a block range in chunks of `step_size` blocks, up to `concurrency`
+    chunks at once, and yield each chunk's results in block order.  A callable
+    `step_size` is called for the size of each new chunk, ie. a
+    `StepSizeController`'s current step.
+
+    At most `concurrency` chunks are held at a time, so a slow chunk pauses
+    the fetches behind it instead of buffering the rest of the range.  A chunk
+    whose fetch raises `LogResponseExceededError` is split where the node
+    recommends, or else in half, and only that chunk's blocks are fetched
+    again.
+
+    `on_chunk` is called with a chunk's last block once all of its results
+    have been consumed, ie. to record a cursor.
+    """
+    tasks: deque[tuple[int, asyncio.Future[list[T]]]] = deque()
+    cursor = start_block
+
+    def fill() -> None:
+        nonlocal cursor
+        while len(tasks) < concurrency and cursor <= end_block:
+            step = step_size() if callable(step_size) else step_size
+            end = min(cursor + step - 1, end_block)
+            tasks.append((end, asyncio.ensure_future(_fetch_range(fetch, cursor, end))))
+            cursor = end + 1
+
+    try:
+        fill()
+        while tasks:
+            end, task = tasks[0]
+            results = await task
+            tasks.popleft()
+            # start the next fetch before handing these results over
+            fill()
+            for result in results:
+                yield result
+            if on_chunk is not None:
+                await on_chunk(end)
+    finally:
+        for _, task in tasks:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
@@ -0,0 +1,42 @@
+import json
+from typing import Annotated, Any, Callable
+
+import httpx
+import pytest
+from eth_rpc import Event
+from eth_rpc.networks import Ethereum
+from eth_rpc.rpc.core import RPC
+from eth_rpc.types import Indexed, primitives
+from pydantic import BaseModel
+
+
+class TransferEventType(BaseModel):
+    sender: Annotated[primitives.address, Indexed]
+    recipient: Annotated[primitives.address, Indexed]
+    amount: primitives.uint256
+
+
+@pytest.fixture
+def transfer_event() -> Event[TransferEventType]:
+    return Event[TransferEventType](name="Transfer")
+
+
+@pytest.fixture
+def mock_rpc() -> Callable[[Callable[[Any], Any]], RPC]:
+    """
+    Builds an RPC whose requests are answered by `handler`, called with the
+    JSON body of each request and returning the JSON body of the response
+    """
+
+    def make(handler: Callable[[Any], Any]) -> RPC:
+        def respond(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=handler(json.loads(request.content)))
+
+        transport = httpx.MockTransport(respond)
+        return RPC(
+            network=Ethereum,
+            client=httpx.AsyncClient(transport=transport),
+            sync_client=httpx.Client(transport=transport),
+        )
+
+    return make
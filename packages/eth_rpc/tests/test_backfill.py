@@ -0,0 +1,89 @@
+import asyncio
+import random
+import time
+
+import pytest
+from eth_rpc import EventSubscriber
+from eth_rpc._transport import _rpcs
+from eth_rpc.exceptions import LogResponseExceededError
+from eth_rpc.local_node import Faults, LocalChain, LocalNode, fixed
+from eth_rpc.utils import ordered_chunks
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ordered_chunks():
+    rng = random.Random(1)
+    fetched: list[tuple[int, int]] = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fetch(start: int, end: int) -> list[int]:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            await asyncio.sleep(rng.random() / 100)
+            # blocks 40-49 are too busy to fetch more than 2 at a time
+            if end - start >= 2 and start <= 49 and end >= 40:
+                raise LogResponseExceededError("too large", start, start + 1)
+            fetched.append((start, end))
+            return list(range(start, end + 1))
+        finally:
+            in_flight -= 1
+
+    results = [block async for block in ordered_chunks(fetch, 3, 100, 10, 4)]
+    assert results == list(range(3, 101))
+    assert max_in_flight <= 4
+    # only the busy chunks were split
+    assert (13, 22) in fetched and (53, 62) in fetched
+    assert all(end - start < 2 for start, end in fetched if 40 <= end <= 49)
+
+    # stopping early cancels the fetches in flight
+    chunks = ordered_chunks(fetch, 1, 1_000, 10, 4)
+    assert await anext(chunks) == 1
+    await chunks.aclose()
+    assert in_flight == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_backfill_concurrency(transfer_event):
+    chain = LocalChain.synthetic(blocks=100, logs=2, chain_id=31_341)
+    # every request takes 20ms, and only 12 logs fit in a response
+    faults = Faults(method_latency={"eth_getLogs": fixed(0.02)}, max_logs=12)
+    async with LocalNode(chain, faults) as node:
+        network = node.network()
+        try:
+            start = time.monotonic()
+            events = [
+                event
+                async for event in transfer_event[network].backfill(
+                    start_block=1, end_block=99, step_size=5, concurrency=8
+                )
+            ]
+            elapsed = time.monotonic() - start
+
+            subscriber = EventSubscriber(
+                events=[transfer_event], step_size=5, concurrency=8
+            )[network]
+            subscribed = [event async for event in subscriber(1, 99)]
+        finally:
+            _rpcs.pop(network.chain_id, None)
+
+    expected = [log for number in range(1, 100) for log in chain.logs[number]]
+    for result in (events, subscribed):
+        assert [
+            (event.log.block_number, event.log.transaction_index, event.log.log_index)
+            for event in result
+        ] == [
+            (
+                int(log["blockNumber"], 16),
+                int(log["transactionIndex"], 16),
+                int(log["logIndex"], 16),
+            )
+            for log in expected
+        ]
+    assert faults.logs_exceeded > 0
+    # one window at a time, 20 windows split in two take over 1.2s
+    assert elapsed < 0.8
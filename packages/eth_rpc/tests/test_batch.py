@@ -0,0 +1,169 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from eth_rpc.exceptions import RPCError
+from eth_rpc.networks import Ethereum
+from eth_rpc.rpc.core import RPC
+from eth_rpc.types import GetBlockByNumberArgs, HexInteger, NoArgs
+
+
+def node(payload):
+    if isinstance(payload, list):
+        # respond out of order to make sure results are mapped by id
+        return [node(elem) for elem in reversed(payload)]
+    if payload["method"] == "eth_blockNumber":
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x10"}
+    if payload["method"] == "eth_chainId":
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x1"}
+    return {
+        "jsonrpc": "2.0",
+        "id": payload["id"],
+        "error": {"code": -32601, "message": "method not found"},
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_context(mock_rpc):
+    requests = []
+
+    def handler(payload):
+        requests.append(payload)
+        return node(payload)
+
+    rpc = mock_rpc(handler)
+    async with rpc.batch() as batch:
+        number = batch.add(rpc.block_number)
+        chain_id = batch.add(rpc.chain_id)
+        block = batch.add(
+            rpc.get_block_by_number,
+            GetBlockByNumberArgs(block_number=HexInteger(1)),
+        )
+
+    assert len(requests) == 1
+    assert len(requests[0]) == 3
+    assert number.result == 16
+    assert chain_id.result == 1
+    assert not block.ok
+    assert isinstance(block.error, RPCError)
+    assert block.error.code == -32601
+    with pytest.raises(RPCError, match="method not found"):
+        block.result
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_many_splits_batches(mock_rpc):
+    sizes = []
+
+    def handler(payload):
+        sizes.append(len(payload))
+        return node(payload)
+
+    rpc = mock_rpc(handler)
+    rpc.set_max_batch_size(4)
+    items = await rpc.block_number.many([NoArgs(())] * 10)
+
+    assert sizes == [4, 4, 2]
+    assert [item.result for item in items] == [16] * 10
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_rejected(mock_rpc):
+    def handler(payload):
+        return {"jsonrpc": "2.0", "id": None, "error": {"message": "batch disabled"}}
+
+    rpc = mock_rpc(handler)
+    async with rpc.batch() as batch:
+        items = [batch.add(rpc.block_number) for _ in range(3)]
+
+    assert all(isinstance(item.error, RPCError) for item in items)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_auto_batching(mock_rpc):
+    requests = []
+
+    def handler(payload):
+        requests.append(payload)
+        return node(payload)
+
+    rpc = mock_rpc(handler)
+    rpc.enable_auto_batching(max_batch_size=8)
+    results = await asyncio.gather(*[rpc.block_number() for _ in range(20)])
+
+    assert results == [16] * 20
+    assert [len(request) for request in requests] == [8, 8, 4]
+
+    # a lone call is sent as a plain request
+    assert await rpc.chain_id() == 1
+    assert requests[-1]["method"] == "eth_chainId"
+
+    with pytest.raises(RPCError):
+        await rpc.get_block_by_number(GetBlockByNumberArgs(block_number=HexInteger(1)))
+
+    rpc.disable_auto_batching()
+    await asyncio.gather(rpc.block_number(), rpc.chain_id())
+    assert isinstance(requests[-1], dict)
+
+
+@pytest.mark.unit
+def test_batch_sync(mock_rpc):
+    requests = []
+
+    def handler(payload):
+        requests.append(payload)
+        return node(payload)
+
+    rpc = mock_rpc(handler)
+    with rpc.batch() as batch:
+        number = batch.add(rpc.block_number)
+        chain_id = batch.add(rpc.chain_id)
+
+    assert len(requests) == 1
+    assert number.result == 16
+    assert chain_id.result == 1
+    assert [item.result for item in rpc.chain_id.many_sync([NoArgs(())] * 3)] == [1] * 3
+    assert rpc.block_number.sync() == 16
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_single_flight():
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        requests.append(payload)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=node(payload))
+
+    rpc = RPC(
+        network=Ethereum,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    flight = rpc.enable_single_flight()
+    results = await asyncio.gather(
+        *[rpc.block_number() for _ in range(10)], rpc.chain_id(), rpc.chain_id()
+    )
+    assert results == [16] * 10 + [1, 1]
+    assert [request["method"] for request in requests] == [
+        "eth_blockNumber",
+        "eth_chainId",
+    ]
+    assert flight.shared == 10
+
+    # once the request has finished, the next call sends a new one
+    assert await rpc.block_number() == 16
+    assert len(requests) == 3
+
+    # a cancelled caller does not cancel the shared request
+    first = asyncio.ensure_future(rpc.block_number())
+    second = asyncio.ensure_future(rpc.block_number())
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == 16
@@ -0,0 +1,102 @@
+import json
+
+import httpx
+import pytest
+from eth_rpc.constants import ADDRESS_ZERO
+from eth_rpc.networks import Ethereum
+from eth_rpc.rpc import ResponseCache
+from eth_rpc.rpc.cache import LRUCache
+from eth_rpc.rpc.core import RPC
+from eth_rpc.types import EthCallArgs, EthCallParams, GetCodeArgs
+
+FINALIZED = 100
+
+
+def cached_rpc(cache: ResponseCache) -> tuple[RPC, list[dict]]:
+    requests: list[dict] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        requests.append(payload)
+        if payload["method"] == "eth_getBlockByNumber":
+            result: object = {"number": hex(FINALIZED)}
+        else:
+            result = "0x1234"
+        return httpx.Response(
+            200, json={"jsonrpc": "2.0", "id": payload["id"], "result": result}
+        )
+
+    rpc = RPC(
+        network=Ethereum,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(respond)),
+        sync_client=httpx.Client(transport=httpx.MockTransport(respond)),
+    )
+    rpc.set_response_cache(cache)
+    return rpc, requests
+
+
+def call_at(block_number) -> EthCallArgs:
+    return EthCallArgs(params=EthCallParams(to=ADDRESS_ZERO), block_number=block_number)
+
+
+def methods(requests: list[dict]) -> list[str]:
+    return [request["method"] for request in requests]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cache_finalized():
+    rpc, requests = cached_rpc(ResponseCache())
+
+    for _ in range(3):
+        assert await rpc.eth_call(call_at(10)) == "0x1234"
+    # the finalized block is looked up once, then the result is served from memory
+    assert methods(requests) == ["eth_call", "eth_getBlockByNumber"]
+    assert rpc.response_cache.finalized == FINALIZED
+    assert rpc.response_cache.hits == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cache_skips_unfinalized():
+    rpc, requests = cached_rpc(ResponseCache(finalized_ttl=60))
+
+    for _ in range(2):
+        await rpc.eth_call(call_at("latest"))
+    assert methods(requests) == ["eth_call", "eth_call"]
+
+    for _ in range(2):
+        await rpc.eth_call(call_at(FINALIZED + 1))
+    assert methods(requests[2:]) == ["eth_call", "eth_getBlockByNumber", "eth_call"]
+
+    # a block hash always pins the result
+    code = GetCodeArgs(address=ADDRESS_ZERO, block_hash="0x" + "ab" * 32)
+    assert rpc.get_code.sync(code) == "0x1234"
+    assert rpc.get_code.sync(code) == "0x1234"
+    assert methods(requests[5:]) == ["eth_getCode"]
+
+
+@pytest.mark.unit
+def test_cache_disk(tmp_path):
+    path = str(tmp_path / "cache.db")
+    rpc, requests = cached_rpc(ResponseCache(path=path))
+    rpc.eth_call.sync(call_at(10))
+
+    rpc, requests = cached_rpc(ResponseCache(path=path))
+    assert rpc.eth_call.sync(call_at(10)) == "0x1234"
+    assert requests == []
+
+
+@pytest.mark.unit
+def test_lru_bounds():
+    cache = LRUCache(max_entries=3, max_bytes=10)
+    for key in "abc":
+        cache.set(key, b"123")
+    cache.get("a")
+    cache.set("d", b"123")
+    # "b" is the least recently used, and the byte bound keeps three entries
+    assert cache.get("b") is None
+    assert cache.size == 9
+    cache.set("e", b"12345")
+    assert len(cache) == 2
+    assert cache.size == 8
@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+import pytest
+from eth_rpc import EventSubscriber
+from eth_rpc._transport import _force_get_global_rpc, _rpcs
+from eth_rpc.exceptions import CassetteMissError
+from eth_rpc.local_node import LocalChain, LocalNode
+from eth_rpc.networks import Ethereum
+from eth_rpc.rpc import Cassette
+from eth_rpc.rpc.core import RPC
+from eth_rpc.types import HexInteger, NoArgs
+from websockets.asyncio.server import serve
+
+
+def node(block_numbers: list[str]):
+    def respond(payload):
+        if isinstance(payload, list):
+            return [
+                {"jsonrpc": "2.0", "id": elem["id"], "result": "0x1"}
+                for elem in reversed(payload)
+            ]
+        if payload["method"] == "eth_blockNumber":
+            return {
+                "jsonrpc": "2.0",
+                "id": payload["id"],
+                "result": block_numbers.pop(0),
+            }
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x1"}
+
+    return respond
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+def offline(payload):
+    raise AssertionError("replay sent a request")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cassette_record_replay(tmp_path, mock_rpc):
+    path = str(tmp_path / "calls.jsonl.gz")
+
+    rpc = mock_rpc(node(["0x10", "0x11"]))
+    with Cassette(path, mode="record") as cassette:
+        rpc.set_cassette(cassette)
+        assert await rpc.block_number() == 16
+        assert rpc.block_number.sync() == 17
+        assert await rpc.chain_id.many([NoArgs(()), NoArgs(())]) is not None
+    assert cassette.recorded == 3
+
+    rpc = mock_rpc(offline)
+    cassette = Cassette(path, latency_scale=0.0)
+    rpc.set_cassette(cassette)
+    assert await rpc.block_number() == 16
+    assert await rpc.block_number() == 17
+    # called more often than recorded, the last response repeats
+    assert rpc.block_number.sync() == 17
+    items = await rpc.chain_id.many([NoArgs(()), NoArgs(())])
+    assert [item.result for item in items] == [HexInteger(1), HexInteger(1)]
+    assert cassette.replayed == 4
+
+    with pytest.raises(CassetteMissError):
+        await rpc.max_priority_fee_per_gas()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cassette_subscription(tmp_path):
+    path = str(tmp_path / "subscription.jsonl")
+    subscribe = {"id": 1, "method": "eth_subscribe", "params": ["newHeads"]}
+
+    async def node(ws):
+        await ws.recv()
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "result": "0xabc"}))
+        for i in range(3):
+            await ws.send(json.dumps({"params": {"result": {"number": hex(i)}}}))
+        await ws.close()
+
+    async def listen(rpc: RPC, url: str) -> list[str]:
+        messages = []
+        async for ws in rpc.ws_connect(url):
+            await ws.send(json.dumps(subscribe))
+            messages.append(await ws.recv())
+            for _ in range(3):
+                messages.append(await ws.recv())
+            break
+        return messages
+
+    async with serve(node, "127.0.0.1", 0) as server:
+        url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        rpc = RPC(network=Ethereum)
+        with Cassette(path, mode="record") as cassette:
+            rpc.set_cassette(cassette)
+            recorded = await listen(rpc, url)
+
+    rpc.set_cassette(Cassette(path))
+    replayed = []
+    async for ws in rpc.ws_connect(url):
+        await ws.send(json.dumps({**subscribe, "id": 2}))
+        while True:
+            try:
+                replayed.append(await ws.recv())
+            except Exception:
+                break
+    # the replayed session ends like a closed connection, and isn't reconnected
+    assert replayed == recorded
+    assert json.loads(replayed[-1])["params"]["result"]["number"] == "0x2"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cassette_event_subscriber(tmp_path, transfer_event):
+    path = str(tmp_path / "events.jsonl")
+    chain = LocalChain.synthetic(blocks=2, transactions=2, chain_id=31_346)
+
+    async with LocalNode(chain) as node:
+        network = node.network()
+        rpc = _force_get_global_rpc(network)
+        subscriber = EventSubscriber[network](events=[transfer_event])
+        try:
+            with Cassette(path, mode="record") as cassette:
+                rpc.set_cassette(cassette)
+                listener = subscriber._listen()
+                first = asyncio.ensure_future(anext(listener))
+                while not any(s.subscriptions for s in node._subscribers):
+                    await asyncio.sleep(0.01)
+                await node.mine()
+                logs = chain.logs[2]
+                recorded = [await first]
+                recorded += [await anext(listener) for _ in logs[1:]]
+                await listener.aclose()
+
+            # replayed without the node, and ends where the recording ended
+            rpc.set_cassette(Cassette(path))
+            await node.stop()
+            replayed = await asyncio.wait_for(_collect(subscriber._listen()), timeout=5)
+        finally:
+            _rpcs.pop(network.chain_id, None)
+
+    assert [event.log.transaction_hash for event in replayed] == [
+        log["transactionHash"] for log in logs
+    ]
+    assert [event.event for event in replayed] == [event.event for event in recorded]
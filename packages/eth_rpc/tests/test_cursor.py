@@ -0,0 +1,131 @@
+import threading
+
+import pytest
+from eth_rpc import EventSubscriber
+from eth_rpc._transport import _rpcs
+from eth_rpc.local_node import LocalChain, LocalNode
+from eth_rpc.utils import (
+    CursorStore,
+    FileCursorStore,
+    MemoryCursorStore,
+    SqliteCursorStore,
+)
+
+
+def _blocks(events) -> list[int]:
+    return [event.log.block_number for event in events]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cursor_stores(tmp_path):
+    key = CursorStore.key(1, ["0xddf2", None], ["0xAB", "0x12"])
+    assert key == CursorStore.key(1, ["0xddf2", None], ["0x12", "0xab"])
+    assert key != CursorStore.key(1, ["0xddf2", "0x01"], ["0x12", "0xab"])
+    assert key != CursorStore.key(8453, ["0xddf2", None], ["0x12", "0xab"])
+
+    for path, store_type in (
+        (tmp_path / "cursors.json", FileCursorStore),
+        (tmp_path / "cursors.db", SqliteCursorStore),
+    ):
+        store = store_type(path)
+        assert await store.load(key) is None
+        await store.save(key, 10)
+        await store.save(key, 20)
+        # a new store sees the cursors saved by the last one
+        assert await store_type(path).load(key) == 20
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cursor_stores_off_loop(tmp_path):
+    loop_thread = threading.get_ident()
+    threads = []
+
+    class TracedStore(FileCursorStore):
+        def _read(self):
+            threads.append(threading.get_ident())
+            return super()._read()
+
+    store = TracedStore(tmp_path / "cursors.json")
+    await store.save("key", 1)
+    assert await store.load("key") == 1
+    assert threads and loop_thread not in threads
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_backfill_resume(transfer_event):
+    chain = LocalChain.synthetic(blocks=60, logs=2, chain_id=31_343)
+    async with LocalNode(chain) as node:
+        network = node.network()
+        try:
+            store = MemoryCursorStore()
+            event = transfer_event[network]
+            # stop partway through the third window
+            first = []
+            async for event_data in event.backfill(
+                start_block=1, end_block=59, step_size=9, resume=store
+            ):
+                first.append(event_data)
+                if event_data.log.block_number == 25:
+                    break
+            resumed = [
+                event_data
+                async for event_data in event.backfill(
+                    start_block=1, end_block=59, step_size=9, resume=store
+                )
+            ]
+
+            concurrent_store = MemoryCursorStore()
+            concurrent = []
+            async for event_data in event.backfill(
+                start_block=1,
+                end_block=59,
+                step_size=10,
+                concurrency=4,
+                resume=concurrent_store,
+            ):
+                concurrent.append(event_data)
+                if event_data.log.block_number == 35:
+                    break
+            concurrent_resumed = [
+                event_data
+                async for event_data in event.backfill(
+                    start_block=1,
+                    end_block=59,
+                    step_size=10,
+                    concurrency=4,
+                    resume=concurrent_store,
+                )
+            ]
+
+            subscriber_store = MemoryCursorStore()
+            subscriber = EventSubscriber(
+                events=[transfer_event], step_size=10, resume=subscriber_store
+            )[network]
+            subscribed = []
+            async for event_data in subscriber(1, 59):
+                subscribed.append(event_data)
+                if event_data.log.block_number == 15:
+                    break
+            subscriber_resumed = [event_data async for event_data in subscriber(1, 59)]
+            finished = [event_data async for event_data in subscriber(1, 59)]
+        finally:
+            _rpcs.pop(network.chain_id, None)
+
+    def expected(start: int) -> list[int]:
+        return [number for number in range(start, 60) for _ in chain.logs[number]]
+
+    # windows are 1-10, 11-19, 20-28, ... and only the first two were fully
+    # emitted, so the third is emitted again and nothing before it
+    assert _blocks(first)[-1] == 25
+    assert _blocks(resumed) == expected(20)
+    assert await store.load(transfer_event[network]._cursor_key()) == 59
+
+    assert _blocks(concurrent)[-1] == 35
+    assert _blocks(concurrent_resumed) == expected(31)
+
+    assert _blocks(subscribed)[-1] == 15
+    assert _blocks(subscriber_resumed) == expected(11)
+    assert finished == []
@@ -0,0 +1,42 @@
+import pytest
+from eth_rpc.models import Block, Log
+from eth_rpc.networks import Ethereum
+from eth_rpc.rpc.decode import decode_result, output_plan, result_adapter
+from eth_rpc.types import HexInteger
+from pydantic import ValidationError
+
+LOG = {
+    "transactionHash": "0x" + "ab" * 32,
+    "address": "0x" + "11" * 20,
+    "blockHash": "0x" + "cd" * 32,
+    "blockNumber": "0x10",
+    "data": "0x",
+    "logIndex": "0x1",
+    "removed": False,
+    "topics": ["0x" + "ee" * 32],
+    "transactionIndex": "0x2",
+}
+
+
+@pytest.mark.unit
+def test_decode_trusted():
+    validated = decode_result(list[Log], [LOG], Ethereum)
+    trusted = decode_result(list[Log], [LOG], Ethereum, trusted=True)
+    assert trusted == validated
+    assert trusted[0].block_number == 16
+    assert trusted[0].model_dump(by_alias=True) == validated[0].model_dump(
+        by_alias=True
+    )
+
+    assert decode_result(HexInteger, "0x10", trusted=True) == 16
+    assert result_adapter(list[Log]) is result_adapter(list[Log])
+
+
+@pytest.mark.unit
+def test_decode_trusted_fallback():
+    # fields with validators can't be built without validation
+    assert output_plan(Block) is None
+
+    # results that don't match the model are validated, which raises
+    with pytest.raises(ValidationError):
+        decode_result(list[Log], [{"blockNumber": "0x1"}], trusted=True)
@@ -4,6 +4,9 @@ from typing import Annotated
 import pytest
 from eth_abi import encode
 from eth_rpc import Event, set_alchemy_key
+from eth_rpc.exceptions import LogDecodeError
+from eth_rpc.local_node import LocalChain
+from eth_rpc.models import Log
 from eth_rpc.networks import Arbitrum, Ethereum
 from eth_rpc.types import Indexed, Name, Struct, primitives
 from pydantic import BaseModel
@@ -119,3 +122,148 @@ def test_parse_event_with_list_of_lists():
         ]
     ]
     assert event.class_name == "Math"
+
+
+class SwapEventType(BaseModel):
+    pool: Annotated[primitives.address, Indexed]
+    tick: Annotated[primitives.int24, Indexed]
+    exact: Annotated[primitives.bool, Indexed]
+    amounts: list[primitives.int256]
+    students: tuple[StudentType, primitives.uint8]
+
+
+SwapEvent = Event[SwapEventType](name="Swap")
+
+
+@pytest.mark.unit
+@pytest.mark.event
+def test_event_decoder_plan():
+    plan = SwapEvent.plan
+    assert plan.topics == 4
+    assert plan.types == ("int256[]", "((string,uint256),uint8)")
+    assert plan.topic0 == SwapEvent.get_topic0
+    # the plan is built once per event type and shared by copies
+    assert SwapEvent[Ethereum].plan is plan
+    assert Event[SwapEventType](name="Swap").plan is plan
+    assert Event[SwapEventType](name="Swap2").plan is not plan
+
+    topics = [
+        plan.topic0,
+        "0x" + "0" * 24 + "ab" * 20,
+        "0x" + "f" * 62 + "9c",
+        "0x" + "0" * 63 + "1",
+    ]
+    data = encode(
+        ["int256[]", "((string,uint256),uint8)"], [[-1, 2], (("Alice", 20), 3)]
+    ).hex()
+    event = SwapEvent.process(topics, data)
+    assert event.pool == "0x" + "ab" * 20
+    assert event.tick == -100
+    assert event.exact is True
+    assert event.amounts == [-1, 2]
+    assert event.students == (StudentType(name="Alice", age=20), 3)
+
+    log = Log(
+        transaction_hash="0x" + "00" * 32,
+        address="0x" + "ab" * 20,
+        block_hash="0x" + "00" * 32,
+        block_number=1,
+        data=data,
+        log_index=0,
+        removed=False,
+        topics=topics,
+        transaction_index=0,
+    )
+    assert SwapEvent.match(log)
+    # same topic0 with a different number of indexed fields still matches,
+    # the topics given are checked against the filters, but it doesn't decode
+    short = log.model_copy(update={"topics": topics[:3]})
+    assert SwapEvent.match(short)
+    assert SwapEvent.set_filter(topic1=topics[1]).match(short)
+    assert not SwapEvent.set_filter(topic1="0x" + "0" * 64).match(short)
+    with pytest.raises(LogDecodeError):
+        SwapEvent.process_log(short)
+    assert not TransferEvent.match(log)
+
+    with pytest.raises(LogDecodeError):
+        SwapEvent.process(topics[:2], data)
+    with pytest.raises(LogDecodeError):
+        SwapEvent.process(topics, data[:64])
+
+
+@pytest.mark.unit
+@pytest.mark.event
+def test_event_decode_batch():
+    chain = LocalChain.synthetic(blocks=20, transactions=5)
+    logs = [Log(**log) for number in range(1, 20) for log in chain.logs[number]]
+    events = [TransferEvent.process(log.topics, log.data) for log in logs]
+
+    columns = TransferEvent.decode_batch(logs)
+    assert list(columns) == ["sender", "recipient", "amount"]
+    assert columns["sender"] == [event.sender for event in events]
+    assert columns["recipient"] == [event.recipient for event in events]
+    assert columns["amount"] == [event.amount for event in events]
+
+    event_data = TransferEvent[Ethereum].decode_batch(logs, materialize=True)
+    assert [data.event for data in event_data] == events
+    assert event_data[0].log == logs[0] and event_data[0].network == Ethereum
+    assert TransferEvent.decode_batch([]) == {
+        "sender": [],
+        "recipient": [],
+        "amount": [],
+    }
+
+    # values that don't fit their type
+    bad_amount = logs[0].model_copy(update={"data": "0x" + "f" * 64})
+    assert TransferEvent.decode_batch([bad_amount])["amount"] == [2**256 - 1]
+    with pytest.raises(LogDecodeError):
+        TransferEvent.decode_batch([logs[0].model_copy(update={"data": "0x01"})])
+    with pytest.raises(LogDecodeError):
+        TransferEvent.decode_batch([logs[0].model_copy(update={"topics": []})])
+
+
+class SignedEventType(BaseModel):
+    tick: primitives.int24
+    ok: primitives.bool
+    selector: primitives.bytes4
+    owner: primitives.address
+
+
+SignedEvent = Event[SignedEventType](name="Signed")
+
+
+@pytest.mark.unit
+@pytest.mark.event
+def test_event_decode_batch_words():
+    types = ["int24", "bool", "bytes4", "address"]
+    rows = [
+        [-100, True, b"abcd", "0x" + "ab" * 20],
+        [2**23 - 1, False, b"\x00\x01\x02\x03", "0x" + "00" * 20],
+    ]
+    logs = [
+        Log(
+            transaction_hash="0x" + "00" * 32,
+            address="0x" + "ab" * 20,
+            block_hash="0x" + "00" * 32,
+            block_number=1,
+            data="0x" + encode(types, row).hex(),
+            log_index=i,
+            removed=False,
+            topics=[SignedEvent.get_topic0],
+            transaction_index=0,
+        )
+        for i, row in enumerate(rows)
+    ]
+    columns = SignedEvent.decode_batch(logs)
+    assert list(zip(*columns.values())) == [tuple(row) for row in rows]
+    assert [SignedEvent.process(log.topics, log.data) for log in logs] == [
+        SignedEventType(**dict(zip(columns, row))) for row in rows
+    ]
+
+    # padding must be empty, like eth_abi's strict decoding
+    for i, word in enumerate(["7" + "0" * 63, "0" * 63 + "2", "f" * 64, "f" * 64]):
+        data = logs[0].data[: 2 + 64 * i] + word + logs[0].data[66 + 64 * i :]
+        with pytest.raises(LogDecodeError):
+            SignedEvent.decode_batch([logs[0].model_copy(update={"data": data})])
+        with pytest.raises(LogDecodeError):
+            SignedEvent.process(logs[0].topics, data)
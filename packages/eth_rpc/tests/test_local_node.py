@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from eth_rpc._transport import _rpcs
+from eth_rpc.local_node import Faults, LocalChain, LocalNode, fixed
+from eth_rpc.local_node.chain import TRANSFER_TOPIC
+from eth_rpc.rpc.core import RPC
+from eth_rpc.types import GetBlockByNumberArgs, HexInteger
+from websockets.exceptions import ConnectionClosedError
+from websockets.legacy.client import connect
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_local_node_backfill(transfer_event):
+    chain = LocalChain.synthetic(blocks=200, chain_id=31_337)
+    # the node only returns 50 logs at a time, and rate limits 10% of requests
+    faults = Faults(max_logs=50, rate_limit_ratio=0.1, seed=1)
+    async with LocalNode(chain, faults) as node:
+        network = node.network()
+        try:
+            events = [
+                event
+                async for event in transfer_event[network].backfill(
+                    start_block=1, end_block=199
+                )
+            ]
+        finally:
+            _rpcs.pop(network.chain_id, None)
+
+    expected = [log for number in range(1, 200) for log in chain.logs[number]]
+    assert [event.log.transaction_hash for event in events] == [
+        log["transactionHash"] for log in expected
+    ]
+    assert faults.logs_exceeded > 0
+    assert faults.rate_limited > 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_local_node_subscriptions():
+    chain = LocalChain.synthetic(blocks=10, transactions=1)
+    async with LocalNode(chain, Faults(drop_ws_after=5)) as node:
+        async with connect(node.ws_url) as ws:
+            await ws.send(
+                json.dumps({"id": 1, "method": "eth_subscribe", "params": ["newHeads"]})
+            )
+            await ws.recv()
+            log_filter = {"topics": [TRANSFER_TOPIC]}
+            await ws.send(
+                json.dumps(
+                    {"id": 2, "method": "eth_subscribe", "params": ["logs", log_filter]}
+                )
+            )
+            await ws.recv()
+
+            await node.mine()
+            head = json.loads(await ws.recv())["params"]["result"]
+            log = json.loads(await ws.recv())["params"]["result"]
+            assert int(head["number"], 16) == 10
+            assert log["blockHash"] == head["hash"] and not log["removed"]
+
+            # the mined block is replaced, and its log removed
+            await node.reorg(1)
+            removed = json.loads(await ws.recv())["params"]["result"]
+            assert removed["removed"] and removed["blockHash"] == head["hash"]
+            new_head = json.loads(await ws.recv())["params"]["result"]
+            assert new_head["number"] == head["number"]
+            assert new_head["hash"] != head["hash"]
+
+            # the fifth message drops the connection
+            await ws.recv()
+            with pytest.raises(ConnectionClosedError):
+                await ws.recv()
+        assert node.faults.dropped == 1
+
+
+@pytest.mark.unit
+def test_local_node_in_thread():
+    chain = LocalChain.synthetic(blocks=5)
+    node = LocalNode(chain, Faults(latency=fixed(0.01))).start_in_thread()
+    try:
+        rpc = RPC(network=node.network())
+        assert rpc.block_number.sync() == 4
+        block = rpc.get_block_by_number.sync(
+            GetBlockByNumberArgs(block_number=HexInteger(2), with_tx_data=True)
+        )
+        assert block.hash == chain.blocks[2]["hash"]
+        assert len(block.transactions) == 2
+        assert node.requests == {"eth_blockNumber": 1, "eth_getBlockByNumber": 1}
+    finally:
+        node.stop_thread()
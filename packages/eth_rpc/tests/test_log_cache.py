@@ -0,0 +1,171 @@
+import pytest
+from eth_rpc import Log
+from eth_rpc._transport import _rpcs
+from eth_rpc.local_node import Faults, LocalChain, LocalNode
+from eth_rpc.models import Log as LogModel
+from eth_rpc.utils import LogCache, filter_key
+
+
+class RecordingFaults(Faults):
+    """Records the range of each eth_getLogs request"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests: list[tuple[int, int]] = []
+
+    def logs_limit(self, start: int, end: int, counts: list[int]):
+        self.requests.append((start, end))
+        return super().logs_limit(start, end, counts)
+
+
+def _log(block_number: int, log_index: int = 0) -> LogModel:
+    return LogModel(
+        transaction_hash="0x%064x" % block_number,
+        address="0x" + "a" * 40,
+        block_hash="0x%064x" % (block_number + 1),
+        block_number=block_number,
+        data="0x" + "00" * 32,
+        log_index=log_index,
+        removed=False,
+        topics=["0x" + "3" * 64],
+        transaction_index=0,
+    )
+
+
+@pytest.mark.unit
+def test_log_cache(tmp_path):
+    cache = LogCache(tmp_path / "logs.db")
+    key = LogCache.key(1, ["0xddf2"], ["0xAB"])
+    assert key == LogCache.key(1, ["0xddf2"], ["0xab"])
+    assert key == filter_key(1, ["0xddf2"], ["0xab"])
+
+    cache.store(key, 10, 19, [_log(12), _log(12, 1), _log(18)])
+    cache.store(key, 30, 39, [_log(35)])
+    assert cache.gaps(key, 1, 50) == [(1, 9), (20, 29), (40, 50)]
+    assert cache.gaps(key, 12, 35) == [(20, 29)]
+    # touching ranges are merged
+    cache.store(key, 20, 29, [])
+    assert cache.ranges(key) == [(10, 39)]
+    assert cache.gaps(key, 10, 39) == []
+
+    # a new cache reads the logs stored by the last one
+    cache = LogCache(tmp_path / "logs.db")
+    assert [(log.block_number, log.log_index) for log in cache.load(key, 1, 50)] == [
+        (12, 0),
+        (12, 1),
+        (18, 0),
+        (35, 0),
+    ]
+    assert cache.load(key, 1, 50)[0] == _log(12)
+
+    # logs out of a stored range are dropped
+    cache.store(key, 60, 60, [_log(70)])
+    assert cache.ranges(key) == [(10, 39), (60, 60)]
+    assert len(cache.load(key, 1, 100)) == 4
+
+    # the filters read least recently are evicted first
+    cache.max_bytes = cache.size() + 10
+    other = LogCache.key(1, ["0x01"])
+    cache.store(other, 1, 5, [_log(1), _log(2)])
+    assert cache.ranges(key) == []
+    assert cache.ranges(other) == [(1, 5)]
+    assert cache.size() <= cache.max_bytes
+
+    # compacting gives the space of cleared logs back
+    cache.max_bytes = None
+    cache.store(key, 100, 999, [_log(number) for number in range(100, 1000)])
+    written = (tmp_path / "logs.db").stat().st_size
+    cache.clear(key)
+    cache.compact()
+    assert (tmp_path / "logs.db").stat().st_size < written
+    assert cache.ranges(other) == [(1, 5)]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_log_cache_finality_unknown():
+    cache = LogCache()
+    key = LogCache.key(1, ["0xddf2"])
+
+    async def fetch(start: int, end: int):
+        for number in range(start, end + 1):
+            yield _log(number)
+
+    async def finalized() -> int:
+        raise ValueError("finalized tag not supported")
+
+    logs = [log async for log in cache.get_logs(key, 1, 5, fetch, finalized)]
+    assert [log.block_number for log in logs] == [1, 2, 3, 4, 5]
+    # nothing is known to be final, so nothing is cached
+    assert cache.ranges(key) == []
+    assert cache.load(key, 1, 5) == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_backfill_cache(transfer_event):
+    chain = LocalChain.synthetic(blocks=100, finality_depth=20, chain_id=31_344)
+    faults = RecordingFaults()
+    async with LocalNode(chain, faults) as node:
+        network = node.network()
+        try:
+            cache = LogCache()
+            event = transfer_event[network]
+            first = [
+                event_data
+                async for event_data in event.backfill(
+                    start_block=1, end_block=99, step_size=20, cache=cache
+                )
+            ]
+            first_requests = faults.requests
+            faults.requests = []
+            again = [
+                event_data
+                async for event_data in event.backfill(
+                    start_block=1,
+                    end_block=99,
+                    step_size=20,
+                    concurrency=4,
+                    cache=cache,
+                )
+            ]
+            again_requests = faults.requests
+
+            faults.requests = []
+            topics = [transfer_event.get_topic0]
+            logs = [
+                log
+                async for log in Log[network].get_logs(
+                    1, 99, topics=topics, cache=cache
+                )
+            ]
+            logs_again = [
+                log
+                async for log in Log[network].get_logs(
+                    1, 99, topics=topics, cache=cache
+                )
+            ]
+            log_requests = faults.requests
+        finally:
+            _rpcs.pop(network.chain_id, None)
+
+    expected = [
+        (number, int(log["logIndex"], 16))
+        for number in range(1, 100)
+        for log in chain.logs[number]
+    ]
+    for events in (first, again):
+        assert [
+            (event_data.log.block_number, event_data.log.log_index)
+            for event_data in events
+        ] == expected
+    assert [(log.block_number, log.log_index) for log in logs_again] == expected
+    assert [log.model_dump() for log in logs] == [
+        log.model_dump() for log in logs_again
+    ]
+
+    assert len(first_requests) == 5
+    # the head is at 99 and blocks up to 79 are finalized, so only the rest
+    # of the range is requested again
+    assert again_requests == [(80, 80), (81, 99)]
+    assert log_requests == [(1, 99), (80, 99)]
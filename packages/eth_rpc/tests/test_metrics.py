@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from eth_rpc.exceptions import RPCError
+from eth_rpc.networks import Ethereum
+from eth_rpc.rpc import Metrics, PrometheusExporter, rpc_cost
+from eth_rpc.rpc.core import RPC
+from eth_rpc.types import GetBlockByNumberArgs, HexInteger
+
+
+def metered_rpc() -> tuple[RPC, Metrics]:
+    def respond(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        if payload["method"] == "eth_blockNumber":
+            body = {"jsonrpc": "2.0", "id": payload["id"], "result": "0x10"}
+        else:
+            body = {
+                "jsonrpc": "2.0",
+                "id": payload["id"],
+                "error": {"code": -32000, "message": "header not found"},
+            }
+        return httpx.Response(200, json=body)
+
+    rpc = RPC(
+        network=Ethereum,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(respond)),
+        sync_client=httpx.Client(transport=httpx.MockTransport(respond)),
+    )
+    rpc.set_retries(0)
+    metrics = Metrics()
+    rpc.set_metrics(metrics)
+    return rpc, metrics
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_metrics_snapshot():
+    rpc, metrics = metered_rpc()
+    await asyncio.gather(rpc.block_number(), rpc.block_number())
+    rpc.block_number.sync()
+    with pytest.raises(RPCError):
+        await rpc.get_block_by_number(GetBlockByNumberArgs(block_number=HexInteger(1)))
+
+    snapshot = metrics.snapshot()["Ethereum"]
+    block_number = snapshot["eth_blockNumber"]
+    assert block_number["calls"] == 3
+    assert block_number["network_requests"] == 3
+    assert block_number["bytes_in"] > 0
+    assert block_number["bytes_out"] > 0
+    assert block_number["errors"] == {}
+    for phase in ("total", "queue", "network", "decode"):
+        assert block_number["latency"][phase]["count"] == 3
+    assert snapshot["eth_getBlockByNumber"]["errors"] == {"RPCError": 1}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rpc_cost():
+    rpc, metrics = metered_rpc()
+    await rpc.block_number()
+    with rpc_cost() as cost:
+        await asyncio.gather(rpc.block_number(), rpc.block_number())
+    assert cost.calls == 2
+    assert cost.network_requests == 2
+    assert cost.compute_units() == 20
+    assert cost.compute_units({"eth_blockNumber": 1}) == 2
+
+    # calls are measured without a registry set, which is the default
+    rpc.set_metrics(None)
+    with rpc_cost() as cost:
+        await rpc.block_number()
+    assert cost.calls == 1 and cost.network_requests == 1
+    assert RPC(network=Ethereum).metrics is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_prometheus_exporter():
+    rpc, metrics = metered_rpc()
+    await rpc.block_number()
+    text = metrics.prometheus()
+    assert 'eth_rpc_calls_total{network="Ethereum",method="eth_blockNumber"} 1' in text
+    assert (
+        'eth_rpc_latency_seconds_count{network="Ethereum",method="eth_blockNumber",phase="network"} 1'
+        in text
+    )
+
+    exporter = PrometheusExporter(metrics, port=0, addr="127.0.0.1").start()
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"http://127.0.0.1:{exporter.port}/metrics")
+        assert response.text == metrics.prometheus()
+    finally:
+        exporter.stop()
@@ -0,0 +1,120 @@
+import pytest
+from eth_rpc.exceptions import RPCError
+from eth_rpc.rpc import Middleware, RPCMethod, add_middleware
+from eth_rpc.types import GetCodeArgs
+
+ADDRESS = "0x" + "11" * 20
+
+
+@pytest.fixture
+def middlewares():
+    saved = list(RPCMethod.middlewares)
+    yield RPCMethod.middlewares
+    RPCMethod.middlewares[:] = saved
+    RPCMethod.middleware_version += 1
+
+
+def node(payload):
+    if payload["method"] == "eth_blockNumber":
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x10"}
+    return {
+        "jsonrpc": "2.0",
+        "id": payload["id"],
+        "error": {"code": -32000, "message": "execution reverted"},
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_middleware_chain_compiled_once(middlewares, mock_rpc):
+    rpc = mock_rpc(node)
+    wrapped: list[bool] = []
+
+    def double(method, make_request, is_async=False):
+        wrapped.append(is_async)
+
+        if is_async:
+
+            async def run(*params):
+                return 2 * await make_request(*params)
+
+            return run
+        return lambda *params: 2 * make_request(*params)
+
+    add_middleware(double)
+    for _ in range(3):
+        assert await rpc.block_number() == 32
+        assert rpc.block_number.sync() == 32
+    assert wrapped == [True, False]
+
+    # adding a middleware rebuilds the chain
+    add_middleware(double)
+    assert await rpc.block_number() == 64
+    assert wrapped == [True, False, True, True]
+
+    # a copy bound to another RPC compiles its own chain, calling that RPC
+    requests = []
+
+    def handler(payload):
+        requests.append(payload)
+        return node(payload)
+
+    copied = rpc.block_number.model_copy().set_rpc(mock_rpc(handler))
+    assert await copied() == 64
+    assert len(requests) == 1
+
+
+class Hooks(Middleware):
+    seen: list[str] = []
+
+    def before(self, method, payload):
+        self.seen.append(payload["method"])
+        if payload["method"] == "eth_chainId":
+            return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x5"}
+        return None
+
+    def after(self, method, payload, response):
+        if payload["method"] == "eth_blockNumber":
+            return {**response, "result": "0x20"}
+        return response
+
+    def on_error(self, method, payload, exc):
+        if (
+            isinstance(exc, RPCError)
+            and payload["method"] == "eth_maxPriorityFeePerGas"
+        ):
+            return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x7"}
+        return None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_middleware_hooks(middlewares, mock_rpc):
+    requests = []
+
+    def handler(payload):
+        requests.append(payload)
+        return node(payload)
+
+    rpc = mock_rpc(handler)
+    hooks = Hooks()
+    add_middleware(hooks)
+
+    # answered by the middleware, without a request
+    assert await rpc.chain_id() == 5
+    assert requests == []
+
+    assert await rpc.block_number() == 32
+    assert rpc.block_number.sync() == 32
+
+    # the node errors, and the middleware recovers
+    assert await rpc.max_priority_fee_per_gas() == 7
+    with pytest.raises(RPCError):
+        rpc.get_code.sync(GetCodeArgs(address=ADDRESS))
+    assert hooks.seen == [
+        "eth_chainId",
+        "eth_blockNumber",
+        "eth_blockNumber",
+        "eth_maxPriorityFeePerGas",
+        "eth_getCode",
+    ]
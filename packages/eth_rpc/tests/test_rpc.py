@@ -0,0 +1,582 @@
+import asyncio
+import contextvars
+import json
+import threading
+import time
+from typing import ClassVar
+
+import httpx
+import pytest
+from eth_rpc._transport import _force_get_global_rpc, _rpcs
+from eth_rpc.constants import ADDRESS_ZERO
+from eth_rpc.exceptions import CircuitOpenError, RPCError, RPCStatusError
+from eth_rpc.local_node import LocalChain, LocalNode
+from eth_rpc.networks import Ethereum
+from eth_rpc.rpc import CircuitBreaker, HedgePolicy, RateLimiter, RetryPolicy
+from eth_rpc.rpc.base import ConnectionPoolConfig
+from eth_rpc.rpc.core import RPC
+from eth_rpc.rpc.method import RPCMethod
+from eth_rpc.rpc.pool import EndpointPool
+from eth_rpc.types import (
+    BlockExplorer,
+    EthCallArgs,
+    EthCallParams,
+    HexInteger,
+    Network,
+    NoArgs,
+    RawTransaction,
+    Rpcs,
+    RpcUrl,
+)
+from eth_rpc.utils.client import HTTPClient
+from pydantic import AnyHttpUrl
+
+
+@pytest.mark.unit
+def test_configure_pool():
+    rpc = RPC(network=Ethereum)
+    sync_client = rpc.sync_client
+    client = rpc.client
+    rpc.configure_pool(max_connections=10, keepalive_expiry=30.0)
+
+    assert sync_client.is_closed and client.is_closed
+    assert isinstance(rpc.sync_client, httpx.Client)
+    assert rpc.sync_client is not sync_client
+    assert not rpc.sync_client.is_closed
+    assert not rpc.client.is_closed
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_configure_pool_in_loop():
+    rpc = RPC(network=Ethereum)
+    client = rpc.client
+    rpc.configure_pool(max_connections=10)
+    # closed on the running loop, which its connections belong to
+    await asyncio.sleep(0.01)
+    assert client.is_closed
+    assert not rpc.client.is_closed
+
+
+@pytest.mark.unit
+def test_http_client():
+    node = LocalNode(LocalChain.synthetic(blocks=2, chain_id=31_345))
+    node.start_in_thread()
+    payload = {"jsonrpc": "2.0", "id": 1, "method": "eth_chainId", "params": []}
+    try:
+        client = HTTPClient()
+        response = client.post(node.http_url, json=payload, sync=True)
+        assert response.json()["result"] == hex(31_345)
+
+        async def post() -> httpx.AsyncClient:
+            response = await client.post(node.http_url, json=payload)
+            assert response.json()["result"] == hex(31_345)
+            return HTTPClient.async_client()
+
+        # each loop gets its own client, so a finished loop's is never reused
+        first = asyncio.run(post())
+        assert asyncio.run(post()) is not first
+
+        sync_client = HTTPClient.sync_client()
+        HTTPClient.configure_pool(ConnectionPoolConfig(max_connections=5))
+        assert sync_client.is_closed
+        assert HTTPClient.sync_client() is not sync_client
+        response = client.post(node.http_url, json=payload, sync=True)
+        assert response.json()["result"] == hex(31_345)
+    finally:
+        HTTPClient.configure_pool(ConnectionPoolConfig())
+        node.stop_thread()
+
+
+@pytest.mark.unit
+def test_rpc_methods_bound_lazily():
+    rpc = RPC(network=Ethereum)
+    assert rpc._methods == {}
+
+    method = rpc.get_logs
+    assert method is rpc.get_logs
+    assert method._rpc is rpc and method._network is Ethereum
+    assert list(rpc._methods) == ["get_logs"]
+    assert RPC(network=Ethereum).get_logs is not method
+    # the declaration itself is never bound
+    assert RPC.get_logs._rpc is None
+    assert "get_logs" in RPC.method_names()
+
+    # methods bound after hedging is enabled are hedged too
+    eth_call = rpc.eth_call
+    policy = rpc.enable_hedging()
+    assert eth_call.hedge_policy is policy
+    assert rpc.block_number.hedge_policy is policy
+    assert method.hedge_policy is None
+    rpc.disable_hedging()
+    assert eth_call.hedge_policy is None
+    assert rpc.block_number.hedge_policy is None
+
+
+@pytest.mark.unit
+def test_rpc_methods_declared_as_fields():
+    # subclasses written when methods were pydantic fields still bind them
+    with pytest.warns(UserWarning, match="shadows an attribute"):
+
+        class CustomRPC(RPC):
+            block_number: RPCMethod = RPCMethod[NoArgs, HexInteger](
+                name="custom_blockNumber"
+            )
+            head: RPCMethod = RPCMethod[NoArgs, HexInteger](name="eth_blockNumber")
+
+    rpc = CustomRPC(network=Ethereum)
+    assert rpc.block_number.name == "custom_blockNumber"
+    assert rpc.head._rpc is rpc and rpc.get_logs._rpc is rpc
+    assert {"block_number", "head", "get_logs"} <= set(CustomRPC.method_names())
+
+    # and a method assigned on an instance is bound to it
+    rpc = RPC(network=Ethereum)
+    rpc.block_number = RPCMethod[NoArgs, HexInteger](name="custom_blockNumber")
+    assert rpc.block_number.name == "custom_blockNumber"
+    assert rpc.block_number._rpc is rpc
+    assert RPC(network=Ethereum).block_number.name == "eth_blockNumber"
+
+
+class PoolNetwork(Network):
+    chain_id: ClassVar[int] = 999_001
+    name: ClassVar[str] = "Pool Network"
+    native_currency: ClassVar[str] = "ETH"
+    rpc: ClassVar[Rpcs] = Rpcs(
+        default=RpcUrl(http=AnyHttpUrl("https://primary.test")),
+        backups=[RpcUrl(http=AnyHttpUrl("https://backup.test"))],
+    )
+    block_explorer: ClassVar[BlockExplorer] = BlockExplorer(name="", url="", api_url="")
+
+
+def pool_rpc(status: dict[str, int]) -> tuple[RPC, list[str]]:
+    hosts: list[str] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        payload = json.loads(request.content)
+        if (code := status.get(request.url.host, 200)) != 200:
+            return httpx.Response(code, text="unavailable")
+        return httpx.Response(
+            200, json={"jsonrpc": "2.0", "id": payload["id"], "result": "0x10"}
+        )
+
+    transport = httpx.MockTransport(respond)
+    rpc = RPC(
+        network=PoolNetwork,
+        client=httpx.AsyncClient(transport=transport),
+        sync_client=httpx.Client(transport=transport),
+    )
+    return rpc, hosts
+
+
+@pytest.mark.unit
+def test_global_rpc_shared():
+    rpc = _force_get_global_rpc(PoolNetwork)
+    try:
+        # the same RPC from another context and another thread
+        assert contextvars.copy_context().run(_force_get_global_rpc, PoolNetwork) is rpc
+        found = []
+        thread = threading.Thread(
+            target=lambda: found.append(_force_get_global_rpc(PoolNetwork))
+        )
+        thread.start()
+        thread.join()
+        assert found == [rpc]
+    finally:
+        _rpcs.pop(PoolNetwork.chain_id, None)
+
+
+@pytest.mark.unit
+def test_pool_failover():
+    rpc, hosts = pool_rpc({"primary.test": 503})
+    assert rpc.pool.urls == ("https://primary.test/", "https://backup.test/")
+
+    for _ in range(5):
+        assert rpc.block_number.sync() == 16
+
+    # the failed request moved to the backup, which then scores better
+    assert hosts == ["primary.test"] + ["backup.test"] * 5
+    primary, backup = rpc.endpoint_stats()
+    assert primary["errors"] == 1
+    assert primary["error_rate"] > 0
+    assert backup["errors"] == 0
+    assert backup["latency"] is not None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_pool_no_failover_for_sent_transactions():
+    hosts: list[str] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        raise httpx.ReadTimeout("timed out")
+
+    transport = httpx.MockTransport(respond)
+    rpc = RPC(network=PoolNetwork, client=httpx.AsyncClient(transport=transport))
+    assert not EndpointPool.is_retryable(
+        {"method": "eth_sendRawTransaction"}, httpx.ReadTimeout("timed out")
+    )
+    # the transaction may have landed, so it isn't sent to the backup
+    with pytest.raises(httpx.ReadTimeout):
+        await rpc.send_raw_tx(RawTransaction(signed_tx="0x02"))
+    assert hosts == ["primary.test"]
+
+
+@pytest.mark.unit
+def test_pool_ejection():
+    pool = EndpointPool.from_urls([("a", 1.0), ("b", 1.0)], eject_after=2)
+    a, b = pool.endpoints
+    pool.record_success(a, 0.1)
+    pool.record_success(b, 0.5)
+    assert pool.select() is a
+
+    pool.record_failure(a)
+    assert a.is_available(time.monotonic())
+    pool.record_failure(a)
+    assert not a.is_available(time.monotonic())
+    assert pool.select() is b
+
+    pool.record_failure(b, rate_limited=True)
+    assert not b.is_available(time.monotonic())
+    # everything is ejected, the first endpoint to come back is used
+    assert pool.select() is b
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_pool_rate_limited():
+    rpc, hosts = pool_rpc({"primary.test": 429})
+    for _ in range(3):
+        assert await rpc.block_number() == 16
+
+    # a rate limited endpoint is ejected straight away
+    assert hosts == ["primary.test"] + ["backup.test"] * 3
+    primary, _ = rpc.endpoint_stats()
+    assert primary["rate_limited"] == 1
+    assert not primary["available"]
+
+
+def slow_primary_rpc(delay: float) -> tuple[RPC, list[str]]:
+    hosts: list[str] = []
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        payload = json.loads(request.content)
+        if request.url.host == "primary.test":
+            await asyncio.sleep(delay)
+        return httpx.Response(
+            200,
+            json={"jsonrpc": "2.0", "id": payload["id"], "result": request.url.host},
+        )
+
+    rpc = RPC(
+        network=PoolNetwork,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(respond)),
+    )
+    return rpc, hosts
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_hedged_request():
+    rpc, hosts = slow_primary_rpc(delay=5)
+    policy = rpc.enable_hedging(HedgePolicy(budget=1.0, max_delay=0.05))
+
+    start = time.monotonic()
+    assert await rpc.eth_call(
+        EthCallArgs(params=EthCallParams(to=ADDRESS_ZERO), block_number="latest")
+    ) == ("backup.test")
+    assert time.monotonic() - start < 1
+    assert hosts == ["primary.test", "backup.test"]
+    assert policy.hedges == 1
+    # the cancelled primary is observed too, so the percentile isn't biased low
+    await asyncio.sleep(0.01)
+    assert len(policy._latencies["eth_call"]) == 2
+
+    # writes are never hedged
+    with pytest.raises(ValueError):
+        rpc.send_raw_tx.set_hedge_policy(policy)
+    with pytest.raises(ValueError):
+        HedgePolicy(methods=["eth_sendRawTransaction"])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_hedge_budget():
+    rpc, hosts = slow_primary_rpc(delay=0.1)
+    policy = rpc.enable_hedging(HedgePolicy(budget=0.0, max_delay=0.01))
+
+    args = EthCallArgs(params=EthCallParams(to=ADDRESS_ZERO), block_number="latest")
+    assert await rpc.eth_call(args) == "primary.test"
+    assert hosts == ["primary.test"]
+    assert policy.hedges == 0
+    assert policy.requests == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_hedge_on_primary_error():
+    rpc, hosts = pool_rpc({"primary.test": 503})
+    policy = rpc.enable_hedging(HedgePolicy(budget=1.0, max_delay=5.0))
+
+    start = time.monotonic()
+    assert await rpc.block_number() == 16
+    # hedged as soon as the primary failed, without waiting for the delay
+    assert time.monotonic() - start < 1
+    assert hosts == ["primary.test", "backup.test"]
+    assert policy.hedges == 1
+
+
+@pytest.mark.unit
+def test_hedge_delay():
+    policy = HedgePolicy(percentile=90, min_samples=10, max_delay=2.0, refresh=50)
+    assert policy.delay("eth_call") == 2.0
+    for i in range(100):
+        policy.observe("eth_call", i / 100)
+    assert policy.delay("eth_call") == 0.9
+
+    # the percentile is only recomputed every `refresh` observations
+    for _ in range(49):
+        policy.observe("eth_call", 1.5)
+    assert policy.delay("eth_call") == 0.9
+    policy.observe("eth_call", 1.5)
+    assert policy.delay("eth_call") == 1.5
+
+
+@pytest.mark.unit
+def test_rate_limiter_cost():
+    limiter = RateLimiter.alchemy(compute_units_per_second=330)
+    assert limiter.cost({"method": "eth_chainId"}) == 0
+    assert limiter.cost([{"method": "eth_call"}, {"method": "eth_getLogs"}]) == 101
+    assert limiter.cost({"method": "unknown_method"}) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rate_limiter_pacing():
+    limiter = RateLimiter(rate=100, burst=10, costs={"eth_call": 10})
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire({"method": "eth_call"})
+    # the first call spends the burst, the next two wait 0.1s each
+    assert time.monotonic() - start >= 0.19
+    usage = limiter.usage()
+    assert usage["consumed"] == 30
+    assert usage["throttled"] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rate_limiter_aimd():
+    rpc, hosts = pool_rpc({"primary.test": 429})
+    limiter = RateLimiter(rate=1000, increase=10)
+    rpc.set_rate_limiter(limiter)
+
+    assert await rpc.block_number() == 16
+    # halved by the 429, then nudged back up by the backup's success
+    assert limiter.rate == 510
+    usage = rpc.rate_limit_usage()
+    assert usage["rate_limited"] == 1
+    assert usage["requests"] == 2
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == limiter.max_rate
+
+
+def scripted_rpc(*responses: httpx.Response | Exception) -> tuple[RPC, list[str]]:
+    """Answer each request with the next scripted response, repeating the last"""
+    methods: list[str] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        methods.append(payload["method"])
+        response = responses[min(len(methods), len(responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        if response.status_code != 200:
+            return response
+        return httpx.Response(
+            200, json={"id": payload["id"], **json.loads(response.content)}
+        )
+
+    transport = httpx.MockTransport(respond)
+    rpc = RPC(
+        network=PoolNetwork,
+        client=httpx.AsyncClient(transport=transport),
+        sync_client=httpx.Client(transport=transport),
+    )
+    rpc.set_retry_policy(RetryPolicy(base_delay=0.001))
+    return rpc, methods
+
+
+def ok(result: str = "0x10") -> httpx.Response:
+    return httpx.Response(200, json={"jsonrpc": "2.0", "result": result})
+
+
+def error(message: str, code: int = -32000) -> httpx.Response:
+    return httpx.Response(
+        200, json={"jsonrpc": "2.0", "error": {"code": code, "message": message}}
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_retry_async():
+    rpc, methods = scripted_rpc(
+        httpx.Response(502, text="bad gateway"),
+        httpx.Response(502, text="bad gateway"),
+        error("header not found"),
+        ok(),
+    )
+    assert await rpc.block_number() == 16
+    # both endpoints failed, then a lagging node, then success
+    assert len(methods) == 4
+    assert rpc.retry_policy.retried == 2
+
+
+@pytest.mark.unit
+def test_retry_sync_gives_up():
+    rpc, methods = scripted_rpc(httpx.ReadTimeout("timed out"))
+    rpc.set_retries(2)
+    with pytest.raises(httpx.ReadTimeout):
+        rpc.block_number.sync()
+    # each attempt tries both endpoints
+    assert len(methods) == 6
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_retry_not_retryable():
+    rpc, methods = scripted_rpc(error("execution reverted", code=3))
+    with pytest.raises(RPCError):
+        await rpc.block_number()
+    assert len(methods) == 1
+
+    rpc, methods = scripted_rpc(httpx.Response(400, text="bad request"))
+    with pytest.raises(RPCStatusError):
+        await rpc.block_number()
+    assert len(methods) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_retry_not_sent_transactions():
+    for response in (
+        httpx.ReadTimeout("timed out"),
+        httpx.Response(502, text="bad gateway"),
+    ):
+        rpc, methods = scripted_rpc(response)
+        rpc.set_retries(3)
+        with pytest.raises((httpx.ReadTimeout, RPCStatusError)):
+            await rpc.send_raw_tx(RawTransaction(signed_tx="0x02"))
+        # the transaction may have landed, so it is sent exactly once
+        assert methods == ["eth_sendRawTransaction"]
+        assert rpc.retry_policy.retried == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_retry_override_and_budget():
+    rpc, methods = scripted_rpc(error("rate limit exceeded", code=429))
+    policy = RetryPolicy(base_delay=0.001)
+    policy.override("eth_blockNumber", retries=0)
+    rpc.set_retry_policy(policy)
+    with pytest.raises(RPCError):
+        await rpc.block_number()
+    assert len(methods) == 1
+
+    policy = RetryPolicy(base_delay=0.001)
+    policy.budget.tokens = 1
+    rpc.set_retry_policy(policy)
+    with pytest.raises(RPCError):
+        await rpc.block_number()
+    # one retry, then the budget is spent
+    assert len(methods) == 3
+    assert policy.retried == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_retry_stream():
+    policy = RetryPolicy(base_delay=0.001)
+    opened = []
+
+    async def fails_first():
+        opened.append(None)
+        if len(opened) == 1:
+            raise httpx.ConnectError("refused")
+        yield 1
+        yield 2
+
+    payload = {"method": "eth_getLogs"}
+    elems = [elem async for elem in policy.stream_async(payload, 3, fails_first)]
+    assert elems == [1, 2]
+    assert len(opened) == 2
+    assert policy.retried == 1
+
+    async def fails_midway():
+        opened.append(None)
+        yield 1
+        raise httpx.ConnectError("refused")
+
+    # once elements have been yielded, an error is not retried
+    opened.clear()
+    elems = []
+    with pytest.raises(httpx.ConnectError):
+        async for elem in policy.stream_async(payload, 3, fails_midway):
+            elems.append(elem)
+    assert elems == [1]
+    assert len(opened) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failover_after_repeated_failures():
+    hosts: list[str] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        payload = json.loads(request.content)
+        # the primary is down, and the backup fails its first requests
+        if request.url.host == "primary.test" or hosts.count("backup.test") <= 8:
+            return httpx.Response(503, text="unavailable")
+        return httpx.Response(
+            200, json={"jsonrpc": "2.0", "id": payload["id"], "result": "0x10"}
+        )
+
+    rpc = RPC(
+        network=PoolNetwork,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(respond)),
+    )
+    rpc.set_retry_policy(RetryPolicy(base_delay=0.001))
+    for _ in range(2):
+        with pytest.raises(RPCStatusError):
+            await rpc.block_number()
+    # no breaker by default, so the recovered backup is used straight away
+    assert await rpc.block_number() == 16
+    assert hosts[-1] == "backup.test"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_circuit_breaker():
+    rpc, methods = scripted_rpc(httpx.ConnectError("refused"))
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    rpc.set_retry_policy(RetryPolicy(retries=5, base_delay=0.001, breaker=breaker))
+    with pytest.raises(CircuitOpenError):
+        await rpc.block_number()
+    assert breaker.state == "open"
+    assert len(methods) == 4
+
+    breaker.opened_at = time.monotonic() - 60
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    # only a single probe is let through
+    assert not breaker.allow()
+    breaker.opened_at = time.monotonic() - 60
+    with pytest.raises(CircuitOpenError):
+        await rpc.block_number()
+    # a single failed probe opens the circuit again
+    assert len(methods) == 6
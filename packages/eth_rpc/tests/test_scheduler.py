@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+from eth_rpc import Block, request_priority
+from eth_rpc._transport import _rpcs
+from eth_rpc.local_node import Faults, LocalChain, LocalNode, fixed
+from eth_rpc.rpc import Priority, RequestScheduler
+from eth_rpc.types import LogsArgs, LogsParams
+
+URL = "http://node"
+
+
+@pytest.mark.unit
+def test_scheduler_priority():
+    scheduler = RequestScheduler(methods={"eth_chainId": "bulk"})
+    assert scheduler.priority({"method": "eth_call"}) == Priority.INTERACTIVE
+    assert scheduler.priority({"method": "eth_getLogs"}) == Priority.BULK
+    assert scheduler.priority({"method": "eth_chainId"}) == Priority.BULK
+    batch = [{"method": "eth_getLogs"}, {"method": "eth_getTransactionCount"}]
+    assert scheduler.priority(batch) == Priority.CRITICAL
+
+    with request_priority("bulk"):
+        assert scheduler.priority({"method": "eth_call"}) == Priority.BULK
+        with request_priority(None):
+            assert scheduler.priority({"method": "eth_call"}) == Priority.BULK
+    assert scheduler.priority({"method": "eth_call"}) == Priority.INTERACTIVE
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scheduler_fair_queuing():
+    scheduler = RequestScheduler(max_concurrency=2, limits={"bulk": 2})
+    order: list[Priority] = []
+
+    async def request(priority: Priority):
+        await scheduler.acquire(URL, priority)
+        order.append(priority)
+
+    # bulk traffic fills every slot
+    await request(Priority.BULK)
+    await request(Priority.BULK)
+    tasks = [asyncio.ensure_future(request(Priority.BULK)) for _ in range(4)]
+    tasks += [asyncio.ensure_future(request(Priority.INTERACTIVE)) for _ in range(4)]
+    await asyncio.sleep(0)
+    assert len(order) == 2
+
+    # critical requests don't wait for a slot
+    await request(Priority.CRITICAL)
+    scheduler.release(URL, Priority.CRITICAL)
+
+    # finish one request at a time, oldest first
+    for i in range(8):
+        scheduler.release(URL, [p for p in order if p != Priority.CRITICAL][i])
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    # interactive requests are weighted 4:1 over bulk
+    assert order[3:7] == [Priority.INTERACTIVE] * 4
+    assert scheduler.dispatched[Priority.BULK] == 6
+
+    # a cancelled request gives up its place in the queue
+    waiting = asyncio.ensure_future(request(Priority.BULK))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    endpoint = scheduler.stats()["endpoints"][URL]
+    assert endpoint["bulk"] == {"active": 2, "waiting": 0}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scheduler_critical_not_starved():
+    chain = LocalChain.synthetic(blocks=20, chain_id=31_340)
+    faults = Faults(method_latency={"eth_getLogs": fixed(0.1)})
+    async with LocalNode(chain, faults) as node:
+        network = node.network()
+        try:
+            rpc = Block[network].rpc()
+            rpc.set_scheduler(RequestScheduler(max_concurrency=2))
+            params = LogsParams(from_block=1, to_block=19, topics=[])
+            backfill = [
+                asyncio.ensure_future(rpc.get_logs(LogsArgs(params=params)))
+                for _ in range(6)
+            ]
+            await asyncio.sleep(0.01)
+
+            start = time.monotonic()
+            number = await Block[network].get_number().with_priority("critical")
+            assert number == 19
+            assert time.monotonic() - start < 0.1
+            assert not any(task.done() for task in backfill)
+            await asyncio.gather(*backfill)
+        finally:
+            _rpcs.pop(network.chain_id, None)
@@ -0,0 +1,125 @@
+import pytest
+from eth_rpc._transport import _rpcs
+from eth_rpc.local_node import Faults, LocalChain, LocalNode
+from eth_rpc.utils import DensityStore, StepSizeController, get_density_store
+
+
+@pytest.mark.unit
+def test_step_size_controller(tmp_path):
+    store = DensityStore(tmp_path / "density.json")
+    key = DensityStore.key(1, ["0xAB", "0x12"], "0xddf2")
+    assert key == "1:0x12,0xab:0xddf2"
+
+    controller = StepSizeController(
+        target_logs=1_000, target_latency=1.0, key=key, store=store
+    )
+    assert controller.step == 500
+    # 1 log per block: grows by at most 2x a window, up to the target
+    controller.observe(500, 500, latency=0.1)
+    assert controller.step == 1_000
+    controller.observe(1_000, 1_000, latency=0.1)
+    assert controller.step == 1_000
+
+    # a slow response halves the window
+    controller.observe(1_000, 1_000, latency=2.0)
+    assert controller.step == 500
+
+    # a much denser window resets the estimate instead of averaging it in
+    controller.observe(500, 10_000)
+    assert controller.density == 20 and controller.step == 50
+    controller.observe(50, 1_200)
+    assert controller.density == pytest.approx(21.2)
+
+    # bytes are targeted too
+    controller.target_bytes = 100_000
+    controller.observe(50, 1_000, size=1_000_000)
+    assert controller.step == int(100_000 / (controller.density * 1_000))
+
+    # too large a response cuts the window to what the node recommends, and
+    # aims under the node's cap from then on
+    controller.exceeded(controller.step, 3)
+    assert controller.step == 3
+    assert controller.target_logs == int(controller.density * 3 * 0.8)
+    controller.exceeded(3)
+    assert controller.step == 1
+
+    # the next run starts where this one left off, once the store is flushed
+    assert not (tmp_path / "density.json").exists()
+    store.flush()
+    density = controller.density
+    learned = StepSizeController(
+        target_logs=1_000, key=key, store=DensityStore(tmp_path / "density.json")
+    )
+    assert learned.density == density
+    assert learned.target_logs == controller.target_logs
+    assert learned.step == max(int(controller.target_logs / density), 1)
+    assert StepSizeController(step_size=7, key=key, store=store).step == 7
+    # with nothing learned, the first window covers the whole range
+    assert StepSizeController(blocks=250_000).step == 250_000
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_backfill_adaptive_step(transfer_event):
+    chain = LocalChain.synthetic(blocks=400, chain_id=31_342)
+    faults = Faults(max_logs=100)
+    async with LocalNode(chain, faults) as node:
+        network = node.network()
+        try:
+            event = transfer_event[network]
+            events = [
+                event async for event in event.backfill(start_block=1, end_block=399)
+            ]
+            first_exceeded = faults.logs_exceeded
+            # the density was learned, so a second backfill doesn't overshoot
+            again = [
+                event
+                async for event in event.backfill(
+                    start_block=1, end_block=399, concurrency=4
+                )
+            ]
+        finally:
+            _rpcs.pop(network.chain_id, None)
+
+    expected = [log for number in range(1, 400) for log in chain.logs[number]]
+    assert [event.log.transaction_hash for event in events] == [
+        log["transactionHash"] for log in expected
+    ]
+    assert [event.log.transaction_hash for event in again] == [
+        log["transactionHash"] for log in expected
+    ]
+    assert first_exceeded > 0
+    assert faults.logs_exceeded == first_exceeded
+    learned = get_density_store().get(
+        DensityStore.key(network.chain_id, [], transfer_event.get_topic0)
+    )
+    assert learned["density"] == pytest.approx(len(expected) / 399, rel=0.5)
+    assert learned["logs"] < 100
+
+
+@pytest.mark.unit
+def test_sync_backfill_adaptive_step(transfer_event):
+    chain = LocalChain.synthetic(blocks=200, chain_id=31_347)
+    faults = Faults(max_logs=100)
+    node = LocalNode(chain, faults).start_in_thread()
+    network = node.network()
+    try:
+        event = transfer_event[network].sync
+        # a range under the node's cap is fetched in one request
+        small = list(event.backfill(start_block=1, end_block=10))
+        assert node.requests["eth_getLogs"] == 1
+        events = list(event.backfill(start_block=1, end_block=199))
+    finally:
+        node.stop_thread()
+        _rpcs.pop(network.chain_id, None)
+
+    expected = [log for number in range(1, 200) for log in chain.logs[number]]
+    assert len(small) == sum(len(chain.logs[number]) for number in range(1, 11))
+    assert [event.log.transaction_hash for event in events] == [
+        log["transactionHash"] for log in expected
+    ]
+    assert faults.logs_exceeded > 0
+    learned = get_density_store().get(
+        DensityStore.key(network.chain_id, [], transfer_event.get_topic0)
+    )
+    assert learned["logs"] < 100
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from eth_rpc._transport import _rpcs
+from eth_rpc.exceptions import RPCDecodeError, RPCError
+from eth_rpc.local_node import Faults, LocalChain, LocalNode
+from eth_rpc.rpc.core import RPC
+from eth_rpc.rpc.stream import ResultStream
+from eth_rpc.types import LogsArgs, LogsParams
+
+
+def parse(body: bytes, chunk_size: int) -> tuple[list, dict]:
+    parser = ResultStream()
+    elements = []
+    for i in range(0, len(body), chunk_size):
+        elements += parser.feed(body[i : i + chunk_size])
+    return elements, parser.close()
+
+
+@pytest.mark.unit
+def test_result_stream():
+    result = [
+        {"data": "0x01", "topics": ["0xab", "0xcd"], "note": 'naïve ✓ "quoted"'},
+        12345,
+        [1, [2, 3]],
+        None,
+        "]},",
+    ]
+    body = json.dumps({"result": result, "id": 123456, "jsonrpc": "2.0"}).encode()
+    # split inside strings, numbers and multi-byte characters
+    for chunk_size in (1, 2, 3, 7, len(body)):
+        elements, response = parse(body, chunk_size)
+        assert elements == result
+        assert response == {"id": 123456, "jsonrpc": "2.0"}
+
+    elements, response = parse(b'{"jsonrpc":"2.0","id":1,"result":null}', 5)
+    assert elements == [] and response["result"] is None
+
+    error = {"code": -32005, "message": "Log response size exceeded."}
+    elements, response = parse(json.dumps({"id": 1, "error": error}).encode(), 4)
+    assert elements == [] and response["error"] == error
+    with pytest.raises(RPCError):
+        ResultStream.elements(response)
+
+    with pytest.raises(RPCDecodeError):
+        parse(b'{"id":1,"result":[{"a":1},{"b"', 8)
+    with pytest.raises(RPCDecodeError):
+        parse(b"<html>502 Bad Gateway</html>", 8)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stream_get_logs(transfer_event):
+    chain = LocalChain.synthetic(blocks=100, logs=3, chain_id=31_338)
+    # the node only returns 50 logs at a time, and rate limits 10% of requests
+    faults = Faults(max_logs=50, rate_limit_ratio=0.1, seed=2)
+    async with LocalNode(chain, faults) as node:
+        network = node.network()
+        try:
+            rpc = RPC(network=network)
+            params = LogsParams(from_block=1, to_block=5, topics=[])
+            logs = [log async for log in rpc.get_logs.stream(LogsArgs(params=params))]
+            assert logs == await rpc.get_logs(LogsArgs(params=params))
+
+            events = [
+                event
+                async for event in transfer_event[network].backfill(
+                    start_block=1, end_block=99, stream=True
+                )
+            ]
+        finally:
+            _rpcs.pop(network.chain_id, None)
+
+    expected = [log for number in range(1, 100) for log in chain.logs[number]]
+    assert [event.log.transaction_hash for event in events] == [
+        log["transactionHash"] for log in expected
+    ]
+    assert faults.logs_exceeded > 0
+
+
+@pytest.mark.unit
+def test_stream_get_logs_sync(transfer_event):
+    chain = LocalChain.synthetic(blocks=20, chain_id=31_339)
+    node = LocalNode(chain).start_in_thread()
+    network = node.network()
+    try:
+        events = list(
+            transfer_event[network].sync.get_logs(
+                start_block=1, end_block=19, stream=True
+            )
+        )
+        assert len(events) == sum(len(chain.logs[n]) for n in range(1, 20))
+        assert events[0].network == network
+
+        with pytest.raises(TypeError):
+            next(RPC(network=network).block_number.stream_sync())
+    finally:
+        _rpcs.pop(network.chain_id, None)
+        node.stop_thread()
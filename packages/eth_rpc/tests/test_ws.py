@@ -0,0 +1,195 @@
+import asyncio
+import json
+from typing import ClassVar
+
+import pytest
+from eth_rpc.networks import Ethereum
+from eth_rpc.rpc import Metrics, RateLimiter, RetryPolicy
+from eth_rpc.rpc.core import RPC
+from eth_rpc.rpc.ws import WebSocketConnection
+from eth_rpc.types import BlockExplorer, Network, RawTransaction, Rpcs, RpcUrl
+from pydantic import AnyHttpUrl
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+
+class Node:
+    """Answers eth_blockNumber with the request id, in reverse order per batch"""
+
+    def __init__(
+        self, drop_first: int = 0, garbage: bool = False, rate_limit_first: int = 0
+    ):
+        self.drop_first = drop_first
+        self.garbage = garbage
+        self.rate_limit_first = rate_limit_first
+        self.received: list[dict] = []
+        self.connections = 0
+
+    async def handler(self, ws):
+        self.connections += 1
+        async for message in ws:
+            payload = json.loads(message)
+            self.received.append(payload)
+            if self.drop_first:
+                # lose the request along with the connection
+                self.drop_first -= 1
+                await ws.close()
+                return
+            if self.garbage:
+                await ws.send("not json")
+            if self.rate_limit_first:
+                self.rate_limit_first -= 1
+                await ws.send(
+                    json.dumps(
+                        {
+                            "jsonrpc": "2.0",
+                            "id": payload["id"],
+                            "error": {"code": -32005, "message": "rate limit exceeded"},
+                        }
+                    )
+                )
+                continue
+            # answer out of order, so responses have to be matched by id
+            await asyncio.sleep(0.02 if payload["id"] % 2 else 0)
+            await ws.send(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": payload["id"],
+                        "result": hex(payload["id"]),
+                    }
+                )
+            )
+
+
+def ws_rpc(port: int) -> RPC:
+    rpc = RPC(network=Ethereum)
+    rpc.enable_websocket(f"ws://127.0.0.1:{port}")
+    return rpc
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_websocket_multiplexing():
+    node = Node()
+    async with serve(node.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        rpc = ws_rpc(port)
+        results = await asyncio.gather(*[rpc.block_number() for _ in range(10)])
+        await rpc.disable_websocket().close()
+
+    # each caller got the response to its own request
+    assert sorted(results) == sorted(payload["id"] for payload in node.received)
+    assert len(set(results)) == 10
+    assert node.connections == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_websocket_reconnect():
+    node = Node(drop_first=1)
+    async with serve(node.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        rpc = ws_rpc(port)
+        transport = rpc.websocket
+        result = await rpc.block_number()
+        await transport.close()
+
+    # the request was lost with the first connection and re-sent on the second
+    assert node.connections == 2
+    assert transport.reconnects == 1
+    assert [payload["id"] for payload in node.received] == [result, result]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_websocket_sent_transaction_not_resent():
+    node = Node(drop_first=1)
+    async with serve(node.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        rpc = ws_rpc(port)
+        transport = rpc.websocket
+        with pytest.raises(ConnectionClosed):
+            await rpc.send_raw_tx(RawTransaction(signed_tx="0x02"))
+        await transport.close()
+
+    # the transaction may have landed, so it fails instead of being re-sent
+    assert [payload["method"] for payload in node.received] == [
+        "eth_sendRawTransaction"
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_websocket_bad_messages(monkeypatch):
+    node = Node(garbage=True)
+    async with serve(node.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        rpc = ws_rpc(port)
+        transport = rpc.websocket
+        # a message that isn't JSON is skipped
+        assert await rpc.block_number() == node.received[-1]["id"]
+
+        dispatch = WebSocketConnection._dispatch
+
+        def fail_once(self, message, size):
+            monkeypatch.setattr(WebSocketConnection, "_dispatch", dispatch)
+            raise RuntimeError("unexpected")
+
+        monkeypatch.setattr(WebSocketConnection, "_dispatch", fail_once)
+        # any other error fails the requests in flight
+        with pytest.raises(RuntimeError):
+            await rpc.block_number()
+        # and the next request reconnects
+        assert await rpc.block_number() == node.received[-1]["id"]
+        await transport.close()
+
+    assert node.connections == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_websocket_rate_limiter_and_metrics():
+    node = Node(rate_limit_first=1)
+    async with serve(node.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        rpc = ws_rpc(port)
+        limiter = RateLimiter(rate=1000, increase=10)
+        rpc.set_rate_limiter(limiter)
+        rpc.set_retry_policy(RetryPolicy(base_delay=0.001))
+        metrics = Metrics()
+        rpc.set_metrics(metrics)
+        assert await rpc.block_number() == node.received[-1]["id"]
+        await rpc.disable_websocket().close()
+
+    # halved by the rate limited response, then nudged back up by the retry
+    assert limiter.rate == 510
+    block_number = metrics.snapshot()["Ethereum"]["eth_blockNumber"]
+    assert block_number["bytes_out"] > 0
+    assert block_number["bytes_in"] > 0
+
+
+class UnreachableNetwork(Network):
+    chain_id: ClassVar[int] = 999_002
+    name: ClassVar[str] = "Unreachable Network"
+    native_currency: ClassVar[str] = "ETH"
+    rpc: ClassVar[Rpcs] = Rpcs(
+        default=RpcUrl(http=AnyHttpUrl("http://127.0.0.1:9")),
+        backups=[RpcUrl(http=AnyHttpUrl("http://127.0.0.1:9"))],
+    )
+    block_explorer: ClassVar[BlockExplorer] = BlockExplorer(name="", url="", api_url="")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_websocket_not_hedged():
+    node = Node()
+    async with serve(node.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        rpc = RPC(network=UnreachableNetwork)
+        rpc.enable_websocket(f"ws://127.0.0.1:{port}")
+        rpc.enable_hedging()
+        # the http urls are unreachable, so this only answers over the websocket
+        assert await rpc.block_number() == node.received[-1]["id"]
+        await rpc.disable_websocket().close()
+    assert len(node.received) == 1
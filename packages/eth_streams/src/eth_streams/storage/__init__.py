@@ -1,8 +1,10 @@
+from .cursor import CheckpointCursorStore
 from .publisher import DBPublisher
 
 __all__ = [
     "Block",
     "Checkpoint",
+    "CheckpointCursorStore",
     "ContractEvent",
     "DBPublisher",
 ]
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from eth_rpc.utils import CursorStore
+from eth_streams.models import Checkpoint
+
+
+class CheckpointCursorStore(CursorStore):
+    """Keeps backfill cursors as `Checkpoint` rows, keyed by the cursor key"""
+
+    async def load(self, key: str) -> Optional[int]:
+        checkpoint = await Checkpoint.filter(pipeline_id=key).first()
+        return checkpoint.block_number if checkpoint else None
+
+    async def save(self, key: str, block_number: int) -> None:
+        checkpoint = await Checkpoint.filter(pipeline_id=key).first()
+        if not checkpoint:
+            await Checkpoint(
+                pipeline_id=key,
+                block_number=block_number,
+                context={},
+            ).save()
+        else:
+            checkpoint.block_number = block_number
+            await checkpoint.save()